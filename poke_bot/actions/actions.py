@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
+from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Any
 
 from aiohttp.client_exceptions import ClientError
@@ -8,11 +11,16 @@ from aiohttp.client_exceptions import ClientError
 from rasa_sdk import Action, Tracker
 from rasa_sdk.events import SlotSet
 
+from .utils.client import register_shutdown_listener
+from .utils.metrics import Histogram, register_metrics_route
 from .utils.requests import (
     check_pokemon_existence,
     pokemon_count,
+    prefetch_pokemon_data,
+    register_startup_listener,
     retrieve_all_pokemon_types,
     retrieve_pokemon_types,
+    suggest_pokemon_names,
     verify_pokemon_type,
 )
 
@@ -21,6 +29,27 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# All actions share one pooled Poke API session, closed together with the action server.
+register_shutdown_listener()
+register_metrics_route()
+# The indexes of Pokémon names and types are built as the action server starts, rather than by the first questions.
+register_startup_listener()
+
+RUN_SECONDS = Histogram('action_run_duration_seconds', 'Duration of running the custom actions.', ['action', 'outcome'])
+
+_Run = Callable[..., Awaitable[list[dict[str, Any]]]]
+
+
+def timed(run: _Run) -> _Run:
+    """Observes the duration of `Action.run`, by action name."""
+
+    @functools.wraps(run)
+    async def wrapper(self: Action, *args, **kwargs) -> list[dict[str, Any]]:
+        with RUN_SECONDS.time(action=self.name(), outcome='ok'):
+            return await run(self, *args, **kwargs)
+
+    return wrapper
+
 
 class ActionCheckPokemonExistence(Action):
     """Action class to check the existence of a Pokémon and provide a response.
@@ -29,12 +58,14 @@ class ActionCheckPokemonExistence(Action):
     Poke API.
     If there is an error during the API request, it sends an error message.
     Otherwise, it responds with a template message indicating whether the
-    Pokémon exists or not.
+    Pokémon exists or not, suggesting the closest name for a near miss.
+    The data of an existing Pokémon is prefetched for the follow-up actions.
     """
 
     def name(self) -> str:
         return 'action_pokemon_existence'
 
+    @timed
     async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, *args, **kwargs) -> list[dict[str, Any]]:
         pokemon_name = tracker.get_slot('pokemon_name')
 
@@ -44,17 +75,26 @@ class ActionCheckPokemonExistence(Action):
 
         try:
             exists = await check_pokemon_existence(pokemon_name)
-        except ClientError:
+        except (ClientError, asyncio.TimeoutError):
             logger.exception('Failed to check pokemon existence.')
             dispatcher.utter_message(response='utter_pokeapi_error')
             self.clear_pokemon_name()
             return []
 
         if exists:
+            # The next questions are likely about the types of this Pokémon.
+            prefetch_pokemon_data(pokemon_name)
             dispatcher.utter_message(
                 response='utter_pokemon_exists',
                 pokemon_name=pokemon_name,
             )
+        elif suggestions := await suggest_pokemon_names(pokemon_name):
+            dispatcher.utter_message(
+                response='utter_pokemon_no_exist_suggestion',
+                pokemon_name=pokemon_name,
+                suggestion=suggestions[0].title(),
+            )
+            self.clear_pokemon_name()
         else:
             dispatcher.utter_message(
                 response='utter_pokemon_no_exist',
@@ -82,6 +122,7 @@ class ActionVerifyPokemonType(Action):
     def name(self) -> str:
         return 'action_verify_pokemon_type'
 
+    @timed
     async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, *args, **kwargs) -> list[dict[str, Any]]:
         pokemon_name = tracker.get_slot('pokemon_name')
         pokemon_type = tracker.get_slot('pokemon_type')
@@ -90,7 +131,7 @@ class ActionVerifyPokemonType(Action):
 
         try:
             verified = await verify_pokemon_type(pokemon_name, pokemon_type)
-        except (ClientError, KeyError):
+        except (ClientError, asyncio.TimeoutError, KeyError):
             logger.exception('Failed to verify pokemon type.')
             dispatcher.utter_message(response='utter_pokeapi_error')
             return []
@@ -121,6 +162,7 @@ class ActionGetPokemonTypes(Action):
     def name(self) -> str:
         return 'action_get_pokemon_types'
 
+    @timed
     async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, *args, **kwargs) -> list[dict[str, Any]]:
         pokemon_name = tracker.get_slot('pokemon_name')
 
@@ -130,7 +172,7 @@ class ActionGetPokemonTypes(Action):
 
         try:
             pokemon_types = await retrieve_pokemon_types(pokemon_name)
-        except (ClientError, KeyError):
+        except (ClientError, asyncio.TimeoutError, KeyError):
             logger.exception('Failed to get pokemon types.')
             dispatcher.utter_message(response='utter_pokeapi_error')
             return []
@@ -160,10 +202,11 @@ class ActionListPokemonTypes(Action):
     def name(self) -> str:
         return 'action_list_pokemon_types'
 
+    @timed
     async def run(self, dispatcher: CollectingDispatcher, *args, **kwargs) -> list[dict[str, Any]]:
         try:
             pokemon_types = await retrieve_all_pokemon_types()
-        except (ClientError, KeyError):
+        except (ClientError, asyncio.TimeoutError, KeyError):
             logger.exception('Failed to list pokemon types.')
             dispatcher.utter_message(response='utter_pokeapi_error')
             return []
@@ -187,10 +230,11 @@ class ActionPokemonCount(Action):
     def name(self) -> str:
         return 'action_pokemon_count'
 
+    @timed
     async def run(self, dispatcher: CollectingDispatcher, *args, **kwargs) -> list[dict[str, Any]]:
         try:
             count = await pokemon_count()
-        except (ClientError, KeyError):
+        except (ClientError, asyncio.TimeoutError, KeyError):
             logger.exception('Failed to get pokemon count.')
             dispatcher.utter_message(response='utter_pokeapi_error')
             return []
@@ -0,0 +1,84 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from actions.utils.cache import MISSING, TTLCache, async_cached
+
+
+class TTLCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = TTLCache(maxsize=2)
+
+    def test_get_set(self):
+        self.assertIs(self.cache.get('a'), MISSING)
+        self.cache.set('a', 1, ttl=60)
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertEqual((self.cache.stats.hits, self.cache.stats.misses), (1, 1))
+
+    def test_entries_expire(self):
+        with mock.patch('actions.utils.cache.time.monotonic', return_value=100):
+            self.cache.set('a', 1, ttl=10)
+        with mock.patch('actions.utils.cache.time.monotonic', return_value=110):
+            self.assertIs(self.cache.get('a'), MISSING)
+        self.assertEqual((len(self.cache), self.cache.stats.expirations), (0, 1))
+
+    def test_evicts_the_least_recently_used_entry(self):
+        self.cache.set('a', 1, ttl=60)
+        self.cache.set('b', 2, ttl=60)
+        self.cache.get('a')
+        self.cache.set('c', 3, ttl=60)
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIs(self.cache.get('b'), MISSING)
+        self.assertEqual(self.cache.get('c'), 3)
+        self.assertEqual(self.cache.stats.evictions, 1)
+
+    def test_hit_rate(self):
+        self.assertEqual(self.cache.stats.hit_rate, 0)
+        self.cache.set('a', 1, ttl=60)
+        self.cache.get('a')
+        self.cache.get('b')
+        self.assertEqual(self.cache.stats.hit_rate, 0.5)
+
+
+class NotFound(Exception):
+    pass
+
+
+class AsyncCachedTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.cache = TTLCache(maxsize=10)
+        self.calls = []
+
+        @async_cached(self.cache, ttl=60, key=str.lower, negative_ttl=60, negative_exceptions=(NotFound,))
+        async def retrieve(name: str) -> str:
+            self.calls.append(name)
+            await asyncio.sleep(0.01)
+            if name == 'missing':
+                raise NotFound(name)
+            if name == 'failing':
+                raise ValueError(name)
+            return name.upper()
+
+        self.retrieve = retrieve
+
+    async def test_caches_results_by_key(self):
+        self.assertEqual(await self.retrieve('pikachu'), 'PIKACHU')
+        self.assertEqual(await self.retrieve('Pikachu'), 'PIKACHU')
+        self.assertEqual(self.calls, ['pikachu'])
+
+    async def test_coalesces_concurrent_misses(self):
+        results = await asyncio.gather(*(self.retrieve('pikachu') for _ in range(3)))
+        self.assertEqual(results, ['PIKACHU'] * 3)
+        self.assertEqual(self.calls, ['pikachu'])
+
+    async def test_caches_negative_exceptions(self):
+        for _ in range(2):
+            with self.assertRaises(NotFound):
+                await self.retrieve('missing')
+        self.assertEqual(self.calls, ['missing'])
+
+    async def test_other_exceptions_are_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                await self.retrieve('failing')
+        self.assertEqual(self.calls, ['failing', 'failing'])
@@ -0,0 +1,113 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from aiohttp import ClientResponseError, web
+from aiohttp.test_utils import TestServer
+
+from actions.utils import requests
+from actions.utils.circuit import CircuitBreaker, CircuitOpenError
+from actions.utils.client import close_session
+
+
+def _response_error(status: int) -> ClientResponseError:
+    return ClientResponseError(mock.Mock(), (), status=status)
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def test_opens_after_consecutive_failures(self):
+        circuit = CircuitBreaker('pokemon', failure_threshold=2, reset_timeout=60)
+        circuit.record_failure()
+        self.assertEqual(circuit.state, CircuitBreaker.CLOSED)
+        circuit.record_failure()
+        self.assertEqual(circuit.state, CircuitBreaker.OPEN)
+        self.assertFalse(circuit.allow_request())
+        self.assertRaises(CircuitOpenError, circuit.check)
+
+    def test_success_resets_failures(self):
+        circuit = CircuitBreaker('pokemon', failure_threshold=2)
+        circuit.record_failure()
+        circuit.record_success()
+        circuit.record_failure()
+        self.assertEqual(circuit.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_lets_a_single_probe_through(self):
+        circuit = CircuitBreaker('pokemon', failure_threshold=1, reset_timeout=0)
+        circuit.record_failure()
+        self.assertEqual(circuit.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(circuit.allow_request())
+        self.assertFalse(circuit.allow_request())
+        circuit.record_success()
+        self.assertEqual(circuit.state, CircuitBreaker.CLOSED)
+
+    def test_failed_probe_opens_the_circuit(self):
+        circuit = CircuitBreaker('pokemon', failure_threshold=3, reset_timeout=60)
+        for _ in range(3):
+            circuit.record_failure()
+        circuit._opened_at -= 60
+        self.assertTrue(circuit.allow_request())
+        circuit.record_failure()
+        self.assertEqual(circuit.state, CircuitBreaker.OPEN)
+
+    def test_records_errors(self):
+        circuit = CircuitBreaker('pokemon', failure_threshold=1)
+        circuit.record_error(_response_error(404))
+        self.assertEqual(circuit.state, CircuitBreaker.CLOSED)
+        circuit.record_error(_response_error(503))
+        self.assertEqual(circuit.state, CircuitBreaker.OPEN)
+
+    def test_release_frees_the_probe(self):
+        circuit = CircuitBreaker('pokemon', failure_threshold=1, reset_timeout=0)
+        circuit.record_failure()
+        self.assertTrue(circuit.allow_request())
+        circuit.release()
+        self.assertTrue(circuit.allow_request())
+        self.assertEqual(circuit.failures, 1)
+
+
+class GetJsonCircuitTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        async def slow(request):
+            await asyncio.sleep(10)
+            return web.json_response({})
+
+        async def unavailable(request):
+            raise web.HTTPServiceUnavailable()
+
+        app = web.Application()
+        app.router.add_get('/api/v2/pokemon/slow', slow)
+        app.router.add_get('/api/v2/pokemon/unavailable', unavailable)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.addAsyncCleanup(self.server.close)
+        self.addAsyncCleanup(close_session)
+
+        self.api = str(self.server.make_url('/api/v2/'))
+        for target, value in [('POKEMON_API', self.api), ('get_mirror', lambda: None)]:
+            patcher = mock.patch.object(requests, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        requests.get_circuit.cache_clear()
+        self.addCleanup(requests.get_circuit.cache_clear)
+        self.circuit = requests.get_circuit('pokemon')
+
+    async def test_server_errors_open_the_circuit(self):
+        for _ in range(self.circuit.failure_threshold):
+            with self.assertRaises(ClientResponseError):
+                await requests._get_json(f'{self.api}pokemon/unavailable')
+        with self.assertRaises(CircuitOpenError):
+            await requests._get_json(f'{self.api}pokemon/unavailable')
+
+    async def test_cancelled_request_is_not_recorded(self):
+        self.circuit.reset_timeout = 0
+        for _ in range(self.circuit.failure_threshold):
+            self.circuit.record_failure()
+
+        task = asyncio.ensure_future(requests._get_json(f'{self.api}pokemon/slow'))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.assertEqual(self.circuit.failures, self.circuit.failure_threshold)
+        self.assertTrue(self.circuit.allow_request())
@@ -0,0 +1,59 @@
+import unittest
+
+from actions.utils.name_index import NameIndex, edit_distance, normalize_name
+
+NAMES = ['bulbasaur', 'ivysaur', 'charmander', 'pikachu', 'raichu', 'mr-mime', 'farfetchd', 'giratina-altered']
+
+
+class EditDistanceTests(unittest.TestCase):
+    def test_identical(self):
+        self.assertEqual(edit_distance('pikachu', 'pikachu'), 0)
+
+    def test_single_edits(self):
+        self.assertEqual(edit_distance('pikachu', 'pikahcu'), 1)  # Swap
+        self.assertEqual(edit_distance('pikachu', 'pikkachu'), 1)  # Insertion
+        self.assertEqual(edit_distance('pikachu', 'pikchu'), 1)  # Deletion
+        self.assertEqual(edit_distance('pikachu', 'pikacho'), 1)  # Substitution
+
+    def test_multiple_edits(self):
+        self.assertEqual(edit_distance('pikachu', 'ipkahcu'), 2)
+        self.assertEqual(edit_distance('', 'abc'), 3)
+        self.assertEqual(edit_distance('ca', 'abc'), 3)
+
+
+class NormalizeNameTests(unittest.TestCase):
+    def test_written_names(self):
+        self.assertEqual(normalize_name('Mr. Mime'), 'mr-mime')
+        self.assertEqual(normalize_name("Farfetch'd"), 'farfetchd')
+        self.assertEqual(normalize_name('  PIKACHU '), 'pikachu')
+
+
+class NameIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = NameIndex.from_names(NAMES)
+
+    def test_contains_normalized_names(self):
+        self.assertIn('Mr. Mime', self.index)
+        self.assertIn('Pikachu', self.index)
+        self.assertNotIn('agumon', self.index)
+
+    def test_suggests_swapped_letters(self):
+        self.assertEqual(self.index.suggest('pikahcu'), ['pikachu'])
+
+    def test_suggests_inserted_letters(self):
+        self.assertEqual(self.index.suggest('pikkachu'), ['pikachu'])
+
+    def test_suggests_deleted_letters(self):
+        self.assertEqual(self.index.suggest('bulbsaur'), ['bulbasaur'])
+
+    def test_suggests_forms(self):
+        self.assertEqual(self.index.suggest('giratina'), ['giratina-altered'])
+
+    def test_no_suggestion_for_distant_names(self):
+        self.assertEqual(self.index.suggest('agumon'), [])
+
+    def test_closest_first_up_to_limit(self):
+        index = NameIndex.from_names(['pikachu', 'pikachu-belle', 'pikachu-libre'])
+        suggestions = index.suggest('pikachu', limit=2)
+        self.assertEqual(len(suggestions), 2)
+        self.assertEqual(suggestions[0], 'pikachu')
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import unittest
+
+from actions.utils.refresh import Refreshed
+
+
+class RefreshedTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.builds = 0
+        self.error = None
+
+    async def build(self):
+        self.builds += 1
+        await asyncio.sleep(0.01)
+        if self.error is not None:
+            raise self.error
+        return self.builds
+
+    def refreshed(self, **kwargs):
+        return Refreshed('test value', self.build, **{'ttl': 60, **kwargs})
+
+    async def test_builds_once_for_concurrent_gets(self):
+        refreshed = self.refreshed()
+        self.assertEqual(await asyncio.gather(refreshed.get(), refreshed.get()), [1, 1])
+        self.assertEqual(await refreshed.get(), 1)
+        self.assertEqual(self.builds, 1)
+
+    async def test_rebuilds_in_the_background_once_expired(self):
+        refreshed = self.refreshed(ttl=0)
+        self.assertEqual(await refreshed.get(), 1)
+        self.assertEqual(await refreshed.get(), 1)
+        await asyncio.gather(*refreshed._tasks)
+        self.assertEqual(refreshed.value, 2)
+
+    async def test_malformed_documents_leave_the_value_unbuilt(self):
+        for error in [json.JSONDecodeError('Unterminated string', '{"name', 1), TypeError(), KeyError('results')]:
+            with self.subTest(error=error):
+                self.error = error
+                with self.assertLogs('actions.utils.refresh', 'ERROR'):
+                    self.assertIsNone(await self.refreshed().get())
+
+    async def test_keeps_the_value_when_rebuilding_fails(self):
+        refreshed = self.refreshed(ttl=0)
+        await refreshed.get()
+        self.error = ValueError()
+        with self.assertLogs('actions.utils.refresh', 'ERROR'):
+            await refreshed.get()
+            await asyncio.gather(*refreshed._tasks)
+        self.assertEqual(refreshed.value, 1)
+
+    async def test_waits_before_retrying(self):
+        refreshed = self.refreshed(retry_delay=60)
+        self.error = ValueError()
+        with self.assertLogs('actions.utils.refresh', 'ERROR'):
+            await refreshed.get()
+        self.error = None
+        self.assertIsNone(await refreshed.get())
+        self.assertEqual(self.builds, 1)
+
+    async def test_get_nowait_builds_in_the_background(self):
+        refreshed = self.refreshed()
+        self.assertIsNone(refreshed.get_nowait())
+        self.assertIsNone(refreshed.get_nowait())
+        await asyncio.gather(*refreshed._tasks)
+        self.assertEqual(refreshed.get_nowait(), 1)
+        self.assertEqual(self.builds, 1)
+
+    async def test_get_waits_for_a_started_build(self):
+        refreshed = self.refreshed()
+        refreshed.start()
+        self.assertEqual(await refreshed.get(), 1)
+        self.assertEqual(self.builds, 1)
@@ -0,0 +1,48 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from actions.utils import requests
+from actions.utils.refresh import Refreshed
+from actions.utils.type_index import TypeIndex
+
+PIKACHU = {'name': 'pikachu', 'types': [{'slot': 1, 'type': {'name': 'electric'}}]}
+
+
+class TypeQuestionsTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.index_requested = asyncio.Event()
+        self.index_built = asyncio.Event()
+
+        async def build_type_index():
+            self.index_requested.set()
+            await self.index_built.wait()
+            return TypeIndex.from_documents(['electric'], [{'name': 'electric', 'pokemon': []}])
+
+        self.holder = Refreshed('index of Pokémon types', build_type_index, ttl=60)
+        self.retrieve_pokemon_data = mock.AsyncMock(return_value=PIKACHU)
+        for target, value in [
+            ('type_index_holder', self.holder),
+            ('retrieve_pokemon_data', self.retrieve_pokemon_data),
+        ]:
+            patcher = mock.patch.object(requests, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_answers_without_waiting_for_the_type_index(self):
+        types = await asyncio.wait_for(requests.retrieve_pokemon_types('Pikachu'), timeout=1)
+        self.assertEqual(types, ['electric'])
+        self.assertTrue(await asyncio.wait_for(requests.verify_pokemon_type('pikachu', 'electric'), timeout=1))
+        await asyncio.wait_for(self.index_requested.wait(), timeout=1)
+
+        self.index_built.set()
+        await asyncio.gather(*self.holder._tasks)
+        self.assertEqual(await requests.retrieve_all_pokemon_types(), ['electric'])
+
+    async def test_falls_back_for_pokemon_missing_from_the_index(self):
+        self.index_built.set()
+        self.holder.start()
+        await asyncio.gather(*self.holder._tasks)
+
+        self.assertEqual(await requests.retrieve_pokemon_types('pikachu'), ['electric'])
+        self.retrieve_pokemon_data.assert_awaited_once_with('pikachu')
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from actions.utils.singleflight import SingleFlight
+
+
+class SingleFlightTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.flight = SingleFlight()
+        self.calls = 0
+
+    async def call(self, result='result', delay=0.05):
+        self.calls += 1
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def test_coalesces_concurrent_calls(self):
+        results = await asyncio.gather(*(self.flight.do('key', self.call) for _ in range(5)))
+        self.assertEqual(results, ['result'] * 5)
+        self.assertEqual(self.calls, 1)
+
+    async def test_calls_again_once_done(self):
+        await self.flight.do('key', self.call)
+        await self.flight.do('key', self.call)
+        self.assertEqual(self.calls, 2)
+
+    async def test_keys_are_called_separately(self):
+        await asyncio.gather(self.flight.do('a', self.call), self.flight.do('b', self.call))
+        self.assertEqual(self.calls, 2)
+
+    async def test_shares_failures(self):
+        error = ValueError('failed')
+        results = await asyncio.gather(
+            *(self.flight.do('key', lambda: self.call(error)) for _ in range(2)), return_exceptions=True
+        )
+        self.assertEqual(results, [error, error])
+        self.assertEqual(self.calls, 1)
+
+    async def test_cancelled_caller_does_not_cancel_the_call(self):
+        first = asyncio.ensure_future(self.flight.do('key', self.call))
+        second = asyncio.ensure_future(self.flight.do('key', self.call))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, 'result')
+        self.assertTrue(first.cancelled())
+        self.assertEqual(self.calls, 1)
+
+
+class SingleFlightLoopsTests(unittest.TestCase):
+    def test_calls_are_tracked_per_event_loop(self):
+        flight = SingleFlight()
+        loops = []
+        barrier = threading.Barrier(2)
+
+        async def call():
+            loops.append(asyncio.get_running_loop())
+            await asyncio.sleep(0.1)
+            return 'result'
+
+        def run(_):
+            barrier.wait()
+            return asyncio.run(flight.do('key', call))
+
+        with ThreadPoolExecutor(2) as executor:
+            self.assertEqual(list(executor.map(run, range(2))), ['result'] * 2)
+        self.assertEqual(len(loops), 2)
@@ -0,0 +1,39 @@
+import unittest
+
+from actions.utils.type_index import TypeIndex
+
+TYPE_NAMES = ['normal', 'flying', 'poison', 'grass']
+TYPE_DOCUMENTS = [
+    {'name': 'normal', 'pokemon': [{'pokemon': {'name': 'pidgey'}, 'slot': 1}]},
+    {
+        'name': 'flying',
+        'pokemon': [{'pokemon': {'name': 'pidgey'}, 'slot': 2}, {'pokemon': {'name': 'zubat'}, 'slot': 2}],
+    },
+    {
+        'name': 'poison',
+        'pokemon': [{'pokemon': {'name': 'zubat'}, 'slot': 1}, {'pokemon': {'name': 'bulbasaur'}, 'slot': 2}],
+    },
+    {'name': 'grass', 'pokemon': [{'pokemon': {'name': 'bulbasaur'}, 'slot': 1}]},
+]
+
+
+class TypeIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = TypeIndex.from_documents(TYPE_NAMES, TYPE_DOCUMENTS)
+
+    def test_types_by_slot(self):
+        self.assertEqual(self.index.types_of('pidgey'), ['normal', 'flying'])
+        self.assertEqual(self.index.types_of('zubat'), ['poison', 'flying'])
+        self.assertEqual(self.index.types_of('Bulbasaur'), ['grass', 'poison'])
+
+    def test_has_type(self):
+        self.assertTrue(self.index.has_type('zubat', 'Flying'))
+        self.assertFalse(self.index.has_type('zubat', 'grass'))
+        self.assertFalse(self.index.has_type('zubat', 'unknown'))
+
+    def test_unindexed_pokemon(self):
+        self.assertIsNone(self.index.types_of('pikachu'))
+        self.assertIsNone(self.index.has_type('pikachu', 'electric'))
+
+    def test_type_names(self):
+        self.assertEqual(self.index.type_names, tuple(TYPE_NAMES))
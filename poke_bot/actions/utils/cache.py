@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import functools
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from .singleflight import SingleFlight
+
+_T = TypeVar('_T')
+
+MISSING: Any = object()
+
+
+@dataclass
+class CacheStats:
+    """Counters describing the effectiveness of a :class:`TTLCache`."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _CachedException:
+    """Wraps an exception stored in the cache (negative caching)."""
+
+    exception: BaseException
+
+
+class TTLCache:
+    """In-process LRU cache whose entries expire after a per-entry TTL.
+
+    When ``maxsize`` is reached, the least recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        assert maxsize > 0, 'The cache size must be positive.'
+
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the value stored under `key`, or :data:`MISSING`."""
+        try:
+            expires_at, value = self._data[key]
+        except KeyError:
+            self.stats.misses += 1
+            return MISSING
+
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return MISSING
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Stores `value` under `key` for `ttl` seconds."""
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+def async_cached(
+    cache: TTLCache,
+    *,
+    ttl: float,
+    key: Callable[..., Hashable] | None = None,
+    negative_ttl: float = 0,
+    negative_exceptions: tuple[type[BaseException], ...] = (),
+) -> Callable[[Callable[..., Awaitable[_T]]], Callable[..., Awaitable[_T]]]:
+    """Decorator memoizing the results of a coroutine function in `cache`.
+
+    Concurrent calls missing the cache for the same key share a single
+    call of the decorated function.
+
+    Args:
+        cache: The cache storing the results.
+        ttl: Seconds a successful result is kept.
+        key: Builds the cache key from the call arguments.  Defaults to
+            the arguments themselves.
+        negative_ttl: Seconds an exception from `negative_exceptions` is
+            kept.  The cached exception is re-raised on subsequent calls.
+        negative_exceptions: Exceptions which are cached.
+    """
+
+    def decorator(func: Callable[..., Awaitable[_T]]) -> Callable[..., Awaitable[_T]]:
+        flight = SingleFlight()
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> _T:
+            cache_key = (func.__qualname__, key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items()))))
+
+            value = cache.get(cache_key)
+            if isinstance(value, _CachedException):
+                raise value.exception.with_traceback(None)
+            if value is not MISSING:
+                return value
+
+            async def load() -> _T:
+                try:
+                    result = await func(*args, **kwargs)
+                except negative_exceptions as exc:
+                    if negative_ttl > 0:
+                        cache.set(cache_key, _CachedException(exc), negative_ttl)
+                    raise
+
+                cache.set(cache_key, result, ttl)
+                return result
+
+            return await flight.do(cache_key, load)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+from types import SimpleNamespace
+
+import aiohttp
+
+from .metrics import REGISTRY, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Connection pool and timeout settings, configurable through the environment of the action server.
+CONNECTION_LIMIT = int(os.environ.get('POKEAPI_CONNECTION_LIMIT', 100))
+CONNECTION_LIMIT_PER_HOST = int(os.environ.get('POKEAPI_CONNECTION_LIMIT_PER_HOST', 20))
+KEEPALIVE_TIMEOUT = float(os.environ.get('POKEAPI_KEEPALIVE_TIMEOUT', 30))
+DNS_CACHE_TTL = int(os.environ.get('POKEAPI_DNS_CACHE_TTL', 300))
+TOTAL_TIMEOUT = float(os.environ.get('POKEAPI_TIMEOUT', 10))
+CONNECT_TIMEOUT = float(os.environ.get('POKEAPI_CONNECT_TIMEOUT', 3))
+
+DNS_SECONDS = Histogram('pokeapi_dns_duration_seconds', 'Duration of resolving the Poke API host.')
+CONNECT_SECONDS = Histogram(
+    'pokeapi_connect_duration_seconds', 'Duration of opening connections to the Poke API, DNS and TLS included.'
+)
+
+_session: aiohttp.ClientSession | None = None
+
+
+async def _on_dns_start(session, context: SimpleNamespace, params) -> None:  # pylint: disable=unused-argument
+    context.dns_start = time.perf_counter()
+
+
+async def _on_dns_end(session, context: SimpleNamespace, params) -> None:  # pylint: disable=unused-argument
+    DNS_SECONDS.observe(time.perf_counter() - context.dns_start)
+
+
+async def _on_connect_start(session, context: SimpleNamespace, params) -> None:  # pylint: disable=unused-argument
+    context.connect_start = time.perf_counter()
+
+
+async def _on_connect_end(session, context: SimpleNamespace, params) -> None:  # pylint: disable=unused-argument
+    CONNECT_SECONDS.observe(time.perf_counter() - context.connect_start)
+
+
+def _trace_configs() -> list[aiohttp.TraceConfig]:
+    """Returns the trace configs timing DNS resolution and connections, if metrics are enabled."""
+    if not REGISTRY.enabled:
+        return []
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(_on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_end)
+    trace_config.on_connection_create_start.append(_on_connect_start)
+    trace_config.on_connection_create_end.append(_on_connect_end)
+    return [trace_config]
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Returns the process-wide client session for the Poke API.
+
+    The session is created lazily on first use and keeps its connections
+    alive between calls, so subsequent requests skip the TCP and TLS
+    handshakes.  Must be called from within a running event loop.
+    """
+    global _session  # pylint: disable=global-statement
+
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTION_LIMIT,
+            limit_per_host=CONNECTION_LIMIT_PER_HOST,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=DNS_CACHE_TTL,
+        )
+        timeout = aiohttp.ClientTimeout(total=TOTAL_TIMEOUT, connect=CONNECT_TIMEOUT)
+        _session = aiohttp.ClientSession(connector=connector, timeout=timeout, trace_configs=_trace_configs())
+
+    return _session
+
+
+async def close_session() -> None:
+    """Closes the process-wide client session, if one was created."""
+    global _session  # pylint: disable=global-statement
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+def register_listener(listener: Callable[..., Awaitable[None]], event: str, app_name: str = 'rasa_sdk') -> bool:
+    """Registers a listener of a server event of the action server, e.g. ``after_server_stop``.
+
+    The action server is a Sanic application created before the actions
+    package is imported, so listeners can be attached at import time.
+    Returns whether the listener was registered, which it isn't without
+    the Sanic application, e.g. in tests.
+    """
+    # pylint: disable=import-outside-toplevel
+    try:
+        from sanic import Sanic
+        from sanic.exceptions import SanicException
+    except ImportError:
+        return False
+
+    try:
+        app = Sanic.get_app(app_name)
+    except SanicException:
+        return False
+
+    app.register_listener(listener, event)
+    return True
+
+
+def register_shutdown_listener(app_name: str = 'rasa_sdk') -> None:
+    """Closes the client session when the action server stops."""
+
+    async def _close_session(*args) -> None:  # pylint: disable=unused-argument
+        await close_session()
+
+    if not register_listener(_close_session, 'after_server_stop', app_name):
+        logger.debug("Sanic app '%s' not found, the Poke API session won't be closed on shutdown.", app_name)
@@ -0,0 +1,160 @@
+"""Latency histograms exposed in the Prometheus text format.
+
+Histograms are observed by the code they measure, e.g.::
+
+    with REQUEST_SECONDS.time(resource='pokemon') as labels:
+        ...
+        labels['outcome'] = 'fetched'
+
+and rendered by :meth:`Registry.render` for a Prometheus server to scrape.
+Observations are counted by the current process only.
+
+When the ``POKE_METRICS_ENABLED`` environment variable is not ``true``,
+timing a block costs a single attribute check and nothing is
+recorded.  The action server serves the histograms at ``/metrics``, see
+:func:`register_metrics_route`.
+"""
+from __future__ import annotations
+
+import bisect
+import contextlib
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the buckets in seconds, from a millisecond to ten seconds.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Sequence[tuple[str, str]]) -> str:
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}' if labels else ''
+
+
+class Registry:
+    """Histograms rendered together, see :meth:`render`."""
+
+    def __init__(self, *, enabled: bool) -> None:
+        self.enabled = enabled
+        self._histograms: dict[str, Histogram] = {}
+
+    def register(self, histogram: Histogram) -> None:
+        self._histograms[histogram.name] = histogram
+
+    def render(self) -> str:
+        """Returns the histograms in the Prometheus text exposition format."""
+        return ''.join(f'{line}\n' for histogram in self._histograms.values() for line in histogram.render())
+
+
+REGISTRY = Registry(enabled=os.environ.get('POKE_METRICS_ENABLED', '').lower() in ('1', 'true', 'yes'))
+
+
+class Histogram:
+    """Distribution of durations in seconds, by label values.
+
+    Args:
+        name: Name of the metric, e.g. ``pokeapi_request_duration_seconds``.
+        documentation: Help text of the metric.
+        labelnames: Names of the labels given to every observation.  A
+            label named ``outcome`` is ``error`` when a timed block raises.
+        buckets: Upper bounds of the buckets, in increasing order.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Registry = REGISTRY,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.registry = registry
+        # Per label values: the count of each bucket and of +Inf, then the sum.
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def time(self, **labels: str) -> contextlib.AbstractContextManager[dict[str, str]]:
+        """Observes the duration of a block, yielding its labels to complete."""
+        if not self.registry.enabled:
+            return contextlib.nullcontext({})
+        return self._time(labels)
+
+    @contextlib.contextmanager
+    def _time(self, labels: dict[str, str]) -> Iterator[dict[str, str]]:
+        start = time.perf_counter()
+        try:
+            yield labels
+        except BaseException:
+            if 'outcome' in self.labelnames:
+                labels['outcome'] = 'error'
+            raise
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} histogram'
+
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+
+        for key, values in sorted(series.items()):
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip((*(repr(bound) for bound in self.buckets), '+Inf'), values):
+                cumulative += count
+                yield f'{self.name}_bucket{_format_labels([*labels, ("le", bound)])} {int(cumulative)}'
+            yield f'{self.name}_sum{_format_labels(labels)} {values[-1]}'
+            yield f'{self.name}_count{_format_labels(labels)} {int(cumulative)}'
+
+
+def register_metrics_route(app_name: str = 'rasa_sdk') -> None:
+    """Serves the histograms at ``/metrics`` of the action server, if enabled.
+
+    The action server is a Sanic application created before the actions
+    package is imported, so the route can be added at import time.
+    """
+    if not REGISTRY.enabled:
+        return
+
+    # pylint: disable=import-outside-toplevel
+    try:
+        from sanic import Sanic, response
+        from sanic.exceptions import SanicException
+    except ImportError:
+        return
+
+    try:
+        app = Sanic.get_app(app_name)
+    except SanicException:
+        logger.debug("Sanic app '%s' not found, the metrics won't be served.", app_name)
+        return
+
+    async def metrics(request):  # pylint: disable=unused-argument
+        return response.text(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+    app.add_route(metrics, '/metrics', methods=['GET'])
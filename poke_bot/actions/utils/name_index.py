@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import functools
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# Characters dropped from names, e.g. in "Mr. Mime" or "Farfetch'd", which are "mr-mime" and "farfetchd" on Poke API.
+_DROPPED = re.compile(r"[.'’:]")
+
+# Candidates compared by edit distance for a suggestion, among the names sharing the most trigrams.
+MAX_CANDIDATES = 20
+
+
+def normalize_name(name: str) -> str:
+    """Returns a name written the way Poke API writes it, e.g. ``mr-mime`` for ``Mr. Mime``."""
+    return '-'.join(_DROPPED.sub('', name).lower().split())
+
+
+def _trigrams(name: str) -> set[str]:
+    padded = f'  {name} '
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}  # noqa: E203
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Optimal string alignment distance between two strings.
+
+    Counts insertions, deletions and substitutions of a character, like the
+    Levenshtein distance, and swaps of two adjacent characters, e.g. in
+    ``pikahcu``, as a single edit each.
+    """
+    before_previous: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            distance = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                distance = min(distance, before_previous[j - 2] + 1)
+            current.append(distance)
+        before_previous, previous = previous, current
+    return previous[-1]
+
+
+def max_distance(name: str) -> int:
+    """Edit distance up to which a name is a near miss: a typo per four characters, at most three."""
+    return min(max(len(name) // 4, 1), 3)
+
+
+@dataclass(frozen=True)
+class NameIndex:
+    """Names of every Pokémon, with their trigrams to suggest names for near misses."""
+
+    names: frozenset[str]
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> NameIndex:
+        return cls(frozenset(names))
+
+    @functools.cached_property
+    def trigrams(self) -> dict[str, tuple[str, ...]]:
+        names_by_trigram = defaultdict(list)
+        for name in self.names:
+            for trigram in _trigrams(name):
+                names_by_trigram[trigram].append(name)
+        return {trigram: tuple(names) for trigram, names in names_by_trigram.items()}
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_name(name) in self.names
+
+    def suggest(self, name: str, limit: int = 1) -> list[str]:
+        """Returns up to `limit` names close to `name`, closest first.
+
+        A name is close if its edit distance to `name` is at most
+        :func:`max_distance`, or if it is a form of the Pokémon `name`,
+        e.g. ``giratina-altered`` for ``giratina``.
+        """
+        name = normalize_name(name)
+        shared: Counter[str] = Counter()
+        for trigram in _trigrams(name):
+            shared.update(self.trigrams.get(trigram, ()))
+
+        suggestions = []
+        for candidate, _ in shared.most_common(MAX_CANDIDATES):
+            if candidate.startswith(f'{name}-'):
+                distance = 1
+            elif abs(len(candidate) - len(name)) > max_distance(name):
+                # The edit distance is at least the difference of lengths.
+                continue
+            else:
+                distance = edit_distance(name, candidate)
+            if distance <= max_distance(name):
+                suggestions.append((distance, -shared[candidate], candidate))
+        return [candidate for *_, candidate in sorted(suggestions)[:limit]]
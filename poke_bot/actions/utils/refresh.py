@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+from aiohttp import ClientError
+
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar('_T')
+
+
+class Refreshed(Generic[_T]):
+    """Value built on first use, or by :meth:`start`, then rebuilt in the background once older than `ttl`.
+
+    The current value keeps being returned while it is rebuilt, and when
+    rebuilding it fails.  After a failure, no build is attempted for
+    `retry_delay` seconds.
+
+    Args:
+        description: Description of the value in logs, e.g. ``index of Pokémon types``.
+        build: Coroutine function building the value.
+        ttl: Seconds after which the value is rebuilt.
+        retry_delay: Seconds between attempts when building the value fails.
+    """
+
+    def __init__(
+        self,
+        description: str,
+        build: Callable[[], Awaitable[_T]],
+        *,
+        ttl: float,
+        retry_delay: float = 60,
+    ) -> None:
+        self.description = description
+        self.build = build
+        self.ttl = ttl
+        self.retry_delay = retry_delay
+        self.value: _T | None = None
+        self._built_at = float('-inf')
+        self._failed_at = float('-inf')
+        self._flight = SingleFlight()
+        self._tasks: set[asyncio.Future[_T | None]] = set()
+
+    async def _refresh(self) -> _T | None:
+        try:
+            self.value = await self.build()
+        except (ClientError, asyncio.TimeoutError, KeyError, TypeError, ValueError):
+            # E.g. the JSONDecodeError, a ValueError, of a truncated document, or the TypeError of another shape.
+            logger.exception('Failed to build the %s.', self.description)
+            self._failed_at = time.monotonic()
+        else:
+            self._built_at = time.monotonic()
+        return self.value
+
+    def start(self) -> None:
+        """Starts building the value in the background, if it has never been built or is older than `ttl`.
+
+        E.g. when the server starts, so that the value is ready by its first
+        use.  Nothing is started while a build is in progress, or for
+        `retry_delay` seconds after a failure.
+        """
+        now = time.monotonic()
+        if self._tasks or now - self._failed_at < self.retry_delay or now - self._built_at < self.ttl:
+            return
+
+        task = asyncio.ensure_future(self._flight.do(None, self._refresh))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def get_nowait(self) -> _T | None:
+        """Returns the value, or None until it is built, without waiting for a build.
+
+        The value is built, or rebuilt, in the background, see :meth:`start`.
+        """
+        self.start()
+        return self.value
+
+    async def get(self) -> _T | None:
+        """Returns the value, or None if it has never been built.
+
+        Waits for the value to be built on first use.
+        """
+        if self.value is None and time.monotonic() - self._failed_at >= self.retry_delay:
+            return await self._flight.do(None, self._refresh)
+
+        self.start()
+        return self.value
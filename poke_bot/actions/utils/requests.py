@@ -1,11 +1,60 @@
 from __future__ import annotations
 
-import aiohttp
+import asyncio
+import functools
+import json
+import logging
+import os
+from typing import Any
+from urllib.parse import urlencode
 
-POKEMON_API = 'https://pokeapi.co/api/v2/'
+from aiohttp import ClientError, ClientResponseError
+
+from .cache import TTLCache, async_cached
+from .circuit import CircuitBreaker, CircuitOpenError, is_failure
+from .client import get_session, register_listener
+from .metrics import Histogram
+from .mirror import MIRROR_MAX_AGE, get_mirror
+from .name_index import NameIndex, normalize_name
+from .refresh import Refreshed
+from .type_index import TypeIndex
+
+logger = logging.getLogger(__name__)
+
+# Base URL of the Poke API, e.g. of the offline stand-in served by the `fake_pokeapi` command of the site.
+POKEMON_API = os.environ.get('POKEAPI_BASE_URL', 'https://pokeapi.co/api/v2/').rstrip('/') + '/'
 POKEMON_ENDPOINT = f'{POKEMON_API}pokemon/'
 POKEMON_TYPES_ENDPOINT = f'{POKEMON_API}type/'
 
+# Seconds the responses of each endpoint are kept in `response_cache`.
+POKEMON_DATA_TTL = 60 * 60 * 24
+POKEMON_NOT_FOUND_TTL = 60 * 10
+POKEMON_TYPES_TTL = 60 * 60 * 24
+POKEMON_COUNT_TTL = 60 * 60
+# Seconds before the indexes of Pokémon names and types are rebuilt in the background.
+NAME_INDEX_TTL = float(os.environ.get('POKEAPI_NAME_INDEX_TTL', 60 * 60 * 24))
+TYPE_INDEX_TTL = float(os.environ.get('POKEAPI_TYPE_INDEX_TTL', 60 * 60 * 24))
+
+response_cache = TTLCache(maxsize=int(os.environ.get('POKEAPI_CACHE_MAXSIZE', 256)))
+
+# Consecutive failures of an endpoint, e.g. "pokemon", after which its requests fail fast for
+# CIRCUIT_RESET_TIMEOUT seconds.  Set per endpoint with e.g. POKEAPI_CIRCUIT_THRESHOLDS="pokemon=10,type=3".
+CIRCUIT_THRESHOLD = int(os.environ.get('POKEAPI_CIRCUIT_THRESHOLD', 5))
+CIRCUIT_THRESHOLDS = {
+    resource.strip(): int(threshold)
+    for resource, _, threshold in (
+        item.partition('=') for item in os.environ.get('POKEAPI_CIRCUIT_THRESHOLDS', '').split(',') if item
+    )
+}
+CIRCUIT_RESET_TIMEOUT = float(os.environ.get('POKEAPI_CIRCUIT_RESET_TIMEOUT', 30))
+
+REQUEST_SECONDS = Histogram(
+    'pokeapi_request_duration_seconds',
+    'Duration of Poke API lookups, from the mirror or upstream.',
+    ['resource', 'outcome'],
+)
+DECODE_SECONDS = Histogram('pokeapi_json_decode_duration_seconds', 'Duration of decoding Poke API JSON.', ['resource'])
+
 
 class PokemonNotFound(Exception):
     """Exception raised when a Pokémon is not found."""
@@ -15,45 +64,221 @@ class PokemonNotFound(Exception):
         super().__init__(f"Pokemon '{pokemon_name}' not found.")
 
 
+@functools.cache
+def get_circuit(resource: str) -> CircuitBreaker:
+    """Returns the circuit breaker of the requests to an endpoint, e.g. ``pokemon``."""
+    return CircuitBreaker(
+        resource,
+        failure_threshold=CIRCUIT_THRESHOLDS.get(resource, CIRCUIT_THRESHOLD),
+        reset_timeout=CIRCUIT_RESET_TIMEOUT,
+    )
+
+
+def _decode(body: bytes, resource: str) -> Any:
+    with DECODE_SECONDS.time(resource=resource):
+        return json.loads(body)
+
+
+async def _get_json(url: str, params: dict[str, Any] | None = None) -> Any:
+    """Retrieve the JSON document at `url` from Poke API.
+
+    Responses are kept in the persistent mirror, see :func:`get_mirror`.
+    Mirrored responses younger than `MIRROR_MAX_AGE` are returned without any
+    request, older ones are revalidated with a conditional request.
+
+    Requests to each endpoint go through its circuit breaker, see
+    :func:`get_circuit`.  While the circuit is open, or when the request
+    fails, the last mirrored response is returned however old it is.
+
+    Raises:
+        ClientResponseError: If the response status is an error.
+        CircuitOpenError: If the circuit is open and nothing is mirrored.
+    """
+    key = f'{url}?{urlencode(sorted(params.items()))}' if params else url
+    resource = url.removeprefix(POKEMON_API).split('/', 1)[0]
+
+    with REQUEST_SECONDS.time(resource=resource) as labels:
+        mirror = get_mirror()
+        entry = await asyncio.to_thread(mirror.get, key) if mirror else None
+
+        if entry is not None and entry.age < MIRROR_MAX_AGE:
+            labels['outcome'] = 'mirrored'
+            return _decode(entry.body, resource)
+
+        circuit = get_circuit(resource)
+        if not circuit.allow_request():
+            if entry is None:
+                raise CircuitOpenError(resource, circuit.retry_after)
+            labels['outcome'] = 'stale'
+            return _decode(entry.body, resource)
+
+        headers = entry.conditional_headers() if entry else None
+        try:
+            async with get_session().get(url, params=params, headers=headers) as resp:
+                resp.raise_for_status()
+                body = await resp.read()
+        except (ClientError, asyncio.TimeoutError) as exc:
+            circuit.record_error(exc)
+            if entry is None or not is_failure(exc):
+                raise
+            logger.warning(
+                'Using the stale response of %s, as the Poke API failed: %s: %s', key, type(exc).__name__, exc
+            )
+            labels['outcome'] = 'stale'
+            return _decode(entry.body, resource)
+        except BaseException:
+            # E.g. cancelled as the action server stops, which doesn't count against the circuit.
+            circuit.release()
+            raise
+        circuit.record_success()
+
+        if resp.status == 304 and mirror and entry:
+            labels['outcome'] = 'not_modified'
+            await asyncio.to_thread(mirror.touch, key)
+            return _decode(entry.body, resource)
+
+        labels['outcome'] = 'fetched'
+        if mirror:
+            etag, last_modified = resp.headers.get('ETag'), resp.headers.get('Last-Modified')
+            await asyncio.to_thread(functools.partial(mirror.put, key, body, etag=etag, last_modified=last_modified))
+
+        return _decode(body, resource)
+
+
 async def check_pokemon_existence(pokemon_name: str) -> bool:
-    """Check the existence of a Pokémon in Poke API."""
-    async with aiohttp.ClientSession() as session:
-        async with session.head(f'{POKEMON_ENDPOINT}{pokemon_name.lower()}') as resp:
-            resp.raise_for_status()
-            return resp.ok
+    """Check the existence of a Pokémon, from the name index if it is built."""
+    name_index = await name_index_holder.get()
+    if name_index is not None:
+        return pokemon_name in name_index
+
+    url = f'{POKEMON_ENDPOINT}{normalize_name(pokemon_name)}'
 
+    with REQUEST_SECONDS.time(resource='pokemon') as labels:
+        mirror = get_mirror()
+        if mirror and await asyncio.to_thread(mirror.get, url):
+            labels['outcome'] = 'mirrored'
+            return True
 
+        circuit = get_circuit('pokemon')
+        circuit.check()
+        try:
+            async with get_session().head(url) as resp:
+                labels['outcome'] = 'fetched'
+                if resp.status != 404:
+                    resp.raise_for_status()
+        except (ClientError, asyncio.TimeoutError) as exc:
+            circuit.record_error(exc)
+            raise
+        except BaseException:
+            circuit.release()
+            raise
+        circuit.record_success()
+        return resp.ok
+
+
+@async_cached(
+    response_cache,
+    ttl=POKEMON_DATA_TTL,
+    key=normalize_name,
+    negative_ttl=POKEMON_NOT_FOUND_TTL,
+    negative_exceptions=(PokemonNotFound,),
+)
 async def retrieve_pokemon_data(pokemon_name: str) -> dict:
-    """Retrieve data from Poke API for a Pokémon."""
-    async with aiohttp.ClientSession() as session:
-        async with session.get(f'{POKEMON_ENDPOINT}{pokemon_name.lower()}') as resp:
-            if resp.status == 404:
-                raise PokemonNotFound(pokemon_name)
+    """Retrieve data from Poke API for a Pokémon, named as users write it, e.g. ``Mr. Mime``."""
+    try:
+        return await _get_json(f'{POKEMON_ENDPOINT}{normalize_name(pokemon_name)}')
+    except ClientResponseError as exc:
+        if exc.status == 404:
+            raise PokemonNotFound(pokemon_name) from exc
+        raise
+
+
+_prefetches: set[asyncio.Task] = set()
+
+
+async def _prefetch_pokemon_data(pokemon_name: str) -> None:
+    try:
+        await retrieve_pokemon_data(pokemon_name)
+    except (PokemonNotFound, ClientError, asyncio.TimeoutError) as exc:
+        logger.debug('Failed to prefetch the data of %s: %s: %s', pokemon_name, type(exc).__name__, exc)
 
-            resp.raise_for_status()
 
-            return await resp.json()
+def prefetch_pokemon_data(pokemon_name: str) -> None:
+    """Start retrieving the data of a Pokémon in the background, for the questions following up on it.
 
+    The data is kept in `response_cache`, where follow-up lookups find it,
+    or share its retrieval while in flight.  Nothing is retrieved if the
+    type index can already answer about the Pokémon.
+    """
+    pokemon_name = normalize_name(pokemon_name)
+    type_index = type_index_holder.value
+    if type_index and type_index.types_of(pokemon_name) is not None:
+        return
 
+    task = asyncio.ensure_future(_prefetch_pokemon_data(pokemon_name))
+    _prefetches.add(task)
+    task.add_done_callback(_prefetches.discard)
+
+
+@async_cached(response_cache, ttl=POKEMON_TYPES_TTL)
 async def retrieve_all_pokemon_types_data() -> dict:
     """Retrieve data for all Pokémon types from Poke API."""
-    async with aiohttp.ClientSession() as session:
-        async with session.get(POKEMON_TYPES_ENDPOINT) as resp:
-            resp.raise_for_status()
-            return await resp.json()
+    return await _get_json(POKEMON_TYPES_ENDPOINT)
 
 
+@async_cached(response_cache, ttl=POKEMON_COUNT_TTL)
 async def pokemon_count() -> int:
     """Get the count of total Pokémon from Poke API."""
-    async with aiohttp.ClientSession() as session:
-        async with session.get(POKEMON_ENDPOINT, params={'limit': 1}) as resp:
-            resp.raise_for_status()
-            data = await resp.json()
-            return data['count']
+    data = await _get_json(POKEMON_ENDPOINT, params={'limit': 1})
+    return data['count']
+
+
+async def build_name_index() -> NameIndex:
+    """Build the index of the names of every Pokémon, with a single request."""
+    pokemon_list = await _get_json(POKEMON_ENDPOINT, params={'limit': -1})
+    return NameIndex.from_names(result['name'] for result in pokemon_list['results'])
+
+
+async def build_type_index() -> TypeIndex:
+    """Build the index of the types of every Pokémon, with a request per type."""
+    type_list = await _get_json(POKEMON_TYPES_ENDPOINT, params={'limit': -1})
+    type_names = [result['name'] for result in type_list['results']]
+
+    documents = await asyncio.gather(*(_get_json(f'{POKEMON_TYPES_ENDPOINT}{name}') for name in type_names))
+    return TypeIndex.from_documents(type_names, documents)
+
+
+# Built in the background when the action server starts, see `register_startup_listener`, and rebuilt once expired.
+# None until then, or if building fails.  The questions asked meanwhile wait for the name index, a single request,
+# but not for the type index, a request per type.
+name_index_holder = Refreshed('index of Pokémon names', build_name_index, ttl=NAME_INDEX_TTL)
+type_index_holder = Refreshed('index of Pokémon types', build_type_index, ttl=TYPE_INDEX_TTL)
+
+
+def register_startup_listener(app_name: str = 'rasa_sdk') -> None:
+    """Starts building the indexes of Pokémon names and types in the background when the action server starts."""
+
+    async def _build_indexes(*args) -> None:  # pylint: disable=unused-argument
+        name_index_holder.start()
+        type_index_holder.start()
+
+    if not register_listener(_build_indexes, 'after_server_start', app_name):
+        logger.debug("Sanic app '%s' not found, the Pokémon indexes will be built on first use.", app_name)
+
+
+async def suggest_pokemon_names(pokemon_name: str, limit: int = 1) -> list[str]:
+    """Suggest the names of Pokémon close to a misspelled one, if the name index is built."""
+    name_index = await name_index_holder.get()
+    return name_index.suggest(pokemon_name, limit) if name_index else []
 
 
 async def verify_pokemon_type(pokemon_name: str, pokemon_type: str) -> bool:
-    """Verify the type of a Pokémon in Poke API."""
+    """Verify the type of a Pokémon, from the type index if it has the Pokémon."""
+    type_index = type_index_holder.get_nowait()
+    verified = type_index.has_type(pokemon_name, pokemon_type) if type_index else None
+    if verified is not None:
+        return verified
+
     data = await retrieve_pokemon_data(pokemon_name)
 
     pokemon_type = pokemon_type.lower()
@@ -61,14 +286,23 @@ async def verify_pokemon_type(pokemon_name: str, pokemon_type: str) -> bool:
 
 
 async def retrieve_pokemon_types(pokemon_name: str) -> list[str]:
-    """Retrieve the types of a Pokémon from Poke API."""
+    """Retrieve the types of a Pokémon, from the type index if it has the Pokémon."""
+    type_index = type_index_holder.get_nowait()
+    pokemon_types = type_index.types_of(pokemon_name) if type_index else None
+    if pokemon_types is not None:
+        return pokemon_types
+
     data = await retrieve_pokemon_data(pokemon_name)
 
     return [slot['type']['name'] for slot in data['types']]
 
 
 async def retrieve_all_pokemon_types() -> list[str]:
-    """Retrieve all Pokémon types from Poke API."""
+    """Retrieve all Pokémon types, from the type index if it is built."""
+    type_index = type_index_holder.get_nowait()
+    if type_index is not None:
+        return list(type_index.type_names)
+
     data = await retrieve_all_pokemon_types_data()
 
     return [slot['name'] for slot in data['results']]
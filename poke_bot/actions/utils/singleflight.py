@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import asyncio
+import weakref
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+_T = TypeVar('_T')
+_Calls = dict[Hashable, 'asyncio.Future[Any]']
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into a single call.
+
+    The first caller for a key starts the call; callers arriving while it
+    is in flight await the same future instead of starting their own.
+    In-flight calls are tracked per event loop.
+    """
+
+    def __init__(self) -> None:
+        self._calls: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Calls] = weakref.WeakKeyDictionary()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[_T]]) -> _T:
+        """Returns the result of `func`, shared with concurrent callers of `key`."""
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+
+        future = calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            calls[key] = future
+
+            def _forget(done: asyncio.Future[Any]) -> None:
+                if calls.get(key) is done:
+                    del calls[key]
+
+            future.add_done_callback(_forget)
+
+        # Shielded, so a cancelled caller doesn't cancel the call for the others.
+        return await asyncio.shield(future)
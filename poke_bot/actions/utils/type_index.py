@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import functools
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from .name_index import normalize_name
+
+
+@dataclass(frozen=True)
+class TypeIndex:
+    """Types of every Pokémon, built from the ``/type/{name}`` documents of the Poke API.
+
+    The types of a Pokémon are stored as the bytes of their positions in
+    `type_names`, ordered by slot, so the index of about a thousand
+    Pokémon takes a few dozen kilobytes.
+    """
+
+    type_names: tuple[str, ...]
+    pokemon_types: dict[str, bytes]
+
+    @classmethod
+    def from_documents(cls, type_names: Sequence[str], type_documents: Iterable[dict[str, Any]]) -> TypeIndex:
+        codes = {name: code for code, name in enumerate(type_names)}
+
+        slots: defaultdict[str, list[tuple[int, int]]] = defaultdict(list)
+        for document in type_documents:
+            code = codes[document['name']]
+            for pokemon in document['pokemon']:
+                slots[pokemon['pokemon']['name']].append((pokemon['slot'], code))
+
+        pokemon_types = {name: bytes(code for _, code in sorted(type_slots)) for name, type_slots in slots.items()}
+        return cls(tuple(type_names), pokemon_types)
+
+    @functools.cached_property
+    def type_codes(self) -> dict[str, int]:
+        return {name: code for code, name in enumerate(self.type_names)}
+
+    def types_of(self, pokemon_name: str) -> list[str] | None:
+        """Returns the types of a Pokémon by slot, or None if it isn't indexed."""
+        codes = self.pokemon_types.get(normalize_name(pokemon_name))
+        if codes is None:
+            return None
+        return [self.type_names[code] for code in codes]
+
+    def has_type(self, pokemon_name: str, type_name: str) -> bool | None:
+        """Whether a Pokémon has a type, or None if it isn't indexed."""
+        codes = self.pokemon_types.get(normalize_name(pokemon_name))
+        if codes is None:
+            return None
+        code = self.type_codes.get(type_name.lower())
+        return code is not None and code in codes
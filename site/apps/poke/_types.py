@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TypedDict
 
 from django.http import HttpRequest
@@ -38,6 +39,12 @@ class Stat(TypedDict):
     stat: StatBase
 
 
+class StatSummary(Stat):
+    """Stat of a Pokemon, with its percentage of the highest base stat."""
+
+    percentage: float
+
+
 class TypeBase(TypedDict):
     """Represents the base information of a Pokemon's type."""
 
@@ -52,17 +59,47 @@ class Type(TypedDict):
     type: TypeBase
 
 
+class AbilityBase(TypedDict):
+    """Represents the base information of a Pokemon's ability."""
+
+    name: str
+    url: str
+
+
+class Ability(TypedDict):
+    """Represents an ability of a Pokemon."""
+
+    ability: AbilityBase
+
+
 class Pokemon(TypedDict):
     """Represents detailed information about a Pokemon."""
 
     id: int
     name: str
     order: int
+    abilities: list[Ability]
     sprites: dict
     stats: list[Stat]
     types: list[Type]
 
 
+@dataclass(slots=True)
+class PokemonSummary:
+    """Compact projection of :class:`Pokemon` holding what the templates render.
+
+    The sprite is the URL of the official artwork, or an empty string if
+    the Pokemon has none.
+    """
+
+    id: int
+    name: str
+    sprite: str
+    abilities: list[Ability]
+    stats: list[StatSummary]
+    types: list[Type]
+
+
 class EffectEntry(TypedDict):
     """Represents an entry describing the effect of an item or ability."""
 
@@ -95,5 +132,11 @@ class BerryItem(TypedDict):
     item: Item
 
 
+class BerryItemSummary(BerryItem):
+    """A berry and its item, with the URL of the item sprite (or an empty string)."""
+
+    sprite: str
+
+
 class HtmxHttpRequest(HttpRequest):
     htmx: HtmxDetails
@@ -0,0 +1,37 @@
+from django.contrib import admin
+
+from .models import (
+    Berry,
+    Item,
+    Pokemon,
+    PokemonStat,
+    PokemonType,
+    PokemonTypeSlot,
+    Stat,
+)
+
+
+class PokemonTypeSlotInline(admin.TabularInline):
+    model = PokemonTypeSlot
+    extra = 0
+
+
+class PokemonStatInline(admin.TabularInline):
+    model = PokemonStat
+    extra = 0
+
+
+@admin.register(Pokemon)
+class PokemonAdmin(admin.ModelAdmin):
+    list_display = ['id', 'name', 'order']
+    search_fields = ['name']
+    inlines = [PokemonTypeSlotInline, PokemonStatInline]
+
+
+@admin.register(Berry)
+class BerryAdmin(admin.ModelAdmin):
+    list_display = ['id', 'name', 'item']
+    search_fields = ['name']
+
+
+admin.site.register([PokemonType, Stat, Item])
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from asgiref.sync import async_to_sync
+
+from django.conf import settings
+
+from apps.poke.cache import (
+    Incomplete,
+    aget_or_set_locked,
+    get_or_set_locked,
+    refresh_cached_value,
+)
+from apps.poke.models import Berry
+from apps.poke.utils.requests import (
+    retrieve_berries,
+    retrieve_berry_items,
+    summarize_berry_item,
+)
+
+if TYPE_CHECKING:
+    from apps.poke._types import BerryItemSummary
+
+# Versioned with the structure of the cached berries.
+BERRY_ITEMS_KEY = 'berry_items_info:2'
+BERRY_ITEMS_TIMEOUT = 60 * 60
+BERRY_ITEMS_STALE_TIMEOUT = 60 * 60 * 24
+
+
+async def retrieve_berry_items_info() -> list[BerryItemSummary] | Incomplete:
+    """Asynchronously retrieves the list of Berries information.
+
+    Uses the :func:`retrieve_berries` function to get the list of
+    Berry names, then fetches details for multiple Berries concurrently.
+    When some Berries could not be retrieved, the list is incomplete and
+    cached briefly.
+    """
+    berries = await retrieve_berries()
+    result = await retrieve_berry_items([berry['name'] for berry in berries['results']])
+    berry_items = [summarize_berry_item(berry_item) for berry_item in result.results]
+    if result.failures:
+        return Incomplete(berry_items)
+    return berry_items
+
+
+def get_berry_items(*, refresh: bool = False) -> list[BerryItemSummary]:
+    """Returns all berries with their items.
+
+    With the "database" data source, the berries are read from the
+    database.  Otherwise the list is retrieved from the Poke API and cached,
+    and a stale list is served while it is refreshed in the background.
+
+    Args:
+        refresh: Retrieve the list even if it is cached.
+    """
+    if settings.POKE_DATA_SOURCE == 'database':
+        return [berry.to_berry_item() for berry in Berry.objects.select_related('item')]
+
+    if refresh:
+        return refresh_cached_value(
+            BERRY_ITEMS_KEY,
+            async_to_sync(retrieve_berry_items_info),
+            timeout=BERRY_ITEMS_TIMEOUT,
+            stale_timeout=BERRY_ITEMS_STALE_TIMEOUT,
+        )
+
+    return get_or_set_locked(
+        BERRY_ITEMS_KEY,
+        async_to_sync(retrieve_berry_items_info),
+        timeout=BERRY_ITEMS_TIMEOUT,
+        stale_timeout=BERRY_ITEMS_STALE_TIMEOUT,
+    )
+
+
+async def aget_berry_items() -> list[BerryItemSummary]:
+    """Asynchronous version of :func:`get_berry_items`."""
+    if settings.POKE_DATA_SOURCE == 'database':
+        return [berry.to_berry_item() async for berry in Berry.objects.select_related('item')]
+
+    return await aget_or_set_locked(
+        BERRY_ITEMS_KEY,
+        retrieve_berry_items_info,
+        timeout=BERRY_ITEMS_TIMEOUT,
+        stale_timeout=BERRY_ITEMS_STALE_TIMEOUT,
+    )
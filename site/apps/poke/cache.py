@@ -1,8 +1,18 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+import asyncio
+import functools
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, TypeVar
 
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+
+from django.core.cache import cache as default_cache
 from django.middleware.cache import CacheMiddleware
 from django.utils.decorators import decorator_from_middleware_with_args
 
@@ -11,6 +21,8 @@ if TYPE_CHECKING:
 
     _F = TypeVar("_F", bound=Callable[..., Any])
 
+logger = logging.getLogger(__name__)
+
 
 class NoQueryParamCacheMiddleware(CacheMiddleware):
     """Cache middleware bypassing caching for requests with the "q" parameter.
@@ -26,6 +38,45 @@ class NoQueryParamCacheMiddleware(CacheMiddleware):
         return None
 
 
+def decorator_from_middleware(middleware_class: type, **middleware_kwargs: Any) -> Callable[[_F], _F]:
+    """Like ``decorator_from_middleware_with_args()``, also for async views.
+
+    Django 4.2 view decorators expect a view to return a response, while an
+    async view returns a coroutine.  Async views are therefore wrapped in an
+    async wrapper running the middleware around the awaited response.
+    """
+    sync_decorator = decorator_from_middleware_with_args(middleware_class)(**middleware_kwargs)
+
+    def decorator(view_func: _F) -> _F:
+        if not iscoroutinefunction(view_func):
+            return sync_decorator(view_func)
+
+        middleware = middleware_class(view_func, **middleware_kwargs)
+
+        @functools.wraps(view_func)
+        async def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            response = await sync_to_async(middleware.process_request)(request)
+            if response is not None:
+                return response
+
+            response = await view_func(request, *args, **kwargs)
+
+            # Like Django, defer processing a template response until it is rendered.
+            if callable(getattr(response, 'render', None)):
+                response.add_post_render_callback(functools.partial(middleware.process_response, request))
+                return response
+            return await sync_to_async(middleware.process_response)(request, response)
+
+        return wrapper  # pyright: ignore[reportGeneralTypeIssues]
+
+    return decorator
+
+
+def cache_page(timeout: float, *, cache: Any | None = None, key_prefix: Any | None = None) -> Callable[[_F], _F]:
+    """Decorator for caching a view, like Django's ``cache_page()``, also for async views."""
+    return decorator_from_middleware(CacheMiddleware, page_timeout=timeout, cache_alias=cache, key_prefix=key_prefix)
+
+
 def cache_page_without_q_param(
     timeout: float,
     *,
@@ -33,8 +84,260 @@ def cache_page_without_q_param(
     key_prefix: Any | None = None,
 ) -> Callable[[_F], _F]:
     """Decorator for caching a view when the "q" query parameter is absent."""
-    return decorator_from_middleware_with_args(NoQueryParamCacheMiddleware)(
+    return decorator_from_middleware(
+        NoQueryParamCacheMiddleware,
         page_timeout=timeout,
         cache_alias=cache,
         key_prefix=key_prefix,
     )
+
+
+# Seconds an incomplete value is fresh, before it is retrieved again.
+INCOMPLETE_TIMEOUT = 60
+
+
+@dataclass
+class Incomplete:
+    """Value computed with some of its parts missing, e.g. the items which failed to be retrieved.
+
+    Returned by the `default` of :func:`get_or_set_locked` to cache the
+    value as fresh for `timeout` seconds only, instead of the full timeout.
+    """
+
+    value: Any
+    timeout: float = INCOMPLETE_TIMEOUT
+
+
+def _unwrap(value: Any, timeout: float) -> tuple[Any, float]:
+    if isinstance(value, Incomplete):
+        return value.value, min(timeout, value.timeout)
+    return value, timeout
+
+
+@dataclass
+class CachedValue:
+    """Value stored by :func:`get_or_set_locked`, with the time it goes stale.
+
+    As each computed value is stored with its own `stale_at`, it also tells
+    apart the versions of the value.
+    """
+
+    value: Any
+    stale_at: float
+
+
+def set_cached_value(key: str, value: Any, timeout: float, *, stale_timeout: float = 0) -> CachedValue:
+    """Stores `value` as fresh for `timeout` seconds, then stale for `stale_timeout` seconds."""
+    entry = CachedValue(value, stale_at=time.time() + timeout)
+    default_cache.set(key, entry, timeout=timeout + stale_timeout)
+    return entry
+
+
+def _refresh_cached_entry(key: str, default: Callable[[], Any], timeout: float, *, stale_timeout: float) -> CachedValue:
+    value, timeout = _unwrap(default(), timeout)
+    return set_cached_value(key, value, timeout, stale_timeout=stale_timeout)
+
+
+def refresh_cached_value(key: str, default: Callable[[], Any], timeout: float, *, stale_timeout: float = 0) -> Any:
+    """Computes the value of `key` with `default` and stores it unconditionally."""
+    return _refresh_cached_entry(key, default, timeout, stale_timeout=stale_timeout).value
+
+
+def _release_lock(lock_key: str, token: str) -> None:
+    if default_cache.get(lock_key) == token:
+        default_cache.delete(lock_key)
+
+
+def _refresh_in_background(
+    key: str,
+    default: Callable[[], Any],
+    timeout: float,
+    *,
+    stale_timeout: float,
+    lock_timeout: float,
+) -> None:
+    """Refreshes `key` in a background thread, unless another caller already is."""
+    lock_key = f'{key}:lock'
+    token = uuid.uuid4().hex
+    if not default_cache.add(lock_key, token, timeout=lock_timeout):
+        return
+
+    def refresh() -> None:
+        try:
+            refresh_cached_value(key, default, timeout, stale_timeout=stale_timeout)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception('Failed to refresh the cached value of %s.', key)
+        finally:
+            _release_lock(lock_key, token)
+
+    threading.Thread(target=refresh, name=f'refresh-{key}', daemon=True).start()
+
+
+def get_or_set_locked(
+    key: str,
+    default: Callable[[], Any],
+    timeout: float,
+    *,
+    stale_timeout: float = 0,
+    lock_timeout: float = 60,
+    wait_timeout: float = 30,
+    poll_interval: float = 0.25,
+) -> Any:
+    """Returns the value of `key`, computing it with `default` on a miss.
+
+    Unlike ``cache.get_or_set()``, only one caller (across all workers sharing
+    the cache) computes the value at a time.  The others wait for it to appear
+    in the cache, and compute it themselves only after `wait_timeout` seconds.
+
+    A value older than `timeout` seconds is stale: it is still returned for
+    up to `stale_timeout` more seconds, while a background thread refreshes
+    it.  Callers therefore only block when there is no value at all.
+
+    Args:
+        key: The cache key.
+        default: Computes the value on a cache miss, wrapped in
+            :class:`Incomplete` when parts of it are missing.
+        timeout: Seconds the computed value is fresh.
+        stale_timeout: Seconds a stale value is served while refreshing it.
+        lock_timeout: Seconds after which a lock left by a crashed worker
+            expires.
+        wait_timeout: Maximum seconds spent waiting for another worker.
+        poll_interval: Seconds between cache lookups while waiting.
+    """
+    return get_or_set_entry_locked(
+        key,
+        default,
+        timeout,
+        stale_timeout=stale_timeout,
+        lock_timeout=lock_timeout,
+        wait_timeout=wait_timeout,
+        poll_interval=poll_interval,
+    ).value
+
+
+def get_or_set_entry_locked(
+    key: str,
+    default: Callable[[], Any],
+    timeout: float,
+    *,
+    stale_timeout: float = 0,
+    lock_timeout: float = 60,
+    wait_timeout: float = 30,
+    poll_interval: float = 0.25,
+) -> CachedValue:
+    """Like :func:`get_or_set_locked`, but returns the cached entry, e.g. to tell the versions of the value apart."""
+    entry: CachedValue | None = default_cache.get(key)
+    if entry is not None:
+        if entry.stale_at <= time.time():
+            _refresh_in_background(key, default, timeout, stale_timeout=stale_timeout, lock_timeout=lock_timeout)
+        return entry
+
+    lock_key = f'{key}:lock'
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + wait_timeout
+
+    while not (locked := default_cache.add(lock_key, token, timeout=lock_timeout)):
+        if time.monotonic() >= deadline:
+            break
+
+        time.sleep(poll_interval)
+
+        entry = default_cache.get(key)
+        if entry is not None:
+            return entry
+
+    try:
+        # The value may have been set between the last lookup and acquiring the lock.
+        entry = default_cache.get(key)
+        if entry is not None:
+            return entry
+        return _refresh_cached_entry(key, default, timeout, stale_timeout=stale_timeout)
+    finally:
+        if locked:
+            _release_lock(lock_key, token)
+
+
+async def _arelease_lock(lock_key: str, token: str) -> None:
+    if await default_cache.aget(lock_key) == token:
+        await default_cache.adelete(lock_key)
+
+
+async def aget_or_set_locked(
+    key: str,
+    default: Callable[[], Awaitable[Any]],
+    timeout: float,
+    *,
+    stale_timeout: float = 0,
+    lock_timeout: float = 60,
+    wait_timeout: float = 30,
+    poll_interval: float = 0.25,
+) -> Any:
+    """Asynchronous version of :func:`get_or_set_locked`.
+
+    `default` is a coroutine function, and waiting for another worker does
+    not block the event loop.  Stale values are refreshed in a background
+    thread, which outlives the event loop of the request under WSGI.
+    """
+    return (
+        await aget_or_set_entry_locked(
+            key,
+            default,
+            timeout,
+            stale_timeout=stale_timeout,
+            lock_timeout=lock_timeout,
+            wait_timeout=wait_timeout,
+            poll_interval=poll_interval,
+        )
+    ).value
+
+
+async def aget_or_set_entry_locked(
+    key: str,
+    default: Callable[[], Awaitable[Any]],
+    timeout: float,
+    *,
+    stale_timeout: float = 0,
+    lock_timeout: float = 60,
+    wait_timeout: float = 30,
+    poll_interval: float = 0.25,
+) -> CachedValue:
+    """Asynchronous version of :func:`get_or_set_entry_locked`."""
+    entry: CachedValue | None = await default_cache.aget(key)
+    if entry is not None:
+        if entry.stale_at <= time.time():
+            await sync_to_async(_refresh_in_background)(
+                key,
+                async_to_sync(default),
+                timeout,
+                stale_timeout=stale_timeout,
+                lock_timeout=lock_timeout,
+            )
+        return entry
+
+    lock_key = f'{key}:lock'
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + wait_timeout
+
+    while not (locked := await default_cache.aadd(lock_key, token, timeout=lock_timeout)):
+        if time.monotonic() >= deadline:
+            break
+
+        await asyncio.sleep(poll_interval)
+
+        entry = await default_cache.aget(key)
+        if entry is not None:
+            return entry
+
+    try:
+        # The value may have been set between the last lookup and acquiring the lock.
+        entry = await default_cache.aget(key)
+        if entry is not None:
+            return entry
+
+        value, timeout = _unwrap(await default(), timeout)
+        entry = CachedValue(value, stale_at=time.time() + timeout)
+        await default_cache.aset(key, entry, timeout=timeout + stale_timeout)
+        return entry
+    finally:
+        if locked:
+            await _arelease_lock(lock_key, token)
@@ -0,0 +1,202 @@
+"""Cache backends compressing large values and counting hits and misses.
+
+Each backend extends a Django backend of the same name, e.g.
+:class:`CompressedFileBasedCache` extends ``FileBasedCache``.  Settings
+select them from ``DJANGO_CACHE_URL``, see ``config/settings.py``.
+
+Besides the settings of the extended backend, they accept:
+
+- ``COMPRESS_MIN_SIZE``: pickled size in bytes from which values are
+  compressed, 1024 by default;
+- ``COMPRESS_LEVEL``: zlib compression level, 6 by default.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.memcached import PyLibMCCache, PyMemcacheCache
+from django.core.cache.backends.redis import RedisCache
+from django.core.files import locks
+
+from apps.poke.utils.metrics import Histogram
+
+_MISSING = object()
+
+OPERATION_SECONDS = Histogram(
+    'cache_operation_duration_seconds',
+    'Duration of cache operations, serialization included.',
+    ['operation', 'outcome'],
+)
+SERIALIZATION_SECONDS = Histogram(
+    'cache_serialization_duration_seconds',
+    'Duration of pickling and compressing cached values, or the reverse.',
+    ['operation'],
+)
+
+
+class CompressedValue:
+    """A pickled and compressed value, as stored by the backends."""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    def __getstate__(self) -> bytes:
+        return self.data
+
+    def __setstate__(self, state: bytes) -> None:
+        self.data = state
+
+
+@dataclass
+class CacheStats:
+    """Hits and misses of a cache backend, counted by the current process."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CompressedCacheMixin:
+    """Compresses values larger than ``COMPRESS_MIN_SIZE`` and counts lookups.
+
+    Values are pickled with the highest protocol before being measured, and
+    stored compressed if large enough.  The backend pickles the compressed
+    bytes again, which costs little compared to compressing them.
+    """
+
+    # Whether the backend implements get_many() itself, instead of calling get() for each key.
+    native_get_many = False
+
+    def __init__(self, location: str, params: dict[str, Any]) -> None:
+        super().__init__(location, params)  # pyright: ignore[reportGeneralTypeIssues]
+        self.compress_min_size = int(params.get('COMPRESS_MIN_SIZE', 1024))
+        self.compress_level = int(params.get('COMPRESS_LEVEL', 6))
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    def _encode(self, value: Any) -> Any:
+        with SERIALIZATION_SECONDS.time(operation='encode'):
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            if len(data) < self.compress_min_size:
+                return value
+            return CompressedValue(zlib.compress(data, self.compress_level))
+
+    def _decode(self, value: Any) -> Any:
+        if isinstance(value, CompressedValue):
+            with SERIALIZATION_SECONDS.time(operation='decode'):
+                return pickle.loads(zlib.decompress(value.data))
+        return value
+
+    def _count(self, hits: int, misses: int) -> None:
+        with self._stats_lock:
+            self.stats.hits += hits
+            self.stats.misses += misses
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        with OPERATION_SECONDS.time(operation='add', outcome='ok'):
+            return super().add(key, self._encode(value), timeout, version)  # pyright: ignore[reportGeneralTypeIssues]
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        with OPERATION_SECONDS.time(operation='set', outcome='ok'):
+            return super().set(key, self._encode(value), timeout, version)  # pyright: ignore[reportGeneralTypeIssues]
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        with OPERATION_SECONDS.time(operation='set_many', outcome='ok'):
+            encoded = {key: self._encode(value) for key, value in data.items()}
+            return super().set_many(encoded, timeout, version)  # pyright: ignore[reportGeneralTypeIssues]
+
+    def get(self, key, default=None, version=None):
+        with OPERATION_SECONDS.time(operation='get') as labels:
+            value = super().get(key, _MISSING, version)  # pyright: ignore[reportGeneralTypeIssues]
+            if value is _MISSING:
+                labels['outcome'] = 'miss'
+                self._count(hits=0, misses=1)
+                return default
+
+            labels['outcome'] = 'hit'
+            self._count(hits=1, misses=0)
+            return self._decode(value)
+
+    def get_many(self, keys, version=None):
+        with OPERATION_SECONDS.time(operation='get_many', outcome='ok'):
+            keys = list(keys)
+            values = super().get_many(keys, version)  # pyright: ignore[reportGeneralTypeIssues]
+            if self.native_get_many:
+                self._count(hits=len(values), misses=len(keys) - len(values))
+            return {key: self._decode(value) for key, value in values.items()}
+
+    def get_size(self) -> dict[str, int]:
+        """Returns the number of entries and the bytes they use, when the backend can tell."""
+        return {}
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            'backend': type(self).__name__,
+            'hits': self.stats.hits,
+            'misses': self.stats.misses,
+            'hit_rate': round(self.stats.hit_rate, 4),
+            **self.get_size(),
+        }
+
+
+class CompressedLocMemCache(CompressedCacheMixin, LocMemCache):
+    def get_size(self) -> dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._cache), 'bytes': sum(len(value) for value in self._cache.values())}
+
+
+class CompressedFileBasedCache(CompressedCacheMixin, FileBasedCache):
+    # Not a cache file, so never culled nor cleared.
+    add_lock_name = 'add.lock'
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        # FileBasedCache checks that the key is missing, then sets it, so concurrent callers could all add it, e.g.
+        # the workers taking a lock of `apps.poke.cache`.  An exclusive lock on a file makes it atomic across the
+        # processes sharing the cache directory.  The value is set with FileBasedCache.set(), as set() would encode
+        # it a second time.
+        with OPERATION_SECONDS.time(operation='add', outcome='ok'):
+            value = self._encode(value)
+            self._createdir()
+            with open(os.path.join(self._dir, self.add_lock_name), 'ab') as lock_file:
+                locks.lock(lock_file, locks.LOCK_EX)
+                try:
+                    if self.has_key(key, version):
+                        return False
+                    FileBasedCache.set(self, key, value, timeout, version)
+                    return True
+                finally:
+                    locks.unlock(lock_file)
+
+    def get_size(self) -> dict[str, int]:
+        files = self._list_cache_files()
+        return {'entries': len(files), 'bytes': sum(os.path.getsize(file) for file in files if os.path.exists(file))}
+
+
+class CompressedRedisCache(CompressedCacheMixin, RedisCache):
+    native_get_many = True
+
+    def get_size(self) -> dict[str, int]:
+        client = self._cache.get_client()
+        return {'entries': client.dbsize(), 'bytes': client.info('memory')['used_memory']}
+
+
+class CompressedPyMemcacheCache(CompressedCacheMixin, PyMemcacheCache):
+    native_get_many = True
+
+
+class CompressedPyLibMCCache(CompressedCacheMixin, PyLibMCCache):
+    native_get_many = True
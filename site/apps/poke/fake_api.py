@@ -0,0 +1,239 @@
+"""Offline stand-in for the Poke API, serving recorded fixtures.
+
+Fixtures use the layout of https://github.com/PokeAPI/api-data: each
+resource is stored as ``<resource>/<id>/index.json`` and each list as
+``<resource>/index.json``, with URLs relative to the server, e.g.
+``/api/v2/pokemon/25/``.  They are recorded from the Poke API by
+:func:`record_fixtures`, or taken from a checkout of api-data.
+
+:class:`FakePokeAPI` serves them under ``/api/v2/``, with configurable
+latency, error rate and throttling, so that the site and the action server
+can be tested and benchmarked without the internet.  Point them at it with
+``POKEAPI_BASE_URL``.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+
+from django.conf import settings
+
+from apps.poke.utils.fetch import fetch_all
+from apps.poke.utils.requests import (
+    POKEMON_API,
+    resource_id_from_url,
+    retrieve_berries,
+    retrieve_berry_items,
+    retrieve_multiple_pokemon,
+    retrieve_pokemon_list,
+)
+
+logger = logging.getLogger(__name__)
+
+RESOURCES = ('pokemon', 'type', 'berry', 'item')
+API_PATH = '/api/v2/'
+
+# Number of results of a list without a limit, as on the Poke API.
+DEFAULT_LIMIT = 20
+
+
+def _relative_urls(document: Any) -> Any:
+    """Makes the Poke API URLs in `document` relative, as in api-data."""
+    return json.loads(json.dumps(document).replace(f'"{POKEMON_API}', f'"{API_PATH}'))
+
+
+def _write_json(path: Path, document: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(_relative_urls(document)), encoding='utf-8')
+
+
+def _write_list(path: Path, resource: str, documents: list[dict[str, Any]]) -> None:
+    results = [{'name': document['name'], 'url': f'{API_PATH}{resource}/{document["id"]}/'} for document in documents]
+    resource_list = {'count': len(results), 'next': None, 'previous': None, 'results': results}
+    _write_json(path / resource / 'index.json', resource_list)
+    for document in documents:
+        _write_json(path / resource / str(document['id']) / 'index.json', document)
+
+
+async def record_fixtures(path: Path, *, pokemon: int, berries: int) -> dict[str, int]:
+    """Records the first Pokémon and berries of the Poke API into `path`.
+
+    Also records the types of the Pokémon and the items of the berries.
+    Returns the number of recorded resources of each kind.
+    """
+    pokemon_list = await retrieve_pokemon_list(limit=pokemon)
+    pokemon_result = await retrieve_multiple_pokemon([p['name'] for p in pokemon_list['results']])
+
+    berry_list = await retrieve_berries(limit=berries)
+    berry_result = await retrieve_berry_items([berry['name'] for berry in berry_list['results']])
+
+    type_urls = {type_slot['type']['url'] for p in pokemon_result.results for type_slot in p['types']}
+    async with aiohttp.ClientSession() as session:
+
+        async def retrieve_type(url: str) -> dict[str, Any]:
+            async with session.get(url) as resp:
+                resp.raise_for_status()
+                return await resp.json()
+
+        type_result = await fetch_all(
+            sorted(type_urls, key=resource_id_from_url),
+            retrieve_type,
+            concurrency=settings.POKEAPI_FETCH_CONCURRENCY,
+            retries=settings.POKEAPI_FETCH_RETRIES,
+        )
+
+    for failed in (*pokemon_result.failures, *berry_result.failures, *type_result.failures):
+        logger.warning('Skipping %s, which could not be retrieved.', failed)
+
+    _write_list(path, 'pokemon', pokemon_result.results)
+    _write_list(path, 'type', type_result.results)
+    _write_list(path, 'berry', [berry_item['berry'] for berry_item in berry_result.results])
+    _write_list(path, 'item', [berry_item['item'] for berry_item in berry_result.results])
+
+    return {
+        'pokemon': len(pokemon_result.results),
+        'type': len(type_result.results),
+        'berry': len(berry_result.results),
+    }
+
+
+class FakePokeAPI:
+    """Web application serving fixtures like the Poke API.
+
+    Args:
+        path: Directory of the fixtures, e.g. the ``data/api/v2`` directory
+            of an api-data checkout.
+        latency: Mean seconds before each response.
+        jitter: Maximum deviation from `latency`, in seconds.
+        error_rate: Fraction of the requests failing with a server error.
+        rate_limit: Requests per second above which requests are throttled
+            with a 429 response.  Unlimited when 0.
+        seed: Seed of the random latencies and errors, for reproducible runs.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        latency: float = 0,
+        jitter: float = 0,
+        error_rate: float = 0,
+        rate_limit: int = 0,
+        seed: int | None = None,
+    ) -> None:
+        self.path = path
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.random = random.Random(seed)
+        self.stats: Counter[str] = Counter()
+        self._window = (0, 0)
+        # Fixtures don't change while served, so they are read once.
+        self._bodies: dict[tuple[str, str], bytes | None] = {}
+        self._ids: dict[str, dict[str, str]] = {}
+
+    def resources(self) -> list[str]:
+        return [resource for resource in RESOURCES if (self.path / resource / 'index.json').is_file()]
+
+    def _read(self, resource: str, resource_id: str = '') -> bytes | None:
+        if (resource, resource_id) not in self._bodies:
+            file = self.path / resource / resource_id / 'index.json'
+            self._bodies[resource, resource_id] = file.read_bytes() if file.is_file() else None
+        return self._bodies[resource, resource_id]
+
+    def _ids_by_name(self, resource: str) -> dict[str, str]:
+        if resource not in self._ids:
+            results = json.loads(self._read(resource) or b'{"results": []}')['results']
+            self._ids[resource] = {result['name']: str(resource_id_from_url(result['url'])) for result in results}
+        return self._ids[resource]
+
+    def _throttled(self) -> bool:
+        """Whether the request exceeds the rate limit, counted in windows of one second."""
+        if not self.rate_limit:
+            return False
+
+        second = int(time.monotonic())
+        start, count = self._window
+        self._window = (second, count + 1) if second == start else (second, 1)
+        return self._window[1] > self.rate_limit
+
+    def _json_response(self, request: web.Request, body: bytes) -> web.Response:
+        body = body.replace(f'"{API_PATH}'.encode(), f'"{request.scheme}://{request.host}{API_PATH}'.encode())
+        etag = f'"{hashlib.sha1(body, usedforsecurity=False).hexdigest()}"'
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(body=body, content_type='application/json', headers={'ETag': etag})
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        if not request.path.startswith(API_PATH):
+            return await handler(request)
+
+        delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+        await asyncio.sleep(max(delay, 0))
+
+        if self._throttled():
+            response: web.StreamResponse = web.Response(
+                status=429, text='Too Many Requests', headers={'Retry-After': '1'}
+            )
+        elif self.error_rate and self.random.random() < self.error_rate:
+            response = web.Response(status=self.random.choice((500, 502, 503)), text='Server Error')
+        else:
+            try:
+                response = await handler(request)
+            except web.HTTPException as exc:
+                response = exc
+
+        self.stats[str(response.status)] += 1
+        return response
+
+    async def list_resources(self, request: web.Request) -> web.Response:
+        resource = request.match_info['resource']
+        body = self._read(resource)
+        if body is None:
+            raise web.HTTPNotFound(text='Not Found')
+
+        document = json.loads(body)
+        limit = int(request.query.get('limit', DEFAULT_LIMIT))
+        offset = int(request.query.get('offset', 0))
+        end = len(document['results']) if limit < 0 else offset + limit
+
+        def page_url(page_offset: int) -> str:
+            return f'{API_PATH}{resource}/?offset={page_offset}&limit={limit}'
+
+        document['next'] = page_url(end) if end < len(document['results']) else None
+        document['previous'] = page_url(max(offset - limit, 0)) if offset and limit >= 0 else None
+        document['results'] = document['results'][offset:end]
+        return self._json_response(request, json.dumps(document).encode())
+
+    async def retrieve_resource(self, request: web.Request) -> web.Response:
+        resource, key = request.match_info['resource'], request.match_info['key'].lower()
+        resource_id = key if key.isdigit() else self._ids_by_name(resource).get(key)
+        body = self._read(resource, resource_id) if resource_id else None
+        if body is None:
+            raise web.HTTPNotFound(text='Not Found')
+        return self._json_response(request, body)
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        """Returns the number of responses by status, e.g. to count upstream requests."""
+        return web.json_response(self.stats)
+
+    def application(self) -> web.Application:
+        app = web.Application(middlewares=[self.middleware])
+        resources = '{resource:' + '|'.join(RESOURCES) + '}'
+        app.router.add_get(f'{API_PATH}{resources}/', self.list_resources)
+        app.router.add_get(f'{API_PATH}{resources}/{{key}}', self.retrieve_resource)
+        app.router.add_get(f'{API_PATH}{resources}/{{key}}/', self.retrieve_resource)
+        app.router.add_get('/stats/', self.get_stats)
+        return app
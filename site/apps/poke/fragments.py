@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import SafeString, mark_safe
+
+from apps.poke.middleware import RENDER_SECONDS
+from apps.poke.pokedex import POKEMON_SUMMARY_TIMEOUT
+
+if TYPE_CHECKING:
+    from apps.poke._types import PokemonSummary
+
+POKEMON_CARD_TEMPLATE = 'components/pokemon_card.html'
+
+
+@functools.cache
+def _cached_template_version(template_name: str) -> str:
+    return _template_version(template_name)
+
+
+def _template_version(template_name: str) -> str:
+    source = get_template(template_name).template.source  # pyright: ignore[reportGeneralTypeIssues]
+    # Rendered templates link to the static files by their content hash, and to sprites or their thumbnails.
+    links = [
+        getattr(staticfiles_storage, 'manifest_hash', ''),
+        settings.STATIC_URL,
+        settings.POKE_SPRITES_SOURCE_URL,
+        settings.POKE_SPRITES_ROOT,
+    ]
+    content = '\n'.join([source, *links])
+    return hashlib.sha1(content.encode(), usedforsecurity=False).hexdigest()[:12]
+
+
+def template_version(template_name: str) -> str:
+    """Returns a hash of the source of a template, changing with the template.
+
+    The hash also changes with the static files and the sprite settings, as
+    the rendered template links to them.  They only change on deploy, so the
+    hash is computed once per process, except in debug mode where templates
+    are edited live.
+    """
+    if settings.DEBUG:
+        return _template_version(template_name)
+    return _cached_template_version(template_name)
+
+
+def _render_pokemon_card(pokemon: PokemonSummary) -> str:
+    with RENDER_SECONDS.time(template=POKEMON_CARD_TEMPLATE):
+        return render_to_string(POKEMON_CARD_TEMPLATE, {'pokemon': pokemon})
+
+
+def pokemon_card_key(pokemon_id: int, version: str) -> str:
+    return f'pokemon_card:{version}:{pokemon_id}'
+
+
+async def arender_pokemon_cards(pokemon_list: Sequence[PokemonSummary]) -> list[SafeString]:
+    """Returns the rendered cards of the Pokémon in `pokemon_list`, in the same order.
+
+    Cards are cached by Pokémon and template version, so pages and search
+    results are assembled from cards rendered once.
+    """
+    version = template_version(POKEMON_CARD_TEMPLATE)
+    keys = [pokemon_card_key(pokemon.id, version) for pokemon in pokemon_list]
+    cards: dict[str, str] = await cache.aget_many(keys)
+
+    rendered = {key: _render_pokemon_card(pokemon) for pokemon, key in zip(pokemon_list, keys) if key not in cards}
+    if rendered:
+        await cache.aset_many(rendered, timeout=POKEMON_SUMMARY_TIMEOUT)
+        cards.update(rendered)
+
+    # Escaped when rendered.
+    return [mark_safe(cards[key]) for key in keys]
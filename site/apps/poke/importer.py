@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from django.db import transaction
+
+from apps.poke.models import (
+    Berry,
+    Item,
+    Pokemon,
+    PokemonStat,
+    PokemonType,
+    PokemonTypeSlot,
+    Stat,
+)
+from apps.poke.utils.requests import (
+    resource_id_from_url,
+    retrieve_berries,
+    retrieve_berry_items,
+    retrieve_multiple_pokemon,
+    retrieve_pokemon_list,
+    summarize_pokemon,
+)
+
+if TYPE_CHECKING:
+    from apps.poke._types import BerryItem
+    from apps.poke._types import Pokemon as PokemonData
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+def _read_json(path: Path) -> Any:
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def _english_effect(item: dict) -> dict[str, str]:
+    """Returns the English effect entry of an item, falling back to the first one."""
+    entries = item.get('effect_entries') or [{}]
+    entry = next((entry for entry in entries if entry.get('language', {}).get('name') == 'en'), entries[0])
+    return {'effect': entry.get('effect', ''), 'short_effect': entry.get('short_effect', '')}
+
+
+def load_from_directory(path: Path) -> tuple[list[PokemonData], list[BerryItem]]:
+    """Reads Pokémon and berries from a local Poke API data dump.
+
+    Expects the layout of https://github.com/PokeAPI/api-data, where `path`
+    is the ``data/api/v2`` directory and each resource is stored as
+    ``<resource>/<id>/index.json``.
+    """
+    pokemon = [_read_json(file) for file in (path / 'pokemon').glob('*/index.json')]
+
+    berry_items: list[BerryItem] = []
+    for file in (path / 'berry').glob('*/index.json'):
+        berry = _read_json(file)
+        item_id = resource_id_from_url(berry['item']['url'])
+        berry_items.append({'berry': berry, 'item': _read_json(path / 'item' / str(item_id) / 'index.json')})
+
+    return pokemon, berry_items
+
+
+async def load_from_api() -> tuple[list[PokemonData], list[BerryItem]]:
+    """Retrieves all Pokémon and berries from the Poke API."""
+    pokemon_list = await retrieve_pokemon_list()
+    pokemon = await retrieve_multiple_pokemon([pokemon['name'] for pokemon in pokemon_list['results']])
+
+    berries = await retrieve_berries()
+    berry_items = await retrieve_berry_items([berry['name'] for berry in berries['results']])
+
+    for failed in (*pokemon.failures, *berry_items.failures):
+        logger.warning('Skipping %s, which could not be retrieved.', failed)
+
+    return pokemon.results, berry_items.results
+
+
+@transaction.atomic
+def import_pokemon(documents: Iterable[PokemonData], *, batch_size: int = BATCH_SIZE) -> int:
+    """Creates or updates Pokémon, with their types and stats, from Poke API documents.
+
+    Returns the number of imported Pokémon.
+    """
+    types: dict[int, PokemonType] = {}
+    stats: dict[int, Stat] = {}
+    pokemon: list[Pokemon] = []
+    type_slots: list[PokemonTypeSlot] = []
+    pokemon_stats: list[PokemonStat] = []
+
+    for document in documents:
+        pokemon.append(
+            Pokemon(
+                id=document['id'],
+                name=document['name'],
+                order=document['order'],
+                sprite=summarize_pokemon(document).sprite,
+                abilities=[ability['ability']['name'] for ability in document['abilities']],
+            )
+        )
+
+        for type_slot in document['types']:
+            type_id = resource_id_from_url(type_slot['type']['url'])
+            types[type_id] = PokemonType(id=type_id, name=type_slot['type']['name'])
+            type_slots.append(PokemonTypeSlot(pokemon_id=document['id'], type_id=type_id, slot=type_slot['slot']))
+
+        for pokemon_stat in document['stats']:
+            stat_id = resource_id_from_url(pokemon_stat['stat']['url'])
+            stats[stat_id] = Stat(id=stat_id, name=pokemon_stat['stat']['name'])
+            pokemon_stats.append(
+                PokemonStat(
+                    pokemon_id=document['id'],
+                    stat_id=stat_id,
+                    base_stat=pokemon_stat['base_stat'],
+                    effort=pokemon_stat['effort'],
+                )
+            )
+
+    upsert = {'update_conflicts': True, 'unique_fields': ['id'], 'batch_size': batch_size}
+    PokemonType.objects.bulk_create(types.values(), update_fields=['name'], **upsert)
+    Stat.objects.bulk_create(stats.values(), update_fields=['name'], **upsert)
+    Pokemon.objects.bulk_create(pokemon, update_fields=['name', 'order', 'sprite', 'abilities'], **upsert)
+
+    # Types and stats of a Pokémon are replaced as a whole.
+    pokemon_ids = [p.id for p in pokemon]
+    PokemonTypeSlot.objects.filter(pokemon_id__in=pokemon_ids).delete()
+    PokemonTypeSlot.objects.bulk_create(type_slots, batch_size=batch_size)
+    PokemonStat.objects.filter(pokemon_id__in=pokemon_ids).delete()
+    PokemonStat.objects.bulk_create(pokemon_stats, batch_size=batch_size)
+
+    return len(pokemon)
+
+
+@transaction.atomic
+def import_berries(berry_items: Iterable[BerryItem], *, batch_size: int = BATCH_SIZE) -> int:
+    """Creates or updates berries and their items from Poke API documents.
+
+    Returns the number of imported berries.
+    """
+    items: list[Item] = []
+    berries: list[Berry] = []
+
+    for berry_item in berry_items:
+        item, berry = berry_item['item'], berry_item['berry']
+        items.append(
+            Item(
+                id=item['id'],
+                name=item['name'],
+                sprite=(item.get('sprites') or {}).get('default') or '',
+                **_english_effect(item),  # pyright: ignore[reportGeneralTypeIssues]
+            )
+        )
+        berries.append(Berry(id=berry['id'], name=berry['name'], item_id=item['id']))
+
+    upsert = {'update_conflicts': True, 'unique_fields': ['id'], 'batch_size': batch_size}
+    Item.objects.bulk_create(items, update_fields=['name', 'sprite', 'effect', 'short_effect'], **upsert)
+    Berry.objects.bulk_create(berries, update_fields=['name', 'item'], **upsert)
+
+    return len(berries)
@@ -0,0 +1,121 @@
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.utils.safestring import mark_safe
+
+from django_htmx.middleware import HtmxDetails
+
+from apps.poke.stats import stat_percentage
+from apps.poke.templatetags.pokemon import item_sprite, pokemon_sprite
+from apps.poke.utils.requests import summarize_berry_item, summarize_pokemon
+
+TYPES = ['normal', 'fire', 'water', 'grass', 'electric', 'ice', 'fighting', 'poison', 'ground', 'flying']
+STATS = ['hp', 'attack', 'defense', 'special-attack', 'special-defense', 'speed']
+
+
+def _pokemon(pokemon_id: int) -> dict[str, Any]:
+    """Returns a Poke API document of a made-up Pokémon."""
+    return {
+        'id': pokemon_id,
+        'name': f'pokemon-{pokemon_id}',
+        'order': pokemon_id,
+        'sprites': {'other': {'official-artwork': {'front_default': f'https://example.com/{pokemon_id}.png'}}},
+        'abilities': [{'ability': {'name': f'ability-{n}', 'url': ''}} for n in range(2)],
+        'stats': [
+            {'base_stat': (pokemon_id * 7 + n * 13) % 255, 'effort': 0, 'stat': {'name': name, 'url': ''}}
+            for n, name in enumerate(STATS)
+        ],
+        'types': [
+            {'slot': slot, 'type': {'name': TYPES[(pokemon_id + slot) % len(TYPES)], 'url': ''}} for slot in (1, 2)
+        ],
+    }
+
+
+def _berry_item(berry_id: int) -> dict[str, Any]:
+    """Returns the Poke API documents of a made-up berry and its item."""
+    name = f'berry-{berry_id}'
+    return {
+        'berry': {'id': berry_id, 'name': name, 'item': {'name': f'{name}-item', 'url': ''}},
+        'item': {
+            'id': berry_id,
+            'name': f'{name}-item',
+            'url': '',
+            'effect_entries': [{'effect': 'Restores 10 HP.', 'short_effect': 'Restores 10 HP.'}],
+            'sprites': {'default': f'https://example.com/{name}.png'},
+        },
+    }
+
+
+def _timings(func: Callable[[], Any], iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the rendering of the Pokédex, Pokémon and berries templates, and of the template filters, '
+        'against made-up data, without the Poke API or the caches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Number of renders of each template.')
+        parser.add_argument('--page-size', type=int, default=40, help='Number of Pokémon on a Pokédex page.')
+        parser.add_argument('--berries', type=int, default=64, help='Number of berries on the berries page.')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+
+        pokemon_list = [summarize_pokemon(_pokemon(pokemon_id)) for pokemon_id in range(1, options['page_size'] + 1)]
+        berry_items = [summarize_berry_item(_berry_item(berry_id)) for berry_id in range(1, options['berries'] + 1)]
+
+        request = RequestFactory().get('/')
+        request.htmx = HtmxDetails(request)  # pyright: ignore[reportGeneralTypeIssues]
+
+        def render_cards() -> list[str]:
+            return [mark_safe(render_to_string('components/pokemon_card.html', {'pokemon': p})) for p in pokemon_list]
+
+        paginator = Paginator(pokemon_list, options['page_size'])
+        pokedex_context = {
+            'paginator': paginator,
+            'page_obj': paginator.page(1),
+            'pokemon_list': pokemon_list,
+            'pokemon_cards': render_cards(),
+        }
+
+        templates = {
+            'components/pokemon_card.html (x page)': render_cards,
+            'pokedex.html': lambda: render_to_string('pokedex.html', pokedex_context, request),
+            'pokedex.html#pokemon-list': lambda: render_to_string(
+                'pokedex.html#pokemon-list', pokedex_context, request
+            ),
+            'pokemon.html': lambda: render_to_string('pokemon.html', {'pokemon': pokemon_list[0]}, request),
+            'berries.html': lambda: render_to_string('berries.html', {'berry_items_info': berry_items}, request),
+        }
+        filters = {
+            'stat_percentage': lambda: [stat_percentage(s['base_stat']) for p in pokemon_list for s in p.stats],
+            'pokemon_sprite': lambda: [pokemon_sprite(p) for p in pokemon_list],
+            'item_sprite': lambda: [item_sprite(b['item']) for b in berry_items],
+        }
+
+        self.stdout.write(f'{"Template":<45}{"median":>10}{"p90":>10}')
+        for name, render in templates.items():
+            render()  # Compiles and caches the template.
+            self._report(name, _timings(render, iterations))
+
+        self.stdout.write(f'\n{"Filter (per page of data)":<45}{"median":>10}{"p90":>10}')
+        for name, apply in filters.items():
+            self._report(name, _timings(apply, iterations))
+
+    def _report(self, name: str, timings: list[float]) -> None:
+        p90 = statistics.quantiles(timings, n=10)[-1] if len(timings) > 1 else timings[0]
+        self.stdout.write(f'{name:<45}{statistics.median(timings) * 1000:>8.3f}ms{p90 * 1000:>8.3f}ms')
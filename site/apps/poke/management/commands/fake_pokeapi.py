@@ -0,0 +1,50 @@
+from pathlib import Path
+
+from aiohttp import web
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.poke.fake_api import FakePokeAPI
+
+
+class Command(BaseCommand):
+    help = (
+        'Serves recorded Poke API fixtures, with configurable latency, errors and throttling. '
+        'Point the site and the action server at it with POKEAPI_BASE_URL=http://<host>:<port>/api/v2/.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            type=Path,
+            help='Directory of fixtures recorded by record_pokeapi, or the "data/api/v2" directory of api-data.',
+        )
+        parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on.')
+        parser.add_argument('--port', type=int, default=8001, help='Port to listen on.')
+        parser.add_argument('--latency', type=float, default=0, help='Mean seconds before each response.')
+        parser.add_argument('--jitter', type=float, default=0, help='Maximum deviation from the latency, in seconds.')
+        parser.add_argument(
+            '--error-rate', type=float, default=0, help='Fraction of requests failing with a 5xx status, e.g. 0.05.'
+        )
+        parser.add_argument(
+            '--rate-limit',
+            type=int,
+            default=0,
+            help='Requests per second above which requests are throttled with a 429 status.  Unlimited when 0.',
+        )
+        parser.add_argument('--seed', type=int, help='Seed of the random latencies and errors.')
+
+    def handle(self, *args, **options):
+        fake_api = FakePokeAPI(
+            options['path'],
+            latency=options['latency'],
+            jitter=options['jitter'],
+            error_rate=options['error_rate'],
+            rate_limit=options['rate_limit'],
+            seed=options['seed'],
+        )
+        if not fake_api.resources():
+            raise CommandError(f'{options["path"]} contains no Poke API fixtures.')
+
+        self.stdout.write(f'Serving {", ".join(fake_api.resources())} from {options["path"]}.')
+        web.run_app(fake_api.application(), host=options['host'], port=options['port'], print=self.stdout.write)
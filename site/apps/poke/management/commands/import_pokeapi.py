@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.poke.importer import (
+    BATCH_SIZE,
+    import_berries,
+    import_pokemon,
+    load_from_api,
+    load_from_directory,
+)
+
+
+class Command(BaseCommand):
+    help = 'Imports Pokémon, types, stats, berries and items into the database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir',
+            type=Path,
+            help=(
+                'The "data/api/v2" directory of a Poke API data dump (https://github.com/PokeAPI/api-data). '
+                'The data is retrieved from the Poke API if omitted.'
+            ),
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Number of rows per INSERT query.')
+
+    def handle(self, *args, **options):
+        data_dir: Path | None = options['data_dir']
+
+        if data_dir is None:
+            self.stdout.write('Retrieving data from the Poke API...')
+            pokemon, berry_items = async_to_sync(load_from_api)()
+        elif not (data_dir / 'pokemon').is_dir():
+            raise CommandError(f'{data_dir} is not the "data/api/v2" directory of a Poke API data dump.')
+        else:
+            pokemon, berry_items = load_from_directory(data_dir)
+
+        pokemon_count = import_pokemon(pokemon, batch_size=options['batch_size'])
+        berry_count = import_berries(berry_items, batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(f'Imported {pokemon_count} Pokémon and {berry_count} berries.'))
@@ -0,0 +1,80 @@
+import asyncio
+import statistics
+import time
+
+import aiohttp
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+async def _run(url: str, *, requests: int, concurrency: int, headers: dict[str, str]) -> tuple[list[float], int, float]:
+    """Sends `requests` GET requests to `url`, `concurrency` at a time.
+
+    Returns the latencies of the successful requests, the number of failed
+    requests and the elapsed seconds.
+    """
+    latencies: list[float] = []
+    failures = 0
+    remaining = iter(range(requests))
+
+    async def worker(session: aiohttp.ClientSession) -> None:
+        nonlocal failures
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                async with session.get(url, headers=headers) as response:
+                    await response.read()
+                    response.raise_for_status()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                failures += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+        return latencies, failures, time.perf_counter() - start
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures the throughput of a running site with concurrent requests, '
+        'e.g. to compare the development and production servers.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', nargs='?', default='http://localhost:8000/', help='The URL to request.')
+        parser.add_argument('--requests', type=int, default=1000, help='Total number of requests.')
+        parser.add_argument('--concurrency', type=int, default=50, help='Number of requests in flight at a time.')
+        parser.add_argument(
+            '--header',
+            action='append',
+            default=[],
+            metavar='NAME:VALUE',
+            help='Header sent with every request, e.g. "HX-Request: true".  Can be repeated.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            headers = dict(header.split(':', 1) for header in options['header'])
+        except ValueError as exc:
+            raise CommandError('Headers must be given as "NAME:VALUE".') from exc
+
+        latencies, failures, elapsed = asyncio.run(
+            _run(
+                options['url'],
+                requests=options['requests'],
+                concurrency=options['concurrency'],
+                headers={name.strip(): value.strip() for name, value in headers.items()},
+            )
+        )
+        if not latencies:
+            raise CommandError(f'All {failures} requests failed.')
+
+        p50, p90, p99 = (statistics.quantiles(latencies, n=100)[i - 1] * 1000 for i in (50, 90, 99))
+        self.stdout.write(
+            f'{len(latencies)} requests succeeded, {failures} failed in {elapsed:.2f}s\n'
+            f'Throughput: {len(latencies) / elapsed:.1f} requests/s\n'
+            f'Latency: p50 {p50:.1f}ms, p90 {p90:.1f}ms, p99 {p99:.1f}ms'
+        )
@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+
+from django.core.management.base import BaseCommand
+
+from apps.poke.fake_api import record_fixtures
+
+
+class Command(BaseCommand):
+    help = 'Records Pokémon, their types, berries and their items from the Poke API, as fixtures of fake_pokeapi.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=Path, help='Directory to record the fixtures into.')
+        parser.add_argument('--pokemon', type=int, default=151, help='Number of Pokémon to record.')
+        parser.add_argument('--berries', type=int, default=64, help='Number of berries to record.')
+
+    def handle(self, *args, **options):
+        counts = async_to_sync(record_fixtures)(options['path'], pokemon=options['pokemon'], berries=options['berries'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Recorded {counts["pokemon"]} Pokémon, {counts["type"]} types and {counts["berry"]} berries '
+                f'into {options["path"]}.'
+            )
+        )
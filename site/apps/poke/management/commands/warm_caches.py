@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.poke.warming import warm_caches
+
+
+class Command(BaseCommand):
+    help = 'Populates the Pokédex and berries caches, e.g. at deploy time.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--refresh',
+            action='store_true',
+            help='Retrieve the Pokémon list and berries even if they are cached.',
+        )
+
+    def handle(self, *args, **options):
+        warm_caches(refresh=options['refresh'])
+        self.stdout.write(self.style.SUCCESS('Caches warmed.'))
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from django.template.response import SimpleTemplateResponse
+from django.utils.deprecation import MiddlewareMixin
+
+from apps.poke.utils.metrics import Histogram
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest, HttpResponse
+
+REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds',
+    'Duration of the requests to the site, by view.',
+    ['view', 'method', 'status'],
+)
+RENDER_SECONDS = Histogram('template_render_duration_seconds', 'Duration of rendering templates.', ['template'])
+
+
+def _template_label(template_name: str | list[str] | tuple[str, ...] | None) -> str:
+    if isinstance(template_name, (list, tuple)):
+        return template_name[0] if template_name else ''
+    return template_name or ''
+
+
+class MetricsMiddleware(MiddlewareMixin):
+    """Observes the duration of the requests and of the rendering of their templates.
+
+    Installed first when ``settings.POKE_METRICS_ENABLED`` is true, so the
+    other middleware are included in the request durations.
+    """
+
+    def process_request(self, request: HttpRequest) -> None:
+        request.metrics_start = time.perf_counter()  # pyright: ignore[reportGeneralTypeIssues]
+
+    def process_template_response(self, request: HttpRequest, response: SimpleTemplateResponse) -> HttpResponse:
+        start = time.perf_counter()
+        template = _template_label(response.template_name)
+
+        def observe(rendered: SimpleTemplateResponse) -> None:  # pylint: disable=unused-argument
+            RENDER_SECONDS.observe(time.perf_counter() - start, template=template)
+
+        response.add_post_render_callback(observe)
+        return response
+
+    def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        start = getattr(request, 'metrics_start', None)
+        if start is not None:
+            view = request.resolver_match.view_name if request.resolver_match else ''
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - start, view=view, method=request.method or '', status=str(response.status_code)
+            )
+        return response
@@ -0,0 +1,135 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='Item',
+            fields=[
+                ('id', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('sprite', models.URLField(blank=True, max_length=500)),
+                ('effect', models.TextField(blank=True)),
+                ('short_effect', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Pokemon',
+            fields=[
+                ('id', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('order', models.IntegerField()),
+                ('sprite', models.URLField(blank=True, max_length=500)),
+                ('abilities', models.JSONField(default=list)),
+            ],
+            options={
+                'verbose_name_plural': 'pokemon',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PokemonType',
+            fields=[
+                ('id', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=50, unique=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Stat',
+            fields=[
+                ('id', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=50, unique=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Berry',
+            fields=[
+                ('id', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, unique=True)),
+                (
+                    'item',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.PROTECT, related_name='berry', to='poke.item'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name_plural': 'berries',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PokemonTypeSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slot', models.PositiveSmallIntegerField()),
+                (
+                    'pokemon',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='type_slots', to='poke.pokemon'
+                    ),
+                ),
+                (
+                    'type',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='poke.pokemontype'
+                    ),
+                ),
+            ],
+            options={
+                'ordering': ['pokemon', 'slot'],
+            },
+        ),
+        migrations.AddField(
+            model_name='pokemon',
+            name='types',
+            field=models.ManyToManyField(related_name='pokemon', through='poke.PokemonTypeSlot', to='poke.pokemontype'),
+        ),
+        migrations.CreateModel(
+            name='PokemonStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('base_stat', models.PositiveSmallIntegerField()),
+                ('effort', models.PositiveSmallIntegerField()),
+                (
+                    'pokemon',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='poke.pokemon'
+                    ),
+                ),
+                (
+                    'stat',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='pokemon_stats', to='poke.stat'
+                    ),
+                ),
+            ],
+            options={
+                'ordering': ['pokemon', 'stat'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='pokemontypeslot',
+            constraint=models.UniqueConstraint(fields=('pokemon', 'slot'), name='unique_pokemon_type_slot'),
+        ),
+        migrations.AddConstraint(
+            model_name='pokemonstat',
+            constraint=models.UniqueConstraint(fields=('pokemon', 'stat'), name='unique_pokemon_stat'),
+        ),
+    ]
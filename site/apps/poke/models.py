@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from django.db import models
+
+from apps.poke._types import BerryItemSummary, PokemonSummary
+from apps.poke.stats import stat_percentage
+
+
+class PokemonType(models.Model):
+    """A Pokémon type, e.g. fire or water.
+
+    Primary keys are the IDs of the Poke API.
+    """
+
+    id = models.PositiveIntegerField(primary_key=True)
+    name = models.CharField(max_length=50, unique=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class Stat(models.Model):
+    """A Pokémon stat, e.g. hp or attack."""
+
+    id = models.PositiveIntegerField(primary_key=True)
+    name = models.CharField(max_length=50, unique=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class Pokemon(models.Model):
+    """A Pokémon, with the fields displayed by the Pokédex."""
+
+    id = models.PositiveIntegerField(primary_key=True)
+    name = models.CharField(max_length=100, unique=True)
+    order = models.IntegerField()
+    sprite = models.URLField(max_length=500, blank=True)
+    abilities = models.JSONField(default=list)
+    types = models.ManyToManyField(PokemonType, through='PokemonTypeSlot', related_name='pokemon')
+
+    class Meta:
+        ordering = ['id']
+        verbose_name_plural = 'pokemon'
+
+    def __str__(self) -> str:
+        return self.name
+
+    def to_summary(self) -> PokemonSummary:
+        """Returns the summary of the Pokémon rendered by the templates.
+
+        Expects ``type_slots`` and ``stats`` to be prefetched, with their
+        type and stat.
+        """
+        return PokemonSummary(
+            id=self.id,
+            name=self.name,
+            sprite=self.sprite,
+            abilities=[{'ability': {'name': name, 'url': ''}} for name in self.abilities],
+            stats=[
+                {
+                    'base_stat': pokemon_stat.base_stat,
+                    'effort': pokemon_stat.effort,
+                    'stat': {'name': pokemon_stat.stat.name, 'url': ''},
+                    'percentage': stat_percentage(pokemon_stat.base_stat),
+                }
+                for pokemon_stat in self.stats.all()  # pyright: ignore[reportGeneralTypeIssues]
+            ],
+            types=[
+                {'slot': type_slot.slot, 'type': {'name': type_slot.type.name, 'url': ''}}
+                for type_slot in self.type_slots.all()  # pyright: ignore[reportGeneralTypeIssues]
+            ],
+        )
+
+
+class PokemonTypeSlot(models.Model):
+    """A type of a Pokémon, in the slot it occupies."""
+
+    pokemon = models.ForeignKey(Pokemon, on_delete=models.CASCADE, related_name='type_slots')
+    type = models.ForeignKey(PokemonType, on_delete=models.CASCADE, related_name='slots')
+    slot = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['pokemon', 'slot']
+        constraints = [
+            models.UniqueConstraint(fields=['pokemon', 'slot'], name='unique_pokemon_type_slot'),
+        ]
+
+
+class PokemonStat(models.Model):
+    """The base value of a stat of a Pokémon."""
+
+    pokemon = models.ForeignKey(Pokemon, on_delete=models.CASCADE, related_name='stats')
+    stat = models.ForeignKey(Stat, on_delete=models.CASCADE, related_name='pokemon_stats')
+    base_stat = models.PositiveSmallIntegerField()
+    effort = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['pokemon', 'stat']
+        constraints = [
+            models.UniqueConstraint(fields=['pokemon', 'stat'], name='unique_pokemon_stat'),
+        ]
+
+
+class Item(models.Model):
+    """An item, e.g. the item a berry is used as."""
+
+    id = models.PositiveIntegerField(primary_key=True)
+    name = models.CharField(max_length=100, unique=True)
+    sprite = models.URLField(max_length=500, blank=True)
+    effect = models.TextField(blank=True)
+    short_effect = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class Berry(models.Model):
+    """A berry and the item it is used as."""
+
+    id = models.PositiveIntegerField(primary_key=True)
+    name = models.CharField(max_length=100, unique=True)
+    item = models.OneToOneField(Item, on_delete=models.PROTECT, related_name='berry')
+
+    class Meta:
+        ordering = ['id']
+        verbose_name_plural = 'berries'
+
+    def __str__(self) -> str:
+        return self.name
+
+    def to_berry_item(self) -> BerryItemSummary:
+        """Returns the berry and its item as rendered by the templates."""
+        return {
+            'berry': {'id': self.id, 'name': self.name, 'item': {'name': self.item.name, 'url': ''}},
+            'item': {
+                'id': self.item.id,
+                'name': self.item.name,
+                'url': '',
+                'effect_entries': [{'effect': self.item.effect, 'short_effect': self.item.short_effect}],
+                'sprites': {'default': self.item.sprite},
+            },
+            'sprite': self.item.sprite,
+        }
@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Sequence
+from typing import TYPE_CHECKING, overload
+
+from asgiref.sync import async_to_sync
+
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db.models import QuerySet
+
+from apps.poke.cache import (
+    CachedValue,
+    aget_or_set_entry_locked,
+    get_or_set_entry_locked,
+    refresh_cached_value,
+)
+from apps.poke.utils.requests import (
+    resource_id_from_url,
+    retrieve_multiple_pokemon,
+    retrieve_pokemon,
+    retrieve_pokemon_list,
+    summarize_pokemon,
+)
+from apps.poke.utils.search import NameIndex
+
+if TYPE_CHECKING:
+    from apps.poke._types import Pokemon as PokemonData
+    from apps.poke._types import PokemonBase, PokemonSummary
+    from apps.poke.models import Pokemon
+
+logger = logging.getLogger(__name__)
+
+POKEMON_LIST_TIMEOUT = 60 * 60
+POKEMON_LIST_STALE_TIMEOUT = 60 * 60 * 24
+POKEMON_SUMMARY_TIMEOUT = 60 * 60 * 24
+
+
+# Keys are versioned with the structure of the cached summaries.
+def pokemon_summary_key(pokemon_id: int) -> str:
+    return f'pokemon_summary:2:{pokemon_id}'
+
+
+def pokemon_detail_key(pokemon_id: int) -> str:
+    return f'pokemon_detail:2:{pokemon_id}'
+
+
+async def _aretrieve_pokemon_list() -> list[PokemonBase]:
+    return (await retrieve_pokemon_list())['results']
+
+
+_retrieve_pokemon_list = async_to_sync(_aretrieve_pokemon_list)
+
+
+def get_pokemon_list(*, refresh: bool = False) -> list[PokemonBase]:
+    """Returns the names and URLs of all Pokémon, in Pokédex order.
+
+    The list is a single request to the Poke API and is cached.  A stale
+    list is served while it is refreshed in the background.
+
+    Args:
+        refresh: Retrieve the list even if it is cached.
+    """
+    if refresh:
+        return refresh_cached_value(
+            'pokemon_list',
+            _retrieve_pokemon_list,
+            timeout=POKEMON_LIST_TIMEOUT,
+            stale_timeout=POKEMON_LIST_STALE_TIMEOUT,
+        )
+
+    return _get_pokemon_list_entry().value
+
+
+async def aget_pokemon_list() -> list[PokemonBase]:
+    """Asynchronous version of :func:`get_pokemon_list`."""
+    return (await _aget_pokemon_list_entry()).value
+
+
+def _get_pokemon_list_entry() -> CachedValue:
+    return get_or_set_entry_locked(
+        'pokemon_list',
+        _retrieve_pokemon_list,
+        timeout=POKEMON_LIST_TIMEOUT,
+        stale_timeout=POKEMON_LIST_STALE_TIMEOUT,
+    )
+
+
+async def _aget_pokemon_list_entry() -> CachedValue:
+    return await aget_or_set_entry_locked(
+        'pokemon_list',
+        _aretrieve_pokemon_list,
+        timeout=POKEMON_LIST_TIMEOUT,
+        stale_timeout=POKEMON_LIST_STALE_TIMEOUT,
+    )
+
+
+def pokemon_etag(summary: PokemonSummary) -> str:
+    """Returns an entity tag changing with the details of a Pokémon."""
+    content = json.dumps(dataclasses.asdict(summary), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(content.encode(), usedforsecurity=False).hexdigest()
+
+
+@dataclasses.dataclass
+class PokemonDetail:
+    """Details of a Pokémon, with the validators of the detail view."""
+
+    summary: PokemonSummary
+    etag: str
+    last_modified: float | None = None
+
+
+async def aget_pokemon_detail(pokemon_id: int) -> PokemonDetail:
+    """Returns the details of a Pokémon for the detail view.
+
+    Looks them up in the per-Pokémon detail cache first, then in the
+    summaries cached by the Pokédex, and finally retrieves them from the
+    Poke API.  The time they were first cached is their last modification.
+
+    Raises:
+        aiohttp.ClientResponseError: The Pokémon could not be retrieved.
+        CircuitOpenError: The Poke API is failing and the Pokémon isn't mirrored.
+        asyncio.TimeoutError: The Poke API didn't respond in time.
+    """
+    detail: PokemonDetail | None = await cache.aget(pokemon_detail_key(pokemon_id))
+    if detail is not None:
+        return detail
+
+    summary: PokemonSummary | None = await cache.aget(pokemon_summary_key(pokemon_id))
+    if summary is None:
+        summary = summarize_pokemon(await retrieve_pokemon(pokemon_id))
+        await cache.aset(pokemon_summary_key(pokemon_id), summary, timeout=POKEMON_SUMMARY_TIMEOUT)
+
+    detail = PokemonDetail(summary, etag=pokemon_etag(summary), last_modified=time.time())
+    await cache.aset(pokemon_detail_key(pokemon_id), detail, timeout=POKEMON_SUMMARY_TIMEOUT)
+    return detail
+
+
+class PokemonSearch:
+    """Search index over a list of Pokémon, matching their names.
+
+    Args:
+        pokemon_list: The Pokémon to search.
+        version: Version of the list, e.g. the time its cached entry goes stale.
+    """
+
+    def __init__(self, pokemon_list: list[PokemonBase], version: float | None = None) -> None:
+        self.pokemon_list = pokemon_list
+        self.version = version
+        self.index = NameIndex([pokemon['name'] for pokemon in pokemon_list])
+
+    def search(self, query: str) -> list[PokemonBase]:
+        return [self.pokemon_list[position] for position in self.index.search(query)]
+
+
+_search: PokemonSearch | None = None
+_search_lock = threading.Lock()
+
+
+def get_pokemon_search() -> PokemonSearch:
+    """Returns the search index over the cached list of Pokémon.
+
+    The index is built once per process for each version of the list, and
+    rebuilt when the cached list changes.  Versions are told apart by the
+    staleness time of the cached entry, rather than by comparing the lists.
+    """
+    return _search_for(_get_pokemon_list_entry())
+
+
+async def aget_pokemon_search() -> PokemonSearch:
+    """Asynchronous version of :func:`get_pokemon_search`."""
+    return _search_for(await _aget_pokemon_list_entry())
+
+
+def _search_for(entry: CachedValue) -> PokemonSearch:
+    global _search  # pylint: disable=global-statement
+
+    with _search_lock:
+        if _search is None or _search.version != entry.stale_at:
+            _search = PokemonSearch(entry.value, version=entry.stale_at)
+        return _search
+
+
+async def aget_pokemon_summaries(
+    pokemon_list: Sequence[PokemonBase],
+    *,
+    refresh: bool = False,
+) -> list[PokemonSummary]:
+    """Returns the summaries of the Pokémon in `pokemon_list`, in the same order.
+
+    Summaries missing from the cache are retrieved from the Poke API and
+    cached individually.  Pokémon which could not be retrieved are left out.
+
+    Args:
+        pokemon_list: The Pokémon to summarize.
+        refresh: Retrieve all summaries, including the cached ones.
+    """
+    keys = [pokemon_summary_key(resource_id_from_url(pokemon['url'])) for pokemon in pokemon_list]
+    summaries: dict[str, PokemonSummary] = {} if refresh else await cache.aget_many(keys)
+
+    missing = [resource_id_from_url(pokemon['url']) for pokemon, key in zip(pokemon_list, keys) if key not in summaries]
+    if missing:
+        result = await retrieve_multiple_pokemon(missing)
+        retrieved = {pokemon_summary_key(pokemon['id']): summarize_pokemon(pokemon) for pokemon in result.results}
+        await cache.aset_many(retrieved, timeout=POKEMON_SUMMARY_TIMEOUT)
+        summaries.update(retrieved)
+
+    return [summaries[key] for key in keys if key in summaries]
+
+
+get_pokemon_summaries = async_to_sync(aget_pokemon_summaries)
+
+
+def _start_retrieving(pokemon_ids: list[int]) -> tuple[dict[int, asyncio.Future[PokemonSummary | None]], asyncio.Task]:
+    """Retrieves Pokémon in the background, returning a future of the summary of each.
+
+    The futures of the Pokémon which could not be retrieved are set to None.
+    """
+    loop = asyncio.get_running_loop()
+    futures: dict[int, asyncio.Future[PokemonSummary | None]] = {
+        pokemon_id: loop.create_future() for pokemon_id in pokemon_ids
+    }
+
+    def on_result(pokemon_id: str | int, result: PokemonData | BaseException) -> None:
+        future = futures.get(int(pokemon_id))
+        if future is not None and not future.done():
+            future.set_result(None if isinstance(result, BaseException) else summarize_pokemon(result))
+
+    def on_done(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning('Failed to retrieve the Pokémon: %r', task.exception())
+        for future in futures.values():
+            if not future.done():
+                future.set_result(None)
+
+    task = loop.create_task(retrieve_multiple_pokemon(pokemon_ids, on_result=on_result))
+    task.add_done_callback(on_done)
+    return futures, task
+
+
+async def aiter_pokemon_summaries(pokemon_list: Sequence[PokemonBase]) -> AsyncIterator[PokemonSummary]:
+    """Yields the summaries of the Pokémon in `pokemon_list`, in the same order, as soon as they are available.
+
+    Like :func:`aget_pokemon_summaries`, but rather than waiting for every
+    missing summary, a summary is yielded once it and all those before it
+    are cached or retrieved.  Stopping the iteration cancels the retrieval.
+    """
+    ids = [resource_id_from_url(pokemon['url']) for pokemon in pokemon_list]
+    keys = [pokemon_summary_key(pokemon_id) for pokemon_id in ids]
+    summaries: dict[str, PokemonSummary] = await cache.aget_many(keys)
+
+    missing = [pokemon_id for pokemon_id, key in zip(ids, keys) if key not in summaries]
+    if not missing:
+        for key in keys:
+            yield summaries[key]
+        return
+
+    retrieved, retrieval = _start_retrieving(missing)
+    try:
+        for pokemon_id, key in zip(ids, keys):
+            summary = summaries.get(key)
+            if summary is None:
+                summary = await retrieved[pokemon_id]
+                if summary is None:
+                    # Pokémon which could not be retrieved are left out.
+                    continue
+                await cache.aset(key, summary, timeout=POKEMON_SUMMARY_TIMEOUT)
+            yield summary
+    finally:
+        retrieval.cancel()
+
+
+class LazyPokemonList(Sequence['PokemonSummary']):
+    """Sequence of Pokémon summaries retrieving only the accessed items.
+
+    Meant to be paginated: the length is known up front from the list of
+    names, and slicing a page retrieves the details of that page alone.
+    """
+
+    def __init__(self, pokemon_list: Sequence[PokemonBase]) -> None:
+        self.pokemon_list = pokemon_list
+
+    def __len__(self) -> int:
+        return len(self.pokemon_list)
+
+    @overload
+    def __getitem__(self, index: int) -> PokemonSummary:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[PokemonSummary]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> PokemonSummary | list[PokemonSummary]:
+        if isinstance(index, slice):
+            return get_pokemon_summaries(self.pokemon_list[index])
+
+        summaries = get_pokemon_summaries([self.pokemon_list[index]])
+        if not summaries:
+            raise LookupError(f'Failed to retrieve the Pokémon at index {index}.')
+        return summaries[0]
+
+    async def acount(self) -> int:
+        return len(self.pokemon_list)
+
+    async def aslice(self, index: slice) -> list[PokemonSummary]:
+        return await aget_pokemon_summaries(self.pokemon_list[index])
+
+    async def acached_slice(self, index: slice) -> list[PokemonSummary] | None:
+        """Returns the summaries of a slice if they are all cached, otherwise None."""
+        keys = [pokemon_summary_key(resource_id_from_url(pokemon['url'])) for pokemon in self.pokemon_list[index]]
+        summaries: dict[str, PokemonSummary] = await cache.aget_many(keys)
+        if len(summaries) < len(keys):
+            return None
+        return [summaries[key] for key in keys]
+
+    def aiter_slice(self, index: slice) -> AsyncIterator[PokemonSummary]:
+        """Iterates over the summaries of a slice as they are retrieved, see :func:`aiter_pokemon_summaries`."""
+        return aiter_pokemon_summaries(self.pokemon_list[index])
+
+
+class DatabasePokemonList(Sequence['PokemonSummary']):
+    """Sequence of Pokémon summaries read from the database.
+
+    Meant to be paginated: slicing a page queries only the Pokémon of that
+    page, with their types and stats.
+    """
+
+    def __init__(self, queryset: QuerySet[Pokemon]) -> None:
+        self.queryset = queryset.prefetch_related('type_slots__type', 'stats__stat')
+
+    def __len__(self) -> int:
+        return self.queryset.count()
+
+    @overload
+    def __getitem__(self, index: int) -> PokemonSummary:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[PokemonSummary]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> PokemonSummary | list[PokemonSummary]:
+        if isinstance(index, slice):
+            return [pokemon.to_summary() for pokemon in self.queryset[index]]
+        return self.queryset[index].to_summary()
+
+    async def acount(self) -> int:
+        return await self.queryset.acount()
+
+    async def aslice(self, index: slice) -> list[PokemonSummary]:
+        return [pokemon.to_summary() async for pokemon in self.queryset[index]]
+
+
+class AsyncPaginator(Paginator):
+    """Paginator counting and slicing the Pokémon lists asynchronously."""
+
+    object_list: LazyPokemonList | DatabasePokemonList
+
+    async def acount(self) -> int:
+        """Counts the objects, caching the count for the synchronous properties."""
+        if 'count' not in self.__dict__:
+            self.count = await self.object_list.acount()  # pylint: disable=attribute-defined-outside-init
+        return self.count
+
+    async def abounds(self, number: int | str) -> tuple[int, slice]:
+        """Validates a page number, returning it with the slice of the objects on that page."""
+        await self.acount()
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+        return number, slice(bottom, top)
+
+    async def apage(self, number: int | str) -> Page:
+        """Asynchronous version of ``page()``."""
+        number, bounds = await self.abounds(number)
+        return self.page_of(await self.object_list.aslice(bounds), number)
+
+    def page_of(self, object_list: Sequence[PokemonSummary], number: int) -> Page:
+        """Returns page `number` holding `object_list`, e.g. an empty list when its objects are streamed."""
+        return self._get_page(object_list, number, self)
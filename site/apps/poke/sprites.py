@@ -0,0 +1,141 @@
+"""Thumbnails of the sprites of Pokémon and items, served by the site.
+
+The Poke API links to full-size PNG sprites hosted on GitHub, e.g. the
+475px official artwork of each Pokémon.  :func:`thumbnail_url` points the
+templates at :func:`apps.poke.views.sprite_view` instead, which serves WebP
+thumbnails of the sprites in each of `SIZES`.  The thumbnails of a sprite
+are created from a single download and stored in
+``settings.POKE_SPRITES_ROOT``, and as sprites don't change, browsers cache
+them without ever revalidating.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import io
+import os
+import re
+import threading
+from pathlib import Path
+
+import aiohttp
+from PIL import Image
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+
+from apps.poke.utils.singleflight import SingleFlight
+
+# Maximum width and height of the thumbnails in pixels, twice the size at which the templates show them for
+# high-density screens.  Smaller sprites, e.g. of items, are not enlarged.
+SIZES = {
+    'card': 320,
+    'modal': 288,
+}
+WEBP_QUALITY = 80
+
+SOURCE_SUFFIX = '.png'
+# Seconds a sprite found missing upstream is not downloaded again.
+MISSING_SPRITE_TIMEOUT = 60 * 10
+# Path of a sprite relative to `settings.POKE_SPRITES_SOURCE_URL`, without its suffix.
+SPRITE_PATH = re.compile(r'[\w-]+(?:/[\w-]+)*')
+
+_flight = SingleFlight()
+
+
+class SpriteNotFound(LookupError):
+    """Raised when a sprite doesn't exist upstream."""
+
+
+def missing_sprite_key(sprite: str) -> str:
+    return f'sprite_missing:{sprite}'
+
+
+def source_url(sprite: str) -> str:
+    return f'{settings.POKE_SPRITES_SOURCE_URL}{sprite}{SOURCE_SUFFIX}'
+
+
+def thumbnail_url(url: str, size: str) -> str:
+    """Returns the URL of the thumbnail of the sprite at `url`, or `url` if it has none.
+
+    Only sprites under ``settings.POKE_SPRITES_SOURCE_URL`` have
+    thumbnails, and none do when ``settings.POKE_SPRITES_ROOT`` is empty.
+    """
+    if size not in SIZES:
+        raise ValueError(f"Unknown thumbnail size '{size}', expected one of {', '.join(SIZES)}.")
+
+    source = settings.POKE_SPRITES_SOURCE_URL
+    if not settings.POKE_SPRITES_ROOT or not url.startswith(source) or not url.endswith(SOURCE_SUFFIX):
+        return url
+
+    sprite = url[len(source) : -len(SOURCE_SUFFIX)]  # noqa: E203
+    if not SPRITE_PATH.fullmatch(sprite):
+        return url
+    return reverse('sprite', kwargs={'size': size, 'sprite': sprite})
+
+
+def thumbnail_path(size: str, sprite: str) -> Path:
+    return Path(settings.POKE_SPRITES_ROOT) / size / f'{sprite}.webp'
+
+
+def _write_thumbnails(body: bytes, sprite: str) -> None:
+    with Image.open(io.BytesIO(body)) as source:
+        # Palette images would be resized without interpolation.
+        image = source.convert('RGBA')
+
+    for size, pixels in SIZES.items():
+        thumbnail = image.copy()
+        thumbnail.thumbnail((pixels, pixels), Image.Resampling.LANCZOS)
+
+        path = thumbnail_path(size, sprite)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written aside then renamed, so that other workers and threads never read a partial thumbnail.  Named after
+        # both, as the threads of a worker, e.g. creating the thumbnails of a sprite in separate event loops under
+        # WSGI, share its pid.
+        temporary = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        thumbnail.save(temporary, 'WEBP', quality=WEBP_QUALITY)
+        os.replace(temporary, path)
+
+
+async def _create_thumbnails(sprite: str) -> None:
+    timeout = aiohttp.ClientTimeout(total=settings.POKEAPI_TIMEOUT, connect=settings.POKEAPI_CONNECT_TIMEOUT)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with session.get(source_url(sprite)) as resp:
+            resp.raise_for_status()
+            body = await resp.read()
+
+    await asyncio.to_thread(_write_thumbnails, body, sprite)
+
+
+async def aget_thumbnail(size: str, sprite: str) -> bytes:
+    """Returns the thumbnail of a sprite, creating those in every size on first use.
+
+    Raises:
+        aiohttp.ClientError: If the sprite could not be downloaded.
+        asyncio.TimeoutError: If downloading the sprite timed out.
+        OSError: If the thumbnails could not be written.
+        PIL.UnidentifiedImageError: If the sprite is not an image.
+        PIL.Image.DecompressionBombError: If the sprite is too large to
+            be decoded safely.
+        SpriteNotFound: If the sprite doesn't exist upstream.  Missing
+            sprites are remembered for `MISSING_SPRITE_TIMEOUT` seconds.
+    """
+    path = thumbnail_path(size, sprite)
+    try:
+        return await asyncio.to_thread(path.read_bytes)
+    except FileNotFoundError:
+        pass
+
+    if await cache.aget(missing_sprite_key(sprite)):
+        raise SpriteNotFound(sprite)
+
+    # Concurrent requests for the thumbnails of a sprite, e.g. in each size, share a single download.
+    try:
+        await _flight.do(sprite, functools.partial(_create_thumbnails, sprite))
+    except aiohttp.ClientResponseError as exc:
+        if exc.status != 404:
+            raise
+        await cache.aset(missing_sprite_key(sprite), True, timeout=MISSING_SPRITE_TIMEOUT)
+        raise SpriteNotFound(sprite) from exc
+    return await asyncio.to_thread(path.read_bytes)
@@ -0,0 +1,11 @@
+"""Figures derived from Pokemon stats, shared by the Poke API client, the models and the templates."""
+
+# Highest base stat of any Pokemon, the full width of the stat bars.
+MAX_BASE_STAT = 255
+
+
+def stat_percentage(value: int | None) -> float:
+    """Calculates the percentage of a given stat relative to the max stat."""
+    if value is not None and value >= 0:
+        return round(value / MAX_BASE_STAT * 100, 2)
+    return 0
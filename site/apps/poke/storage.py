@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class StaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """Storage of the collected static files, named by content hash and compressed.
+
+    The manifest storage fails to render any page linking to a file that
+    wasn't collected, e.g. the Tailwind stylesheet when it wasn't built.
+    This storage links to such files by their unhashed name instead, like
+    the storage without a manifest did.
+    """
+
+    manifest_strict = False
+
+    def stored_name(self, name: str) -> str:
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
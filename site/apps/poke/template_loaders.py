@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from template_partials.loader import Loader as PartialsLoader
+
+from django.template import Template, TemplateDoesNotExist
+
+
+class Loader(PartialsLoader):
+    """Loader of templates and of their partials, e.g. ``pokedex.html#pokemon-list``.
+
+    django-template-partials 23.4 compiles templates from the sources of the
+    loaders it wraps, which bypasses a wrapped cached loader and compiles
+    every template on every render.  This loader gets templates from the
+    wrapped loaders instead, so they are compiled once when cached.
+    """
+
+    def get_template(self, template_name: str, skip=None) -> Template:
+        name, _, partial_name = template_name.partition('#')
+
+        tried = []
+        for loader in self.loaders:
+            try:
+                template = loader.get_template(name, skip)
+                break
+            except TemplateDoesNotExist as exc:
+                tried.extend(exc.tried)
+        else:
+            raise TemplateDoesNotExist(name, tried=tried)
+
+        if not partial_name:
+            return template
+
+        partial = getattr(template.origin, 'partial_contents', {}).get(partial_name)
+        if partial is None:
+            raise TemplateDoesNotExist(partial_name, tried=[name])
+
+        partial.engine = self.engine
+        return partial
+
+    def reset(self) -> None:
+        for loader in self.loaders:
+            loader.reset()
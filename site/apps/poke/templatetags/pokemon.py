@@ -5,27 +5,33 @@ from typing import TYPE_CHECKING
 
 from django import template
 
+from apps.poke._types import PokemonSummary
+from apps.poke.sprites import thumbnail_url
+from apps.poke.stats import stat_percentage
+
 if TYPE_CHECKING:
     from apps.poke._types import Item, Pokemon
 
 logger = logging.getLogger(__name__)
 register = template.Library()
 
-MAX_BASE_STAT = 255
 
+@register.filter(name='stat_percentage')
+def stat_percentage_filter(value: int | None) -> float:
+    """Calculates the percentage of a given stat relative to the max stat.
 
-@register.filter
-def stat_percentage(value: int) -> float:
-    """Calculates the percentage of a given stat relative to the max stat."""
-    if value is not None and value >= 0:
-        percentage = (value / MAX_BASE_STAT) * 100
-        return round(percentage, 2)
-    return 0
+    Summaries already hold the percentage of their stats, see
+    :func:`apps.poke.utils.requests.summarize_pokemon`.
+    """
+    return stat_percentage(value)
 
 
 @register.filter
-def pokemon_sprite(pokemon: Pokemon) -> str:
+def pokemon_sprite(pokemon: Pokemon | PokemonSummary) -> str:
     """Get the URL for the sprite of a Pokemon from `pokemon`."""
+    if isinstance(pokemon, PokemonSummary):
+        return pokemon.sprite
+
     try:
         sprite = pokemon['sprites']['other']['official-artwork']['front_default']
         if not sprite:
@@ -37,6 +43,12 @@ def pokemon_sprite(pokemon: Pokemon) -> str:
     return sprite
 
 
+@register.filter
+def thumbnail(sprite: str, size: str) -> str:
+    """Get the URL of the thumbnail of a sprite, in a size of `apps.poke.sprites.SIZES`."""
+    return thumbnail_url(sprite, size)
+
+
 @register.filter
 def item_sprite(item: Item) -> str:
     """Get the URL for the sprite of an item from `item`."""
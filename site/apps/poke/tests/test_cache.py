@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.poke.cache import (
+    CachedValue,
+    Incomplete,
+    aget_or_set_locked,
+    get_or_set_entry_locked,
+    get_or_set_locked,
+    refresh_cached_value,
+)
+
+
+def join_refresh(key: str) -> None:
+    """Waits for the background refresh of `key`, if any."""
+    for thread in threading.enumerate():
+        if thread.name == f'refresh-{key}':
+            thread.join(timeout=5)
+
+
+class GetOrSetLockedTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_miss_computes_and_stores(self):
+        default = mock.Mock(return_value='value')
+
+        self.assertEqual(get_or_set_locked('key', default, 60), 'value')
+        self.assertEqual(get_or_set_locked('key', default, 60), 'value')
+        default.assert_called_once_with()
+        self.assertIsInstance(cache.get('key'), CachedValue)
+
+    def test_releases_lock(self):
+        get_or_set_locked('key', lambda: 'value', 60)
+
+        self.assertIsNone(cache.get('key:lock'))
+
+    def test_releases_lock_when_default_fails(self):
+        with self.assertRaises(ValueError):
+            get_or_set_locked('key', mock.Mock(side_effect=ValueError), 60)
+
+        self.assertIsNone(cache.get('key:lock'))
+        self.assertIsNone(cache.get('key'))
+
+    def test_waits_for_another_worker(self):
+        cache.add('key:lock', 'other worker')
+        threading.Timer(0.05, refresh_cached_value, ('key', lambda: 'theirs', 60)).start()
+        default = mock.Mock(return_value='ours')
+
+        self.assertEqual(get_or_set_locked('key', default, 60, poll_interval=0.01), 'theirs')
+        default.assert_not_called()
+
+    def test_computes_after_wait_timeout(self):
+        cache.add('key:lock', 'crashed worker')
+
+        self.assertEqual(get_or_set_locked('key', lambda: 'value', 60, wait_timeout=0.02, poll_interval=0.01), 'value')
+        # The lock of the other worker is left for it to release.
+        self.assertEqual(cache.get('key:lock'), 'crashed worker')
+
+    def test_concurrent_callers_compute_once(self):
+        calls = []
+
+        def default():
+            calls.append(threading.get_ident())
+            time.sleep(0.05)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_set_locked('key', default, 60, poll_interval=0.01)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ['value'] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_serves_stale_value_while_refreshing(self):
+        refresh_cached_value('key', lambda: 'old', 0, stale_timeout=60)
+
+        self.assertEqual(get_or_set_locked('key', lambda: 'new', 60, stale_timeout=60), 'old')
+        join_refresh('key')
+
+        self.assertEqual(get_or_set_locked('key', lambda: 'newer', 60), 'new')
+        self.assertIsNone(cache.get('key:lock'))
+
+    def test_failed_refresh_keeps_stale_value(self):
+        refresh_cached_value('key', lambda: 'old', 0, stale_timeout=60)
+
+        with self.assertLogs('apps.poke.cache', 'ERROR'):
+            get_or_set_locked('key', mock.Mock(side_effect=ValueError), 60, stale_timeout=60)
+            join_refresh('key')
+
+        self.assertEqual(cache.get('key').value, 'old')
+        self.assertIsNone(cache.get('key:lock'))
+
+    def test_incomplete_value_is_fresh_for_its_own_timeout(self):
+        before = time.time()
+        entry = get_or_set_entry_locked('key', lambda: Incomplete('partial', timeout=5), 3600)
+
+        self.assertEqual(entry.value, 'partial')
+        self.assertLessEqual(entry.stale_at, time.time() + 5)
+        self.assertGreaterEqual(entry.stale_at, before + 5)
+
+    def test_incomplete_timeout_does_not_extend_timeout(self):
+        entry = get_or_set_entry_locked('key', lambda: Incomplete('partial', timeout=3600), 5)
+
+        self.assertLessEqual(entry.stale_at, time.time() + 5)
+
+
+class AGetOrSetLockedTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    async def test_concurrent_callers_compute_once(self):
+        calls = 0
+
+        async def default():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return 'value'
+
+        results = await asyncio.gather(
+            *(aget_or_set_locked('key', default, 60, poll_interval=0.01) for _ in range(5)),
+        )
+
+        self.assertEqual(results, ['value'] * 5)
+        self.assertEqual(calls, 1)
+        self.assertIsNone(await cache.aget('key:lock'))
+
+    async def test_incomplete_value(self):
+        async def default():
+            return Incomplete(['partial'], timeout=5)
+
+        self.assertEqual(await aget_or_set_locked('key', default, 3600), ['partial'])
+        self.assertLessEqual((await cache.aget('key')).stale_at, time.time() + 5)
+
+    async def test_serves_stale_value_while_refreshing(self):
+        refresh_cached_value('key', lambda: 'old', 0, stale_timeout=60)
+
+        async def default():
+            return 'new'
+
+        self.assertEqual(await aget_or_set_locked('key', default, 60, stale_timeout=60), 'old')
+        join_refresh('key')
+
+        self.assertEqual((await cache.aget('key')).value, 'new')
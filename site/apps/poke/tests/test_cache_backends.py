@@ -0,0 +1,62 @@
+import tempfile
+
+from django.test import SimpleTestCase
+
+from apps.poke.cache_backends import (
+    CompressedFileBasedCache,
+    CompressedLocMemCache,
+    CompressedValue,
+)
+
+# Pickled to more than the compression threshold of the caches below.
+LARGE_VALUE = {'pokemon': [{'id': i, 'name': f'pokemon-{i}'} for i in range(500)]}
+
+
+class CompressedCacheTests:
+    """Tests shared by the backends, which `cache` is set to by the subclasses."""
+
+    cache: CompressedLocMemCache | CompressedFileBasedCache
+
+    def test_set_get_small_value(self):
+        self.cache.set('key', 'small')
+        self.assertEqual(self.cache.get('key'), 'small')
+
+    def test_set_get_large_value(self):
+        self.cache.set('key', LARGE_VALUE)
+        self.assertEqual(self.cache.get('key'), LARGE_VALUE)
+
+    def test_add_get_large_value(self):
+        self.assertTrue(self.cache.add('key', LARGE_VALUE))
+        self.assertEqual(self.cache.get('key'), LARGE_VALUE)
+
+    def test_add_existing_key(self):
+        self.cache.set('key', 'first')
+        self.assertFalse(self.cache.add('key', 'second'))
+        self.assertEqual(self.cache.get('key'), 'first')
+
+    def test_get_many_large_values(self):
+        self.cache.set_many({'a': LARGE_VALUE, 'b': 'small'})
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'a': LARGE_VALUE, 'b': 'small'})
+
+    def test_counts_hits_and_misses(self):
+        self.cache.set('key', 'value')
+        self.cache.get('key')
+        self.cache.get('missing')
+        self.assertEqual((self.cache.stats.hits, self.cache.stats.misses), (1, 1))
+
+
+class CompressedLocMemCacheTests(CompressedCacheTests, SimpleTestCase):
+    def setUp(self):
+        self.cache = CompressedLocMemCache(self.id(), {'COMPRESS_MIN_SIZE': 1024})
+
+    def test_stores_large_values_compressed(self):
+        self.cache.set('key', LARGE_VALUE)
+        stored = self.cache._cache[self.cache.make_and_validate_key('key')]
+        self.assertIn(CompressedValue.__name__.encode(), stored)
+
+
+class CompressedFileBasedCacheTests(CompressedCacheTests, SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = CompressedFileBasedCache(directory.name, {'COMPRESS_MIN_SIZE': 1024})
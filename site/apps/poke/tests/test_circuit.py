@@ -0,0 +1,77 @@
+from unittest import mock
+
+from aiohttp import ClientResponseError
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.poke.utils.circuit import CircuitBreaker, CircuitOpenError, get_circuit
+
+
+def _response_error(status: int) -> ClientResponseError:
+    return ClientResponseError(mock.Mock(), (), status=status)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def test_opens_after_consecutive_failures(self):
+        circuit = CircuitBreaker('pokemon', failure_threshold=2, reset_timeout=60)
+        circuit.record_failure()
+        self.assertEqual(circuit.state, CircuitBreaker.CLOSED)
+        circuit.record_failure()
+        self.assertEqual(circuit.state, CircuitBreaker.OPEN)
+        self.assertFalse(circuit.allow_request())
+        self.assertRaises(CircuitOpenError, circuit.check)
+
+    def test_success_resets_failures(self):
+        circuit = CircuitBreaker('pokemon', failure_threshold=2)
+        circuit.record_failure()
+        circuit.record_success()
+        circuit.record_failure()
+        self.assertEqual(circuit.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_lets_a_single_probe_through(self):
+        circuit = CircuitBreaker('pokemon', failure_threshold=1, reset_timeout=0)
+        circuit.record_failure()
+        self.assertEqual(circuit.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(circuit.allow_request())
+        self.assertFalse(circuit.allow_request())
+        circuit.record_success()
+        self.assertEqual(circuit.state, CircuitBreaker.CLOSED)
+
+    def test_failed_probe_opens_the_circuit(self):
+        circuit = CircuitBreaker('pokemon', failure_threshold=3, reset_timeout=60)
+        for _ in range(3):
+            circuit.record_failure()
+        circuit._opened_at -= 60
+        self.assertTrue(circuit.allow_request())
+        circuit.record_failure()
+        self.assertEqual(circuit.state, CircuitBreaker.OPEN)
+
+    def test_records_errors(self):
+        circuit = CircuitBreaker('pokemon', failure_threshold=1)
+        circuit.record_error(_response_error(404))
+        self.assertEqual(circuit.state, CircuitBreaker.CLOSED)
+        circuit.record_error(_response_error(503))
+        self.assertEqual(circuit.state, CircuitBreaker.OPEN)
+
+    def test_release_frees_the_probe(self):
+        circuit = CircuitBreaker('pokemon', failure_threshold=1, reset_timeout=0)
+        circuit.record_failure()
+        self.assertTrue(circuit.allow_request())
+        circuit.release()
+        self.assertTrue(circuit.allow_request())
+        self.assertEqual(circuit.failures, 1)
+
+
+class GetCircuitTests(SimpleTestCase):
+    def setUp(self):
+        get_circuit.cache_clear()
+        self.addCleanup(get_circuit.cache_clear)
+
+    @override_settings(POKEAPI_CIRCUIT_THRESHOLD=5, POKEAPI_CIRCUIT_THRESHOLDS={'pokemon': 2})
+    def test_thresholds_from_settings(self):
+        self.assertEqual(get_circuit('pokemon').failure_threshold, 2)
+        self.assertEqual(get_circuit('berry').failure_threshold, 5)
+
+    def test_one_circuit_per_endpoint(self):
+        self.assertIs(get_circuit('pokemon'), get_circuit('pokemon'))
+        self.assertIsNot(get_circuit('pokemon'), get_circuit('berry'))
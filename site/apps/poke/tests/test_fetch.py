@@ -0,0 +1,122 @@
+import asyncio
+import unittest
+
+import aiohttp
+
+from apps.poke.utils.fetch import fetch_all, is_retryable, retry_delay
+
+
+def response_error(status: int, headers: dict | None = None) -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(None, (), status=status, headers=headers)  # type: ignore[arg-type]
+
+
+class RetryTests(unittest.TestCase):
+    def test_is_retryable(self):
+        self.assertTrue(is_retryable(response_error(503)))
+        self.assertTrue(is_retryable(response_error(429)))
+        self.assertTrue(is_retryable(aiohttp.ServerDisconnectedError()))
+        self.assertTrue(is_retryable(asyncio.TimeoutError()))
+        self.assertFalse(is_retryable(response_error(404)))
+        self.assertFalse(is_retryable(ValueError()))
+
+    def test_retry_delay_honours_retry_after(self):
+        self.assertEqual(retry_delay(response_error(429, {'Retry-After': '3'}), 1, backoff=0.5, max_backoff=10), 3)
+        self.assertEqual(retry_delay(response_error(429, {'Retry-After': '60'}), 1, backoff=0.5, max_backoff=10), 10)
+
+    def test_retry_delay_backs_off(self):
+        for attempt in range(1, 10):
+            delay = retry_delay(asyncio.TimeoutError(), attempt, backoff=0.5, max_backoff=10)
+            self.assertLessEqual(delay, min(10, 0.5 * 2**attempt))
+
+
+class FetchAllTests(unittest.IsolatedAsyncioTestCase):
+    async def test_keeps_order_of_keys(self):
+        async def fetch(key):
+            await asyncio.sleep(0.01 * (5 - key))
+            return key * 10
+
+        result = await fetch_all(range(5), fetch, concurrency=5)
+
+        self.assertEqual(result.results, [0, 10, 20, 30, 40])
+        self.assertEqual(result.failures, {})
+        self.assertEqual((result.progress.succeeded, result.progress.completed), (5, 5))
+
+    async def test_bounds_concurrency(self):
+        running = peak = 0
+
+        async def fetch(key):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return key
+
+        result = await fetch_all(range(20), fetch, concurrency=3)
+
+        self.assertEqual(result.results, list(range(20)))
+        self.assertEqual(peak, 3)
+
+    async def test_retries_retryable_errors(self):
+        attempts = {}
+
+        async def fetch(key):
+            attempts[key] = attempts.get(key, 0) + 1
+            if attempts[key] < 3:
+                raise response_error(503)
+            return key
+
+        result = await fetch_all(['a', 'b'], fetch, concurrency=2, backoff=0)
+
+        self.assertEqual(result.results, ['a', 'b'])
+        self.assertEqual(attempts, {'a': 3, 'b': 3})
+        self.assertEqual(result.progress.retries, 4)
+
+    async def test_records_failures(self):
+        attempts = {}
+        error = response_error(404)
+
+        async def fetch(key):
+            attempts[key] = attempts.get(key, 0) + 1
+            if key == 'missing':
+                raise error
+            if key == 'down':
+                raise aiohttp.ServerDisconnectedError()
+            return key
+
+        with self.assertLogs('apps.poke.utils.fetch', 'WARNING'):
+            result = await fetch_all(['ok', 'missing', 'down'], fetch, concurrency=2, retries=2, backoff=0)
+
+        self.assertEqual(result.results, ['ok'])
+        self.assertIs(result.failures['missing'], error)
+        self.assertIsInstance(result.failures['down'], aiohttp.ServerDisconnectedError)
+        self.assertEqual(attempts, {'ok': 1, 'missing': 1, 'down': 3})
+        self.assertEqual((result.progress.succeeded, result.progress.failed), (1, 2))
+
+    async def test_callbacks(self):
+        progress = []
+        outcomes = {}
+
+        async def fetch(key):
+            if key == 2:
+                raise ValueError(key)
+            return -key
+
+        with self.assertLogs('apps.poke.utils.fetch', 'WARNING'):
+            await fetch_all(
+                [1, 2, 3],
+                fetch,
+                concurrency=1,
+                on_progress=lambda p: progress.append(p.completed),
+                on_result=outcomes.__setitem__,
+            )
+
+        self.assertEqual(progress, [1, 2, 3])
+        self.assertEqual(outcomes[1], -1)
+        self.assertIsInstance(outcomes[2], ValueError)
+        self.assertEqual(outcomes[3], -3)
+
+    async def test_no_keys(self):
+        result = await fetch_all([], asyncio.sleep, concurrency=4)
+
+        self.assertEqual((result.results, result.failures, result.progress.total), ([], {}, 0))
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.poke.utils.metrics import REGISTRY, Histogram, Registry
+from apps.poke.views import metrics_view
+
+ANONYMOUS = SimpleNamespace(is_active=False, is_staff=False)
+STAFF = SimpleNamespace(is_active=True, is_staff=True)
+
+
+class HistogramTests(SimpleTestCase):
+    def setUp(self):
+        self.registry = Registry(enabled=True)
+        self.histogram = Histogram(
+            'test_seconds', 'Test durations.', ['outcome'], buckets=(0.1, 1.0), registry=self.registry
+        )
+
+    def test_renders_cumulative_buckets(self):
+        self.histogram.observe(0.05, outcome='ok')
+        self.histogram.observe(0.5, outcome='ok')
+        rendered = self.registry.render()
+        self.assertIn('test_seconds_bucket{outcome="ok",le="0.1"} 1\n', rendered)
+        self.assertIn('test_seconds_bucket{outcome="ok",le="1.0"} 2\n', rendered)
+        self.assertIn('test_seconds_bucket{outcome="ok",le="+Inf"} 2\n', rendered)
+        self.assertIn('test_seconds_count{outcome="ok"} 2\n', rendered)
+
+    def test_timed_errors(self):
+        with self.assertRaises(ValueError), self.histogram.time():
+            raise ValueError
+        self.assertIn('test_seconds_count{outcome="error"} 1\n', self.registry.render())
+
+    def test_disabled_registry_records_nothing(self):
+        self.registry.enabled = False
+        with self.histogram.time(outcome='ok'):
+            pass
+        self.assertNotIn('test_seconds_count', self.registry.render())
+
+
+@override_settings(POKE_METRICS_TOKEN='secret')
+@mock.patch.object(REGISTRY, 'enabled', True)
+class MetricsViewTests(SimpleTestCase):
+    def get(self, user=ANONYMOUS, **headers):
+        request = RequestFactory().get('/metrics/', headers=headers)
+        request.user = user
+        return metrics_view(request)
+
+    def test_requires_authentication(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer realm="metrics"')
+
+    def test_bearer_token(self):
+        self.assertEqual(self.get(authorization='Bearer secret').status_code, 200)
+        self.assertEqual(self.get(authorization='Bearer wrong').status_code, 401)
+        self.assertEqual(self.get(authorization='Basic secret').status_code, 401)
+
+    def test_staff_users(self):
+        self.assertEqual(self.get(STAFF).status_code, 200)
+
+    @override_settings(POKE_METRICS_TOKEN='')
+    def test_no_token_without_setting(self):
+        self.assertEqual(self.get(authorization='Bearer ').status_code, 401)
+        self.assertEqual(self.get(STAFF).status_code, 200)
+
+    def test_disabled(self):
+        with mock.patch.object(REGISTRY, 'enabled', False), self.assertRaises(Http404):
+            self.get(STAFF)
@@ -0,0 +1,102 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from django.test import override_settings
+
+from apps.poke.utils import requests
+from apps.poke.utils.mirror import HttpMirror
+
+ETAG = '"v1"'
+
+
+class HttpMirrorTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'mirror.sqlite3'
+
+    def test_persists_responses(self):
+        mirror = HttpMirror(self.path)
+        mirror.put('https://pokeapi.test/pokemon/25', b'{"id": 25}', etag=ETAG, last_modified=None)
+        mirror.close()
+
+        entry = HttpMirror(self.path).get('https://pokeapi.test/pokemon/25')
+        self.assertEqual(entry.body, b'{"id": 25}')
+        self.assertEqual(entry.conditional_headers(), {'If-None-Match': ETAG})
+        self.assertLess(entry.age, 60)
+
+    def test_missing_response(self):
+        self.assertIsNone(HttpMirror(self.path).get('https://pokeapi.test/pokemon/25'))
+
+    def test_touch(self):
+        mirror = HttpMirror(self.path)
+        with mock.patch('apps.poke.utils.mirror.time.time', return_value=0):
+            mirror.put('https://pokeapi.test/pokemon/25', b'{}', etag=None, last_modified='yesterday')
+        self.assertGreater(mirror.get('https://pokeapi.test/pokemon/25').age, 60)
+        mirror.touch('https://pokeapi.test/pokemon/25')
+        self.assertLess(mirror.get('https://pokeapi.test/pokemon/25').age, 60)
+
+
+class MirroredGetJsonTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.statuses = []
+        self.unavailable = False
+
+        async def pokemon(request):
+            if self.unavailable:
+                status = 503
+            elif request.headers.get('If-None-Match') == ETAG:
+                status = 304
+            else:
+                status = 200
+            self.statuses.append(status)
+            if status != 200:
+                return web.Response(status=status)
+            return web.json_response({'name': request.match_info['name']}, headers={'ETag': ETAG})
+
+        app = web.Application()
+        app.router.add_get('/api/v2/pokemon/{name}', pokemon)
+        server = TestServer(app)
+        await server.start_server()
+        self.addAsyncCleanup(server.close)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.mirror = HttpMirror(Path(directory.name) / 'mirror.sqlite3')
+        self.addCleanup(self.mirror.close)
+
+        api = str(server.make_url('/api/v2/'))
+        self.url = f'{api}pokemon/pikachu'
+        for target, value in [('POKEMON_API', api), ('get_mirror', lambda: self.mirror)]:
+            patcher = mock.patch.object(requests, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        requests.get_circuit.cache_clear()
+        self.addCleanup(requests.get_circuit.cache_clear)
+
+    async def test_serves_fresh_responses_without_requests(self):
+        with override_settings(POKEAPI_MIRROR_MAX_AGE=60):
+            self.assertEqual(await requests._get_json(self.url), {'name': 'pikachu'})
+            self.assertEqual(await requests._get_json(self.url), {'name': 'pikachu'})
+        self.assertEqual(self.statuses, [200])
+
+    async def test_revalidates_old_responses(self):
+        with override_settings(POKEAPI_MIRROR_MAX_AGE=0):
+            await requests._get_json(self.url)
+            with mock.patch.object(self.mirror, 'touch', wraps=self.mirror.touch) as touch:
+                self.assertEqual(await requests._get_json(self.url), {'name': 'pikachu'})
+        self.assertEqual(self.statuses, [200, 304])
+        touch.assert_called_once_with(self.url)
+
+    async def test_serves_stale_responses_when_upstream_fails(self):
+        with override_settings(POKEAPI_MIRROR_MAX_AGE=0):
+            await requests._get_json(self.url)
+            self.unavailable = True
+            with self.assertLogs('apps.poke.utils.requests', 'WARNING'):
+                self.assertEqual(await requests._get_json(self.url), {'name': 'pikachu'})
+        self.assertEqual(self.statuses, [200, 503])
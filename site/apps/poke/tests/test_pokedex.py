@@ -0,0 +1,70 @@
+from django.core.paginator import EmptyPage, PageNotAnInteger
+from django.test import SimpleTestCase
+
+from apps.poke.pokedex import AsyncPaginator
+
+
+class FakePokemonList(list):
+    """List of numbers counted and sliced like the Pokémon lists."""
+
+    counts = 0
+
+    async def acount(self) -> int:
+        self.counts += 1
+        return len(self)
+
+    async def aslice(self, index: slice) -> list:
+        return self[index]
+
+
+class AsyncPaginatorTests(SimpleTestCase):
+    def setUp(self):
+        self.object_list = FakePokemonList(range(25))
+
+    async def test_acount(self):
+        paginator = AsyncPaginator(self.object_list, 10)
+
+        self.assertEqual(await paginator.acount(), 25)
+        self.assertEqual(await paginator.acount(), 25)
+        self.assertEqual(self.object_list.counts, 1)
+        self.assertEqual(paginator.num_pages, 3)
+
+    async def test_apage(self):
+        paginator = AsyncPaginator(self.object_list, 10)
+
+        page = await paginator.apage(2)
+
+        self.assertEqual(list(page), list(range(10, 20)))
+        self.assertEqual(page.number, 2)
+        self.assertTrue(page.has_next())
+        self.assertTrue(page.has_previous())
+
+    async def test_apage_last(self):
+        page = await AsyncPaginator(self.object_list, 10).apage('3')
+
+        self.assertEqual(list(page), list(range(20, 25)))
+        self.assertFalse(page.has_next())
+
+    async def test_abounds_with_orphans(self):
+        paginator = AsyncPaginator(self.object_list, 10, orphans=5)
+
+        self.assertEqual(await paginator.abounds(2), (2, slice(10, 25)))
+        self.assertEqual(paginator.num_pages, 2)
+
+    async def test_abounds_invalid_numbers(self):
+        paginator = AsyncPaginator(self.object_list, 10)
+
+        with self.assertRaises(PageNotAnInteger):
+            await paginator.abounds('first')
+        with self.assertRaises(EmptyPage):
+            await paginator.abounds(4)
+
+    async def test_page_of(self):
+        paginator = AsyncPaginator(self.object_list, 10)
+        number, _ = await paginator.abounds(3)
+
+        page = paginator.page_of([], number)
+
+        self.assertEqual(page.number, 3)
+        self.assertFalse(page.has_next())
+        self.assertEqual(page.start_index(), 21)
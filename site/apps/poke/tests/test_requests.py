@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from apps.poke.utils import requests
+
+
+class GetJsonTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = 0
+
+        async def pokemon(request):
+            self.requests += 1
+            await asyncio.sleep(float(request.query.get('delay', 0)))
+            return web.json_response({'name': request.match_info['name']})
+
+        app = web.Application()
+        app.router.add_get('/api/v2/pokemon/{name}', pokemon)
+        server = TestServer(app)
+        await server.start_server()
+        self.addAsyncCleanup(server.close)
+
+        api = str(server.make_url('/api/v2/'))
+        self.pokemon_endpoint = f'{api}pokemon/'
+        for target, value in [
+            ('POKEMON_API', api),
+            ('POKEMON_ENDPOINT', self.pokemon_endpoint),
+            ('get_mirror', lambda: None),
+        ]:
+            patcher = mock.patch.object(requests, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        requests.get_circuit.cache_clear()
+        self.addCleanup(requests.get_circuit.cache_clear)
+
+    async def test_concurrent_requests_share_a_fetch(self):
+        results = await asyncio.gather(
+            *(requests._get_json(f'{self.pokemon_endpoint}pikachu', {'delay': 0.1}) for _ in range(3))
+        )
+        self.assertEqual(results, [{'name': 'pikachu'}] * 3)
+        self.assertEqual(self.requests, 1)
+
+    async def test_cancelled_caller_does_not_fail_the_others(self):
+        first = asyncio.ensure_future(requests._get_json(f'{self.pokemon_endpoint}pikachu', {'delay': 0.2}))
+        await asyncio.sleep(0.05)
+        second = asyncio.ensure_future(requests._get_json(f'{self.pokemon_endpoint}pikachu', {'delay': 0.2}))
+        await asyncio.sleep(0.05)
+        first.cancel()
+
+        self.assertEqual(await second, {'name': 'pikachu'})
+        self.assertTrue(first.cancelled())
+        self.assertEqual(self.requests, 1)
+
+    async def test_closes_the_session_once_unused(self):
+        await requests.retrieve_multiple_pokemon(['bulbasaur', 'ivysaur'])
+        self.assertEqual(requests._sessions, {})
@@ -0,0 +1,61 @@
+import unittest
+from unittest import mock
+
+from apps.poke import pokedex
+from apps.poke.cache import CachedValue
+from apps.poke.utils.search import NameIndex
+
+NAMES = ['bulbasaur', 'ivysaur', 'venusaur', 'charmander', 'charmeleon', 'charizard', 'pikachu', 'raichu']
+
+
+class NameIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = NameIndex(NAMES)
+
+    def names(self, query: str) -> list[str]:
+        return [NAMES[position] for position in self.index.search(query)]
+
+    def test_empty_query(self):
+        self.assertEqual(self.names('  '), NAMES)
+
+    def test_prefix(self):
+        self.assertEqual(self.names('char'), ['charmander', 'charmeleon', 'charizard'])
+
+    def test_prefix_matches_first(self):
+        self.assertEqual(self.names('saur'), ['bulbasaur', 'ivysaur', 'venusaur'])
+        self.assertEqual(self.names('chu'), ['pikachu', 'raichu'])
+        self.assertEqual(self.names('r'), ['raichu', 'bulbasaur', 'ivysaur', 'venusaur', *NAMES[3:6]])
+
+    def test_case_and_whitespace(self):
+        self.assertEqual(self.names(' PIKA '), ['pikachu'])
+
+    def test_similar_names_when_nothing_contains_query(self):
+        self.assertEqual(self.names('pikachuu')[0], 'pikachu')
+        self.assertEqual(self.names('charmandr')[0], 'charmander')
+
+    def test_no_match(self):
+        self.assertEqual(self.names('xyzzy'), [])
+
+    def test_caches_recent_queries(self):
+        index = NameIndex(NAMES, max_cached_queries=2)
+        for query in ('a', 'b', 'a', 'c'):
+            index.search(query)
+
+        self.assertEqual(list(index._results), ['a', 'c'])
+
+
+class PokemonSearchTests(unittest.TestCase):
+    def test_search(self):
+        pokemon_list = [{'name': name, 'url': f'/pokemon/{i}/'} for i, name in enumerate(NAMES)]
+
+        self.assertEqual(pokedex.PokemonSearch(pokemon_list).search('raic'), [pokemon_list[7]])
+
+    @mock.patch.object(pokedex, '_search', None)
+    def test_rebuilt_for_each_version(self):
+        pokemon_list = [{'name': 'pikachu', 'url': ''}]
+        search = pokedex._search_for(CachedValue(pokemon_list, stale_at=1.0))
+
+        self.assertIs(pokedex._search_for(CachedValue(pokemon_list, stale_at=1.0)), search)
+        newer = pokedex._search_for(CachedValue([*pokemon_list, {'name': 'raichu', 'url': ''}], stale_at=2.0))
+        self.assertIsNot(newer, search)
+        self.assertEqual([pokemon['name'] for pokemon in newer.search('chu')], ['pikachu', 'raichu'])
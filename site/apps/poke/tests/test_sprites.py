@@ -0,0 +1,145 @@
+import contextlib
+import io
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from PIL import Image
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from apps.poke.sprites import SIZES, _write_thumbnails, thumbnail_path, thumbnail_url
+
+SOURCE_URL = 'https://sprites.test/sprites/'
+
+
+def _png(width: int = 400, height: int = 400) -> bytes:
+    body = io.BytesIO()
+    Image.new('RGBA', (width, height), 'red').save(body, 'PNG')
+    return body.getvalue()
+
+
+class SpritesRootMixin:
+    """Stores the thumbnails of each test in a temporary directory."""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        settings = override_settings(POKE_SPRITES_ROOT=directory.name, POKE_SPRITES_SOURCE_URL=SOURCE_URL)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        cache.clear()
+
+
+class ThumbnailUrlTests(SpritesRootMixin, SimpleTestCase):
+    def test_sprites_under_the_source(self):
+        self.assertEqual(
+            thumbnail_url(f'{SOURCE_URL}pokemon/other/official-artwork/25.png', 'card'),
+            '/sprites/card/pokemon/other/official-artwork/25.webp',
+        )
+
+    def test_other_urls_are_kept(self):
+        for url in [
+            'https://example.com/sprites/pokemon/25.png',
+            f'{SOURCE_URL}pokemon/25.gif',
+            f'{SOURCE_URL}pokemon/../../secret.png',
+            f'{SOURCE_URL}pokemon//25.png',
+            '',
+        ]:
+            with self.subTest(url=url):
+                self.assertEqual(thumbnail_url(url, 'card'), url)
+
+    def test_without_sprites_root(self):
+        url = f'{SOURCE_URL}pokemon/25.png'
+        with override_settings(POKE_SPRITES_ROOT=''):
+            self.assertEqual(thumbnail_url(url, 'card'), url)
+
+    def test_unknown_size(self):
+        with self.assertRaises(ValueError):
+            thumbnail_url(f'{SOURCE_URL}pokemon/25.png', 'huge')
+
+
+class WriteThumbnailsTests(SpritesRootMixin, SimpleTestCase):
+    def test_writes_every_size(self):
+        _write_thumbnails(_png(), 'pokemon/25')
+        for size, pixels in SIZES.items():
+            with Image.open(thumbnail_path(size, 'pokemon/25')) as thumbnail:
+                self.assertEqual((thumbnail.format, thumbnail.size), ('WEBP', (pixels, pixels)))
+
+    def test_concurrent_threads_write_whole_thumbnails(self):
+        body = _png()
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda _: _write_thumbnails(body, 'pokemon/25'), range(16)))
+
+        for size in SIZES:
+            with Image.open(thumbnail_path(size, 'pokemon/25')) as thumbnail:
+                thumbnail.verify()
+        self.assertEqual(list(self.root.rglob('*.tmp')), [])
+
+
+class SpriteViewTests(SpritesRootMixin, SimpleTestCase):
+    @contextlib.asynccontextmanager
+    async def source(self, sprites: dict[str, bytes]):
+        """Serves `sprites` by path as the source of the sprites, yielding the paths requested."""
+        requested = []
+
+        async def sprite(request):
+            path = request.match_info['path']
+            requested.append(path)
+            if path not in sprites:
+                raise web.HTTPNotFound()
+            return web.Response(body=sprites[path], content_type='image/png')
+
+        app = web.Application()
+        app.router.add_get('/sprites/{path:.+}', sprite)
+        async with TestServer(app) as server:
+            with override_settings(POKE_SPRITES_SOURCE_URL=str(server.make_url('/sprites/'))):
+                yield requested
+
+    def url(self, sprite: str, size: str = 'card') -> str:
+        return reverse('sprite', kwargs={'size': size, 'sprite': sprite})
+
+    async def test_serves_thumbnails(self):
+        async with self.source({'pokemon/25.png': _png()}) as requested:
+            for size in SIZES:
+                response = await self.async_client.get(self.url('pokemon/25', size))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertEqual(requested, ['pokemon/25.png'])
+
+    async def test_invalid_paths(self):
+        for url in [
+            '/sprites/huge/pokemon/25.webp',
+            '/sprites/card/pokemon/2.5.webp',
+            '/sprites/card/pokemon//25.webp',
+        ]:
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, 404)
+
+    async def test_remembers_missing_sprites(self):
+        async with self.source({}) as requested:
+            for _ in range(3):
+                response = await self.async_client.get(self.url('pokemon/99999'))
+                self.assertEqual(response.status_code, 404)
+        self.assertEqual(requested, ['pokemon/99999.png'])
+
+    async def test_redirects_to_sprites_which_are_not_images(self):
+        async with self.source({'pokemon/25.png': b'<html>Not an image</html>'}):
+            with self.assertLogs('apps.poke.views', 'WARNING'):
+                response = await self.async_client.get(self.url('pokemon/25'))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response['Location'].endswith('/sprites/pokemon/25.png'))
+
+    async def test_redirects_to_decompression_bombs(self):
+        async with self.source({'pokemon/25.png': _png(100, 100)}):
+            with mock.patch.object(Image, 'MAX_IMAGE_PIXELS', 1000), self.assertLogs('apps.poke.views', 'WARNING'):
+                response = await self.async_client.get(self.url('pokemon/25'))
+        self.assertEqual(response.status_code, 302)
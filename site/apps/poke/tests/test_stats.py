@@ -0,0 +1,18 @@
+from django.template import Context, Template
+from django.test import SimpleTestCase
+
+from apps.poke.stats import MAX_BASE_STAT, stat_percentage
+
+
+class StatPercentageTests(SimpleTestCase):
+    def test_percentage_of_max_stat(self):
+        self.assertEqual(stat_percentage(MAX_BASE_STAT), 100)
+        self.assertEqual(stat_percentage(45), 17.65)
+
+    def test_missing_or_negative_stat(self):
+        self.assertEqual(stat_percentage(None), 0)
+        self.assertEqual(stat_percentage(-1), 0)
+
+    def test_template_filter(self):
+        template = Template('{% load pokemon %}{{ stat|stat_percentage }}')
+        self.assertEqual(template.render(Context({'stat': 51})), '20.0')
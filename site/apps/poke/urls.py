@@ -1,9 +1,19 @@
 from django.urls import path
 
-from .views import berries_view, pokedex_view, pokemon_view
+from .views import (
+    berries_view,
+    cache_stats_view,
+    metrics_view,
+    pokedex_view,
+    pokemon_view,
+    sprite_view,
+)
 
 urlpatterns = [
     path('', pokedex_view, name='pokedex'),
     path('pokemon/<int:pokemon_id>/', pokemon_view, name='pokemon'),
     path('berries/', berries_view, name='berries'),
+    path('sprites/<slug:size>/<path:sprite>.webp', sprite_view, name='sprite'),
+    path('stats/cache/', cache_stats_view, name='cache-stats'),
+    path('metrics/', metrics_view, name='metrics'),
 ]
@@ -0,0 +1,141 @@
+"""Circuit breakers of the requests to the Poke API endpoints.
+
+Each endpoint, e.g. ``pokemon`` or ``berry``, has a breaker of its own,
+returned by :func:`get_circuit` and configured by the
+``POKEAPI_CIRCUIT_*`` settings.  The site's Poke API client checks it
+before each upstream request, see :func:`apps.poke.utils.requests._get_json`.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+
+import aiohttp
+
+from django.conf import settings
+
+# Statuses telling that the upstream is failing or overloaded, rather than the request being wrong.
+FAILURE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Raised instead of sending a request while the circuit of its endpoint is open.
+
+    Not a connection error, so fetches failing with it are not retried.
+    """
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"The circuit of '{name}' is open, retry in {retry_after:.0f}s.")
+
+
+def is_failure(exc: BaseException) -> bool:
+    """Whether a request failing with `exc` counts against the circuit of its endpoint."""
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status in FAILURE_STATUSES
+    return isinstance(exc, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+class CircuitBreaker:
+    """Stops sending requests to a failing endpoint for a while.
+
+    The circuit is closed at first, letting requests through.  After
+    `failure_threshold` consecutive failures it opens, and requests fail
+    fast for `reset_timeout` seconds.  It then turns half-open, letting a
+    single probe through: the circuit closes if the probe succeeds, and
+    opens again otherwise.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, name: str, *, failure_threshold: int = 5, reset_timeout: float = 30) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the circuit turns half-open, 0 unless open."""
+        if self._opened_at is None:
+            return 0
+        return max(self._opened_at + self.reset_timeout - time.monotonic(), 0)
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent, claiming the probe when half-open."""
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def check(self) -> None:
+        """Raises :class:`CircuitOpenError` unless a request may be sent."""
+        if not self.allow_request():
+            raise CircuitOpenError(self.name, self.retry_after)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def record_error(self, exc: aiohttp.ClientError | asyncio.TimeoutError) -> None:
+        """Records a request failing with `exc`, which may not be a failure of the endpoint."""
+        if is_failure(exc):
+            self.record_failure()
+        elif isinstance(exc, aiohttp.ClientResponseError):
+            # E.g. a 404 response: the endpoint works.
+            self.record_success()
+        else:
+            # E.g. an invalid URL: nothing is known of the endpoint.
+            self.release()
+
+    def release(self) -> None:
+        """Releases the probe claimed by :meth:`allow_request`, for a request ending without telling anything.
+
+        E.g. a request cancelled as its client disconnected, which is neither
+        a success nor a failure of the endpoint.
+        """
+        with self._lock:
+            self._probing = False
+
+
+@functools.cache
+def get_circuit(resource: str) -> CircuitBreaker:
+    """Returns the circuit breaker of the requests to an endpoint, e.g. ``pokemon``.
+
+    Its threshold is ``settings.POKEAPI_CIRCUIT_THRESHOLDS[resource]``, or
+    ``settings.POKEAPI_CIRCUIT_THRESHOLD`` for endpoints without one.
+    """
+    return CircuitBreaker(
+        resource,
+        failure_threshold=settings.POKEAPI_CIRCUIT_THRESHOLDS.get(resource, settings.POKEAPI_CIRCUIT_THRESHOLD),
+        reset_timeout=settings.POKEAPI_CIRCUIT_RESET_TIMEOUT,
+    )
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+_K = TypeVar('_K')
+_T = TypeVar('_T')
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class FetchProgress:
+    """Progress of a :func:`fetch_all` run."""
+
+    total: int
+    succeeded: int = 0
+    failed: int = 0
+    retries: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: float | None = None
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+
+@dataclass
+class FetchResult(Generic[_K, _T]):
+    """Outcome of a :func:`fetch_all` run.
+
+    Attributes:
+        results: Results of the successful fetches, in the order of the keys.
+        failures: Exceptions of the failed fetches by key.
+        progress: Final progress of the run.
+    """
+
+    results: list[_T]
+    failures: dict[_K, BaseException]
+    progress: FetchProgress
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether a fetch failing with `exc` is worth retrying."""
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status in RETRY_STATUSES
+    return isinstance(exc, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+def retry_delay(exc: BaseException, attempt: int, *, backoff: float, max_backoff: float) -> float:
+    """Seconds to wait before retrying a fetch for the `attempt`-th time.
+
+    Honours the ``Retry-After`` header of throttled responses, otherwise uses
+    exponential backoff with full jitter.
+    """
+    if isinstance(exc, aiohttp.ClientResponseError) and exc.headers:
+        retry_after = exc.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), max_backoff)
+
+    return random.uniform(0, min(max_backoff, backoff * 2**attempt))
+
+
+async def _fetch_with_retries(
+    fetch: Callable[[_K], Awaitable[_T]],
+    key: _K,
+    progress: FetchProgress,
+    *,
+    retries: int,
+    backoff: float,
+    max_backoff: float,
+) -> _T:
+    attempt = 0
+
+    while True:
+        try:
+            return await fetch(key)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            if attempt >= retries or not is_retryable(exc):
+                raise
+
+            attempt += 1
+            progress.retries += 1
+            await asyncio.sleep(retry_delay(exc, attempt, backoff=backoff, max_backoff=max_backoff))
+
+
+async def fetch_all(
+    keys: Sequence[_K],
+    fetch: Callable[[_K], Awaitable[_T]],
+    *,
+    concurrency: int,
+    retries: int = 3,
+    backoff: float = 0.5,
+    max_backoff: float = 10,
+    on_progress: Callable[[FetchProgress], None] | None = None,
+    on_result: Callable[[_K, _T | BaseException], None] | None = None,
+) -> FetchResult[_K, _T]:
+    """Fetches every key with `fetch`, at most `concurrency` at a time.
+
+    The keys are fetched by `concurrency` workers, so no more than that many
+    requests (and coroutines) exist at any time.  Fetches failing with a
+    retryable error (throttling, server errors, connection errors and
+    timeouts) are retried up to `retries` times with jittered exponential
+    backoff.  A fetch failing for good is recorded in
+    :attr:`FetchResult.failures` without affecting the other fetches.
+
+    Args:
+        keys: The keys to fetch.
+        fetch: Fetches a single key.
+        concurrency: Maximum number of fetches in progress at a time.
+        retries: Maximum number of retries per key.
+        backoff: Base delay of the exponential backoff in seconds.
+        max_backoff: Maximum delay between retries in seconds.
+        on_progress: Called with the progress after each completed fetch.
+        on_result: Called with the key and the result of each completed
+            fetch, or the exception it failed with for good.
+    """
+    assert concurrency > 0, 'The concurrency must be positive.'
+
+    progress = FetchProgress(total=len(keys))
+    results: dict[int, _T] = {}
+    failures: dict[_K, BaseException] = {}
+    pending = iter(enumerate(keys))
+
+    async def worker() -> None:
+        # Workers share the iterator, so each key is fetched by exactly one worker.
+        for index, key in pending:
+            try:
+                results[index] = await _fetch_with_retries(
+                    fetch,
+                    key,
+                    progress,
+                    retries=retries,
+                    backoff=backoff,
+                    max_backoff=max_backoff,
+                )
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.warning('Failed to fetch %r: %r', key, exc)
+                failures[key] = exc
+                progress.failed += 1
+            else:
+                progress.succeeded += 1
+
+            if on_progress is not None:
+                on_progress(progress)
+            if on_result is not None:
+                on_result(key, failures[key] if key in failures else results[index])
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(keys)))))
+    progress.finished_at = time.monotonic()
+
+    return FetchResult(
+        results=[results[index] for index in range(len(keys)) if index in results],
+        failures=failures,
+        progress=progress,
+    )
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class MirrorEntry:
+    """A Poke API response stored in the mirror."""
+
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers revalidating the entry with a conditional request."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpMirror:
+    """Persistent store of Poke API responses, kept in an SQLite database.
+
+    Responses survive process restarts, and are revalidated with their
+    ``ETag`` and ``Last-Modified`` validators instead of being downloaded
+    again.  Bodies are stored compressed.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'url TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL)'
+            )
+            self._connection = connection
+        return self._connection
+
+    def get(self, url: str) -> MirrorEntry | None:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute('SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?', (url,))
+                .fetchone()
+            )
+
+        if row is None:
+            return None
+
+        body, etag, last_modified, fetched_at = row
+        return MirrorEntry(zlib.decompress(body), etag, last_modified, fetched_at)
+
+    def put(self, url: str, body: bytes, *, etag: str | None, last_modified: str | None) -> None:
+        with self._lock:
+            self._connect().execute(
+                'INSERT OR REPLACE INTO responses (url, body, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?, ?)',
+                (url, zlib.compress(body), etag, last_modified, time.time()),
+            )
+
+    def touch(self, url: str) -> None:
+        """Marks the entry of `url` as revalidated now."""
+        with self._lock:
+            self._connect().execute('UPDATE responses SET fetched_at = ? WHERE url = ?', (time.time(), url))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
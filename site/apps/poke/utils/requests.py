@@ -1,20 +1,220 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
+import json
+import logging
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
 from typing import TYPE_CHECKING
+from urllib.parse import urlencode
 
 import aiohttp
 
+from django.conf import settings
+
+from apps.poke._types import PokemonSummary
+from apps.poke.stats import stat_percentage
+
+from .circuit import CircuitOpenError, get_circuit, is_failure
+from .fetch import FetchResult, fetch_all
+from .metrics import Histogram
+from .mirror import HttpMirror
+from .singleflight import SingleFlight
+
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import AsyncIterator, Callable, Sequence
+    from typing import Any
+
+    from apps.poke._types import (
+        Berry,
+        BerryItem,
+        BerryItemSummary,
+        Item,
+        Pokemon,
+        PokemonList,
+    )
 
-    from apps.poke._types import Berry, BerryItem, Item, Pokemon, PokemonList
+logger = logging.getLogger(__name__)
 
-POKEMON_API = 'https://pokeapi.co/api/v2/'
+POKEMON_API = settings.POKEAPI_BASE_URL.rstrip('/') + '/'
 POKEMON_ENDPOINT = f'{POKEMON_API}pokemon/'
 ITEM_ENDPOINT = f'{POKEMON_API}item/'
 BERRY_ENDPOINT = f'{POKEMON_API}berry/'
 
+_flight = SingleFlight()
+
+REQUEST_SECONDS = Histogram(
+    'pokeapi_request_duration_seconds',
+    'Duration of Poke API lookups, from the mirror or upstream.',
+    ['resource', 'outcome'],
+)
+DECODE_SECONDS = Histogram('pokeapi_json_decode_duration_seconds', 'Duration of decoding Poke API JSON.', ['resource'])
+DNS_SECONDS = Histogram('pokeapi_dns_duration_seconds', 'Duration of resolving the Poke API host.')
+CONNECT_SECONDS = Histogram(
+    'pokeapi_connect_duration_seconds', 'Duration of opening connections to the Poke API, DNS and TLS included.'
+)
+
+
+@functools.cache
+def get_mirror() -> HttpMirror | None:
+    """Returns the persistent mirror of Poke API responses, if enabled."""
+    if not settings.POKEAPI_MIRROR_PATH:
+        return None
+    return HttpMirror(settings.POKEAPI_MIRROR_PATH)
+
+
+async def _on_dns_start(session, context: SimpleNamespace, params) -> None:  # pylint: disable=unused-argument
+    context.dns_start = time.perf_counter()
+
+
+async def _on_dns_end(session, context: SimpleNamespace, params) -> None:  # pylint: disable=unused-argument
+    DNS_SECONDS.observe(time.perf_counter() - context.dns_start)
+
+
+async def _on_connect_start(session, context: SimpleNamespace, params) -> None:  # pylint: disable=unused-argument
+    context.connect_start = time.perf_counter()
+
+
+async def _on_connect_end(session, context: SimpleNamespace, params) -> None:  # pylint: disable=unused-argument
+    CONNECT_SECONDS.observe(time.perf_counter() - context.connect_start)
+
+
+def _trace_configs() -> list[aiohttp.TraceConfig]:
+    """Returns the trace configs timing DNS resolution and connections, if metrics are enabled."""
+    if not REQUEST_SECONDS.registry.enabled:
+        return []
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(_on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_end)
+    trace_config.on_connection_create_start.append(_on_connect_start)
+    trace_config.on_connection_create_end.append(_on_connect_end)
+    return [trace_config]
+
+
+def _client_session() -> aiohttp.ClientSession:
+    timeout = aiohttp.ClientTimeout(total=settings.POKEAPI_TIMEOUT, connect=settings.POKEAPI_CONNECT_TIMEOUT)
+    return aiohttp.ClientSession(timeout=timeout, trace_configs=_trace_configs())
+
+
+@dataclass
+class _SharedSession:
+    session: aiohttp.ClientSession
+    users: int = 0
+
+
+# Sessions of the upstream requests in flight, by event loop, see `_shared_session`.
+_sessions: dict[asyncio.AbstractEventLoop, _SharedSession] = {}
+
+
+@contextlib.asynccontextmanager
+async def _shared_session() -> AsyncIterator[aiohttp.ClientSession]:
+    """Yields the client session of the upstream requests in flight in the running event loop.
+
+    The requests share the session, and with it a pool of kept-alive
+    connections.  No caller of :func:`_get_json` owns it, so that a caller
+    being cancelled, e.g. by an abandoned stream, doesn't fail the requests
+    it shares with others.  The session is closed once no request uses it,
+    as under WSGI each request runs in an event loop of its own.
+    """
+    loop = asyncio.get_running_loop()
+    shared = _sessions.get(loop)
+    if shared is None:
+        shared = _sessions[loop] = _SharedSession(_client_session())
+
+    shared.users += 1
+    try:
+        yield shared.session
+    finally:
+        shared.users -= 1
+        if not shared.users:
+            del _sessions[loop]
+            await shared.session.close()
+
+
+def _decode(body: bytes, resource: str) -> Any:
+    with DECODE_SECONDS.time(resource=resource):
+        return json.loads(body)
+
+
+async def _fetch(url: str, params: dict[str, Any] | None, key: str, resource: str) -> Any:
+    """Retrieves the JSON document at `url`, from the mirror or upstream, see :func:`_get_json`."""
+    with REQUEST_SECONDS.time(resource=resource) as labels:
+        mirror = get_mirror()
+        entry = await asyncio.to_thread(mirror.get, key) if mirror else None
+
+        if entry is not None and entry.age < settings.POKEAPI_MIRROR_MAX_AGE:
+            labels['outcome'] = 'mirrored'
+            return _decode(entry.body, resource)
+
+        circuit = get_circuit(resource)
+        if not circuit.allow_request():
+            if entry is None:
+                raise CircuitOpenError(resource, circuit.retry_after)
+            labels['outcome'] = 'stale'
+            return _decode(entry.body, resource)
+
+        headers = entry.conditional_headers() if entry else None
+        try:
+            async with _shared_session() as session, session.get(url, params=params, headers=headers) as resp:
+                resp.raise_for_status()
+                body = await resp.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            circuit.record_error(exc)
+            if entry is None or not is_failure(exc):
+                raise
+            logger.warning(
+                'Using the stale response of %s, as the Poke API failed: %s: %s', key, type(exc).__name__, exc
+            )
+            labels['outcome'] = 'stale'
+            return _decode(entry.body, resource)
+        except BaseException:
+            # E.g. cancelled as the event loop of a request ends, which doesn't count against the circuit.
+            circuit.release()
+            raise
+        circuit.record_success()
+
+        if resp.status == 304 and mirror and entry:
+            labels['outcome'] = 'not_modified'
+            await asyncio.to_thread(mirror.touch, key)
+            return _decode(entry.body, resource)
+
+        labels['outcome'] = 'fetched'
+        if mirror:
+            etag, last_modified = resp.headers.get('ETag'), resp.headers.get('Last-Modified')
+            await asyncio.to_thread(functools.partial(mirror.put, key, body, etag=etag, last_modified=last_modified))
+
+        return _decode(body, resource)
+
+
+async def _get_json(url: str, params: dict[str, Any] | None = None) -> Any:
+    """Retrieves the JSON document at `url`.
+
+    Responses are kept in the persistent mirror, see :func:`get_mirror`.
+    Mirrored responses younger than ``settings.POKEAPI_MIRROR_MAX_AGE`` are
+    returned without any request, older ones are revalidated with a
+    conditional request.
+
+    Concurrent requests for the same URL and parameters share a single
+    upstream request, sent with the session of :func:`_shared_session`.
+
+    Requests to each endpoint go through its circuit breaker, see
+    :func:`~apps.poke.utils.circuit.get_circuit`.  While the circuit is
+    open, or when the request fails, the last mirrored response is returned
+    however old it is.
+
+    Raises:
+        aiohttp.ClientResponseError: If the response status is an error.
+        CircuitOpenError: If the circuit is open and nothing is mirrored.
+    """
+    key = f'{url}?{urlencode(sorted(params.items()))}' if params else url
+    resource = url.removeprefix(POKEMON_API).split('/', 1)[0]
+
+    return await _flight.do(key, functools.partial(_fetch, url, params, key, resource))
+
 
 async def retrieve_pokemon_list(*, limit: int = -1, offset: int = 0) -> PokemonList:
     """Retrieves a list of Pokemon from the Poke API.
@@ -26,9 +226,7 @@ async def retrieve_pokemon_list(*, limit: int = -1, offset: int = 0) -> PokemonL
     """
     params = {'limit': limit, 'offset': offset}
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(POKEMON_ENDPOINT, params=params) as resp:
-            return await resp.json()
+    return await _get_json(POKEMON_ENDPOINT, params=params)
 
 
 async def retrieve_berries(*, limit: int = -1, offset: int = 0) -> PokemonList:
@@ -41,71 +239,124 @@ async def retrieve_berries(*, limit: int = -1, offset: int = 0) -> PokemonList:
     """
     params = {'limit': limit, 'offset': offset}
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(BERRY_ENDPOINT, params=params) as resp:
-            return await resp.json()
+    return await _get_json(BERRY_ENDPOINT, params=params)
 
 
 async def retrieve_pokemon(pokemon: str | int) -> Pokemon:
     """Retrieves information about a specific Pokemon from the Poke API."""
-    async with aiohttp.ClientSession() as session:
-        return await _retrieve_pokemon(session, pokemon)
+    return await _get_json(f'{POKEMON_ENDPOINT}{pokemon}')
 
 
-async def _retrieve_pokemon(session: aiohttp.ClientSession, pokemon: str | int) -> Pokemon:
-    """Retrieves Pokemon information from the Poke API.
+async def _retrieve_berry(berry: str | int) -> Berry:
+    """Retrieves berry information from the Poke API."""
+    return await _get_json(f'{BERRY_ENDPOINT}{berry}')
 
-    Used for fetching multiple Pokemon concurrently.
-    """
-    async with session.get(f'{POKEMON_ENDPOINT}{pokemon}') as resp:
-        return await resp.json()
 
+async def _retrieve_item(item: str | int) -> Item:
+    """Retrieves item information from the Poke API."""
+    return await _get_json(f'{ITEM_ENDPOINT}{item}')
 
-async def _retrieve_berry(session: aiohttp.ClientSession, berry: str | int) -> Berry:
-    """Retrieves berry information from the Poke API.
+
+async def _retrieve_berry_item(berry: str | int) -> BerryItem:
+    """Retrieves detailed berry and associated item info from the Poke API.
 
     Used for fetching multiple berries concurrently.
     """
-    async with session.get(f'{BERRY_ENDPOINT}{berry}') as resp:
-        return await resp.json()
+    berry_data = await _retrieve_berry(berry)
+    item_data = await _retrieve_item(berry_data['item']['name'])
 
+    return {
+        'berry': berry_data,
+        'item': item_data,
+    }
 
-async def _retrieve_item(session: aiohttp.ClientSession, item: str | int) -> Item:
-    """Retrieves item information from the Poke API.
 
-    Used for fetching multiple items concurrently.
+def _log_fetch_result(resource: str, result: FetchResult) -> None:
+    progress = result.progress
+    logger.info(
+        'Fetched %d/%d %s in %.2fs (%d failed, %d retries).',
+        progress.succeeded,
+        progress.total,
+        resource,
+        progress.elapsed,
+        progress.failed,
+        progress.retries,
+    )
+
+
+async def retrieve_multiple_pokemon(
+    pokemon: Sequence[str | int],
+    *,
+    on_result: Callable[[str | int, Pokemon | BaseException], None] | None = None,
+) -> FetchResult[str | int, Pokemon]:
+    """Retrieves detailed information about multiple Pokemon from the Poke API.
+
+    At most ``settings.POKEAPI_FETCH_CONCURRENCY`` requests are in flight at
+    a time.  Pokemon which could not be retrieved are reported in the
+    failures of the result.  `on_result` is called as each Pokemon is
+    retrieved, see :func:`apps.poke.utils.fetch.fetch_all`.
     """
-    async with session.get(f'{ITEM_ENDPOINT}{item}') as resp:
-        return await resp.json()
+    assert pokemon, 'The Pokemon list must not empty.'
 
+    result = await fetch_all(
+        pokemon,
+        retrieve_pokemon,
+        concurrency=settings.POKEAPI_FETCH_CONCURRENCY,
+        retries=settings.POKEAPI_FETCH_RETRIES,
+        on_result=on_result,
+    )
+
+    _log_fetch_result('Pokemon', result)
+    return result
 
-async def _retrieve_berry_item(session: aiohttp.ClientSession, berry: str | int) -> BerryItem:
-    """Retrieves detailed berry and associated item info from the Poke API.
 
-    Used for fetching multiple berries concurrently. Session must be provided.
+async def retrieve_berry_items(berries: Sequence[str | int]) -> FetchResult[str | int, BerryItem]:
+    """Retrieves detailed info of multiple berries and associated items from the Poke API.
+
+    At most ``settings.POKEAPI_FETCH_CONCURRENCY`` berries are retrieved at a
+    time.  Berries which could not be retrieved are reported in the failures
+    of the result.
     """
-    berry_data = await _retrieve_berry(session=session, berry=berry)
-    item_data = await _retrieve_item(session=session, item=berry_data['item']['name'])
+    assert berries, 'The berries list must not empty.'
 
-    return {
-        'berry': berry_data,
-        'item': item_data,
-    }
+    result = await fetch_all(
+        berries,
+        _retrieve_berry_item,
+        concurrency=settings.POKEAPI_FETCH_CONCURRENCY,
+        retries=settings.POKEAPI_FETCH_RETRIES,
+    )
 
+    _log_fetch_result('berries', result)
+    return result
 
-async def retrieve_multiple_pokemon(pokemon: Sequence[str | int]) -> list[Pokemon]:
-    """Retrieves detailed information about multiple Pokemon from the Poke API."""
-    assert pokemon, 'The Pokemon list must not empty.'
 
-    async with aiohttp.ClientSession() as session:
-        coroutines = [_retrieve_pokemon(session, p) for p in pokemon]
-        return await asyncio.gather(*coroutines)
+def resource_id_from_url(url: str) -> int:
+    """Extracts the ID of a resource, e.g. a Pokemon, from its Poke API URL."""
+    return int(url.rstrip('/').rsplit('/', 1)[-1])
 
 
-async def retrieve_berry_items(berries: Sequence[str | int]) -> list[BerryItem]:
-    """Retrieves detailed info of multiple berries and associated items from the Poke API."""
-    assert berries, 'The berries list must not empty.'
+def summarize_pokemon(pokemon: Pokemon) -> PokemonSummary:
+    """Projects Pokemon information to the fields displayed by the templates."""
+    try:
+        sprite = pokemon['sprites']['other']['official-artwork']['front_default'] or ''
+    except (KeyError, TypeError):
+        sprite = ''
+
+    return PokemonSummary(
+        id=pokemon['id'],
+        name=pokemon['name'],
+        sprite=sprite,
+        abilities=[{'ability': ability['ability']} for ability in pokemon['abilities']],
+        stats=[{**stat, 'percentage': stat_percentage(stat['base_stat'])} for stat in pokemon['stats']],
+        types=pokemon['types'],
+    )
+
+
+def summarize_berry_item(berry_item: BerryItem) -> BerryItemSummary:
+    """Adds the URL of the item sprite to a berry and its item."""
+    try:
+        sprite = berry_item['item']['sprites']['default'] or ''
+    except (KeyError, TypeError):
+        sprite = ''
 
-    async with aiohttp.ClientSession() as session:
-        coroutines = [_retrieve_berry_item(session, p) for p in berries]
-        return await asyncio.gather(*coroutines)
+    return {**berry_item, 'sprite': sprite}
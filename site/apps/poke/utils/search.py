@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Sequence
+
+# Minimum trigram similarity of a name to a misspelled query, as in PostgreSQL's pg_trgm.
+SIMILARITY_THRESHOLD = 0.3
+
+
+def _ngrams(text: str, n: int) -> set[str]:
+    return {text[i:][:n] for i in range(len(text) - n + 1)}
+
+
+def _padded_trigrams(text: str) -> set[str]:
+    """Trigrams of `text` padded with spaces, weighting its start and end."""
+    return _ngrams(f'  {text} ', 3)
+
+
+class NameIndex:
+    """Search index over a fixed list of names.
+
+    Built once, then answers prefix, substring and typo-tolerant queries
+    without scanning every name:
+
+    - a sorted array of the names finds prefix matches by bisection;
+    - an index of the 1-, 2- and 3-grams of the names narrows substring
+      matches down to the names containing all n-grams of the query;
+    - an index of padded trigrams finds names similar to a misspelled
+      query when nothing contains it.
+
+    Results are returned as positions in the original list, and the
+    results of the most recent queries are cached.
+    """
+
+    def __init__(self, names: Sequence[str], *, max_cached_queries: int = 256) -> None:
+        self.names = [name.lower() for name in names]
+        self.max_cached_queries = max_cached_queries
+
+        self._sorted = sorted((name, position) for position, name in enumerate(self.names))
+        self._sorted_names = [name for name, _ in self._sorted]
+
+        self._ngrams: defaultdict[str, list[int]] = defaultdict(list)
+        self._trigrams: defaultdict[str, list[int]] = defaultdict(list)
+        self._trigram_counts: list[int] = []
+        for position, name in enumerate(self.names):
+            for ngram in set().union(*(_ngrams(name, n) for n in (1, 2, 3))):
+                self._ngrams[ngram].append(position)
+
+            trigrams = _padded_trigrams(name)
+            for trigram in trigrams:
+                self._trigrams[trigram].append(position)
+            self._trigram_counts.append(len(trigrams))
+
+        self._results: OrderedDict[str, tuple[int, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def search(self, query: str) -> tuple[int, ...]:
+        """Returns the positions of the names matching `query`.
+
+        Names starting with the query come first, then names containing it,
+        each in their original order.  If no name contains the query, names
+        similar to it are returned instead, the most similar first.
+        """
+        query = query.strip().lower()
+        if not query:
+            return tuple(range(len(self.names)))
+
+        with self._lock:
+            if query in self._results:
+                self._results.move_to_end(query)
+                return self._results[query]
+
+        positions = self._substring_matches(query) or self._similar_matches(query)
+
+        with self._lock:
+            self._results[query] = positions
+            if len(self._results) > self.max_cached_queries:
+                self._results.popitem(last=False)
+
+        return positions
+
+    def _prefix_matches(self, query: str) -> list[int]:
+        start = bisect.bisect_left(self._sorted_names, query)
+        end = bisect.bisect_right(self._sorted_names, query + '\uffff', lo=start)
+        return sorted(position for _, position in self._sorted[start:end])
+
+    def _substring_matches(self, query: str) -> tuple[int, ...]:
+        postings = sorted((self._ngrams.get(ngram, []) for ngram in _ngrams(query, min(len(query), 3))), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        matches = [position for position in sorted(candidates) if query in self.names[position]]
+
+        prefix_matches = self._prefix_matches(query)
+        starting = set(prefix_matches)
+        return (*prefix_matches, *(position for position in matches if position not in starting))
+
+    def _similar_matches(self, query: str) -> tuple[int, ...]:
+        trigrams = _padded_trigrams(query)
+        shared = Counter(position for trigram in trigrams for position in self._trigrams.get(trigram, []))
+
+        scored = []
+        for position, count in shared.items():
+            similarity = count / (len(trigrams) + self._trigram_counts[position] - count)
+            if similarity >= SIMILARITY_THRESHOLD:
+                scored.append((-similarity, position))
+
+        return tuple(position for _, position in sorted(scored))
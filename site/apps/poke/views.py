@@ -1,46 +1,133 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import math
+from collections.abc import AsyncIterator
 from typing import TYPE_CHECKING
 
 import aiohttp
-from asgiref.sync import async_to_sync
-
-from django.core.cache import cache
-from django.http import HttpResponse, HttpResponseNotFound
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from django.views.decorators.vary import vary_on_headers
-from django.views.generic import ListView, TemplateView
-
-from apps.poke.cache import cache_page_without_q_param
-from apps.poke.utils.requests import (
-    retrieve_berries,
-    retrieve_berry_items,
-    retrieve_multiple_pokemon,
-    retrieve_pokemon,
-    retrieve_pokemon_list,
+from asgiref.sync import sync_to_async
+from PIL import Image, UnidentifiedImageError
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import caches
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import InvalidPage
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseNotFound,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
 )
+from django.template.loader import get_template, render_to_string
+from django.utils.cache import (
+    add_never_cache_headers,
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.crypto import constant_time_compare
+from django.utils.http import http_date, quote_etag
+from django.utils.safestring import mark_safe
+from django.views.generic import TemplateView
+
+from apps.poke.berries import aget_berry_items
+from apps.poke.cache import cache_page, cache_page_without_q_param
+from apps.poke.fragments import arender_pokemon_cards, template_version
+from apps.poke.models import Pokemon
+from apps.poke.pokedex import (
+    AsyncPaginator,
+    DatabasePokemonList,
+    LazyPokemonList,
+    PokemonDetail,
+    aget_pokemon_detail,
+    aget_pokemon_list,
+    aget_pokemon_search,
+    pokemon_etag,
+)
+from apps.poke.sprites import (
+    SIZES,
+    SPRITE_PATH,
+    SpriteNotFound,
+    aget_thumbnail,
+    source_url,
+)
+from apps.poke.utils.circuit import CircuitOpenError
+from apps.poke.utils.metrics import REGISTRY
 
 if TYPE_CHECKING:
-    from apps.poke._types import BerryItem, HtmxHttpRequest, Pokemon
+    from django.http import HttpRequest
+
+    from apps.poke._types import HtmxHttpRequest, PokemonSummary
 
 logger = logging.getLogger(__name__)
 
+# Seconds after which clients may retry when the Poke API failed.
+POKEAPI_RETRY_AFTER = 10
+# Seconds browsers keep thumbnails of sprites, which never change.
+SPRITE_MAX_AGE = 60 * 60 * 24 * 365
+# Rendered in place of the cards of a streamed Pokédex page, where the page is split.
+POKEMON_LIST_PLACEHOLDER = mark_safe('<!-- pokemon-list -->')
 
-@method_decorator(cache_page_without_q_param(60 * 5), name='dispatch')
-@method_decorator(vary_on_headers('HX-Request'), name='dispatch')
-class PokedexView(ListView):
+
+class PokedexView(TemplateView):
     """View class for displaying the Pokédex.
 
     This view class utilizes HTMX for paginating(infinite-scroll) and caching
-    for improved performance.
+    for improved performance.  It is asynchronous end to end, so a worker is
+    not blocked while the Pokémon of a page are retrieved.
+
+    When Pokémon of the page are not cached yet, the page is streamed: the
+    page shell is sent right away, then the card of each Pokémon as soon as
+    it and those before it are retrieved, see :meth:`stream`.
     """
 
     paginate_by = 40
+    page_kwarg = 'page'
     context_object_name = 'pokemon_list'
     request: HtmxHttpRequest  # pyright: ignore[reportIncompatibleVariableOverride]
 
+    async def get(  # pyright: ignore pylint: disable=invalid-overridden-method
+        self,
+        request: HtmxHttpRequest,
+        *args,
+        **kwargs,
+    ) -> HttpResponse:
+        paginator = AsyncPaginator(await self.get_queryset(), self.paginate_by)
+        number, bounds = await self.page_bounds(paginator)
+        object_list = paginator.object_list
+
+        # Only Pokémon retrieved from the Poke API are worth streaming.
+        summaries = None
+        if isinstance(object_list, LazyPokemonList) and self.can_stream():
+            summaries = await object_list.acached_slice(bounds)
+            if summaries is None:
+                return await self.stream(paginator, number, object_list.aiter_slice(bounds), **kwargs)
+
+        if summaries is None:
+            summaries = await object_list.aslice(bounds)
+        page = paginator.page_of(summaries, number)
+
+        context = self.get_context_data(
+            paginator=paginator,
+            page_obj=page,
+            is_paginated=page.has_other_pages(),
+            pokemon_cards=await arender_pokemon_cards(page.object_list),
+            **{self.context_object_name: page.object_list},
+            **kwargs,
+        )
+
+        response = self.render_to_response(context)
+        patch_vary_headers(response, ('HX-Request',))
+        # A page missing Pokémon which could not be retrieved is cached neither by `cache_page` nor by browsers.
+        if len(summaries) < bounds.stop - bounds.start:
+            add_never_cache_headers(response)
+        return response
+
     def get_template_names(self) -> list[str]:
         """Returns the appropriate template name based on the request.
 
@@ -52,52 +139,118 @@ class PokedexView(ListView):
             return ['pokedex.html#pokemon-list']
         return ['pokedex.html']
 
-    def get_queryset(self) -> list[Pokemon]:
+    async def get_queryset(self) -> LazyPokemonList | DatabasePokemonList:
         """Returns list of Pokémon for displaying the Pokémon.
 
-        If the list is not present in the cache, retrieves it and caches the
-        result.
+        With the "database" data source, the Pokémon of the requested page are
+        queried from the database.  Otherwise, the list of Pokémon names is
+        cached as a whole, while details are retrieved and cached only for the
+        Pokémon on the requested page.  Searches go through an index over the
+        names, built once per version of the list.
         """
-        pokemon_info_list = cache.get('pokemon_info_list')
+        query = self.request.GET.get("q")
 
-        if pokemon_info_list is None:
-            pokemon_info_list = async_to_sync(self.retrieve_pokemon_info_list)()
-            cache.set('pokemon_info_list', pokemon_info_list, timeout=60 * 60)
+        if settings.POKE_DATA_SOURCE == 'database':
+            queryset = Pokemon.objects.all()
+            if query:
+                queryset = queryset.filter(name__icontains=query)
+            return DatabasePokemonList(queryset)
 
-        query = self.request.GET.get("q")
         if query:
-            pokemon_info_list = self.filter_pokemon_by_name(pokemon_info_list, query)
+            return LazyPokemonList((await aget_pokemon_search()).search(query))
 
-        return pokemon_info_list
+        return LazyPokemonList(await aget_pokemon_list())
 
-    def filter_pokemon_by_name(self, pokemon_info_list: list[Pokemon], query: str) -> list[Pokemon]:
-        query = query.lower()
-        return [pokemon_info for pokemon_info in pokemon_info_list if query in pokemon_info['name'].lower()]
+    async def page_bounds(self, paginator: AsyncPaginator) -> tuple[int, slice]:
+        """Returns the requested page number and the slice of its Pokémon, like ``ListView.paginate_queryset()``."""
+        page_number = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg) or 1
+        if page_number == 'last':
+            await paginator.acount()
+            page_number = paginator.num_pages
+
+        try:
+            return await paginator.abounds(page_number)
+        except InvalidPage as exc:
+            raise Http404(f'Invalid page ({page_number}): {exc}') from exc
 
-    async def retrieve_pokemon_info_list(self) -> list[Pokemon]:
-        """Asynchronously retrieves the list of Pokémon information.
+    def can_stream(self) -> bool:
+        """Whether the page may be streamed, which only an ASGI server sends as it is produced."""
+        return settings.POKE_STREAM_POKEDEX and isinstance(self.request, ASGIRequest)
 
-        Uses the :func:`retrieve_pokemon_list` function to get the list of
-        Pokémon names, then fetches details for multiple Pokémon concurrently.
+    async def stream(
+        self,
+        paginator: AsyncPaginator,
+        number: int,
+        summaries: AsyncIterator[PokemonSummary],
+        **kwargs,
+    ) -> StreamingHttpResponse:
+        """Returns the page streaming the cards of `summaries` as they are retrieved.
+
+        The page is rendered without its cards and sent up to where they go,
+        so the browser renders the shell and fetches its assets meanwhile.
+        The HTMX partial has no shell, but its first bytes still go out
+        early.  Streamed responses are not cached by ``cache_page``, while
+        the summaries retrieved are, so the next request for the page is
+        rendered and cached as a whole.
         """
-        pokemon_list = await retrieve_pokemon_list()
-        return await retrieve_multiple_pokemon([pokemon['name'] for pokemon in pokemon_list['results']])
+        page = paginator.page_of([], number)
+
+        head, tail = '', ''
+        if not self.request.htmx:
+            context = self.get_context_data(
+                paginator=paginator,
+                page_obj=page,
+                is_paginated=page.has_other_pages(),
+                pokemon_list_placeholder=POKEMON_LIST_PLACEHOLDER,
+                **kwargs,
+            )
+            # Rendered in a thread, like template responses, as context processors may query the database.
+            shell = await sync_to_async(render_to_string)('pokedex.html', context, self.request)
+            head, tail = shell.split(POKEMON_LIST_PLACEHOLDER, 1)
+
+        item = get_template('pokedex.html#pokemon-list-item')
+
+        async def render(summary: PokemonSummary, *, is_last: bool) -> str:
+            (pokemon_card,) = await arender_pokemon_cards([summary])
+            return item.render(
+                {'pokemon_card': pokemon_card, 'is_last': is_last, 'page_obj': page, 'request': self.request}
+            )
+
+        async def content() -> AsyncIterator[str]:
+            yield head
+            # Each card is sent once the next one is retrieved, as the last card loads the next page.
+            previous = None
+            async for summary in summaries:
+                if previous is not None:
+                    yield await render(previous, is_last=False)
+                previous = summary
+            if previous is not None:
+                yield await render(previous, is_last=True)
+            yield tail
+
+        response = StreamingHttpResponse(content(), content_type='text/html; charset=utf-8')
+        patch_vary_headers(response, ('HX-Request',))
+        return response
 
 
 class PokemonView(TemplateView):
     """View class for displaying information about a specific Pokémon.
 
     Note:
-        Caching individual Pokémon views may not be worthwhile due to the
-        likelihood of frequent updates. Pokémon information is subject to
-        change more frequently, and these views typically contain less data,
-        making it faster to generate response.
+        Pokémon information changes rarely, so the details are cached per
+        Pokémon, sharing the summaries already cached by the Pokédex.
 
-        It is more suitable to manage caching strategies at the list level,
-        especially when dealing with more extensive datasets like a Pokédex.
+        Responses carry an ETag (and a Last-Modified date for the Poke API
+        data source) and must be revalidated, so reopening the modal of a
+        Pokémon costs a 304 response without rendering.
+
+        While the Poke API fails, a Pokémon neither cached nor mirrored gets
+        a 503 response right away, with a Retry-After header.
     """
 
     template_name = 'pokemon.html'
+    # Templates rendering the details, whose changes change the responses as much as the details do.
+    rendering_templates = ('pokemon.html', 'components/pokemon_modal.html')
     request: HtmxHttpRequest  # pyright: ignore[reportIncompatibleVariableOverride]
 
     # The warnings are intentionally ignored for compatibility with Django >= 4.2 (async) and to handle URL parameters
@@ -110,15 +263,49 @@ class PokemonView(TemplateView):
     ) -> HttpResponse:
         context = self.get_context_data(**kwargs)
 
-        try:
-            context['pokemon'] = await retrieve_pokemon(pokemon_id)
-        except aiohttp.ContentTypeError:
-            return HttpResponseNotFound()
-
-        return self.render_to_response(context)
+        if settings.POKE_DATA_SOURCE == 'database':
+            queryset = Pokemon.objects.prefetch_related('type_slots__type', 'stats__stat')
+            try:
+                summary = (await queryset.aget(pk=pokemon_id)).to_summary()
+            except Pokemon.DoesNotExist:
+                return HttpResponseNotFound()
+            detail = PokemonDetail(summary, etag=pokemon_etag(summary))
+        else:
+            try:
+                detail = await aget_pokemon_detail(pokemon_id)
+            except aiohttp.ClientResponseError as exc:
+                if exc.status == 404:
+                    return HttpResponseNotFound()
+                return self.unavailable(exc)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                return self.unavailable(exc)
+
+        etag = quote_etag(self.get_etag(detail))
+        last_modified = int(detail.last_modified) if detail.last_modified is not None else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            context['pokemon'] = detail.summary
+            response = self.render_to_response(context)
+
+        response.headers['ETag'] = etag
+        if last_modified is not None:
+            response.headers['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    def get_etag(self, detail: PokemonDetail) -> str:
+        """Returns the entity tag of the response, changing with the details and with the templates rendering them."""
+        return '-'.join([detail.etag, *(template_version(name) for name in self.rendering_templates)])
+
+    @staticmethod
+    def unavailable(exc: BaseException) -> HttpResponse:
+        """Returns a 503 response, when the Poke API fails and nothing is cached."""
+        logger.warning('Failed to retrieve a Pokémon: %r', exc)
+        retry_after = exc.retry_after if isinstance(exc, CircuitOpenError) else POKEAPI_RETRY_AFTER
+        return HttpResponse(status=503, headers={'Retry-After': str(math.ceil(retry_after))})
 
 
-@method_decorator(cache_page(60 * 5), name='dispatch')
 class BerriesView(TemplateView):
     """View class for displaying Berries.
 
@@ -129,7 +316,7 @@ class BerriesView(TemplateView):
     template_name = 'berries.html'
     request: HtmxHttpRequest  # pyright: ignore[reportIncompatibleVariableOverride]
 
-    def get(  # pyright: ignore[reportIncompatibleMethodOverride]
+    async def get(  # pyright: ignore pylint: disable=invalid-overridden-method
         self,
         request: HtmxHttpRequest,
         *args,
@@ -137,26 +324,79 @@ class BerriesView(TemplateView):
     ) -> HttpResponse:
         context = self.get_context_data(**kwargs)
 
-        berry_items_info: list[BerryItem] | None = cache.get('berry_items_info')
+        context['berry_items_info'] = await aget_berry_items()
 
-        if berry_items_info is None:
-            berry_items_info = async_to_sync(self.retrieve_berry_items_info)()
-            cache.set('berry_items_info', berry_items_info, timeout=60 * 60)
+        return self.render_to_response(context)
 
-        context['berry_items_info'] = berry_items_info
 
-        return self.render_to_response(context)
+async def sprite_view(request: HttpRequest, size: str, sprite: str) -> HttpResponse:
+    """Returns the thumbnail of a sprite, see `apps.poke.sprites`.
 
-    async def retrieve_berry_items_info(self) -> list[BerryItem]:
-        """Asynchronously retrieves the list of Berries information.
+    Thumbnails are cached by browsers for a year without revalidation.  When
+    the sprite doesn't exist, responds with a 404, and when it can't be
+    downloaded otherwise, redirects to the sprite itself.
+    """
+    if size not in SIZES or not SPRITE_PATH.fullmatch(sprite):
+        raise Http404(f'No thumbnail of {sprite} in size {size}.')
+
+    try:
+        thumbnail = await aget_thumbnail(size, sprite)
+    except SpriteNotFound as exc:
+        raise Http404(f'No sprite {sprite}.') from exc
+    except (
+        aiohttp.ClientError,
+        asyncio.TimeoutError,
+        OSError,
+        UnidentifiedImageError,
+        Image.DecompressionBombError,
+    ) as exc:
+        logger.warning('Failed to create the thumbnails of %s: %s: %s', sprite, type(exc).__name__, exc)
+        return HttpResponseRedirect(source_url(sprite))
+
+    response = HttpResponse(thumbnail, content_type='image/webp')
+    patch_cache_control(response, public=True, max_age=SPRITE_MAX_AGE, immutable=True)
+    return response
+
+
+@staff_member_required
+def cache_stats_view(request: HttpRequest) -> JsonResponse:
+    """Returns the size and hit rate of the default cache.
+
+    Hits and misses are counted by the worker serving the request, while the
+    size is the one of the whole cache when the backend is shared.
+    """
+    backend = caches['default']
+    if not hasattr(backend, 'get_stats'):
+        return JsonResponse({'backend': type(backend).__name__})
+    return JsonResponse(backend.get_stats())
 
-        Uses the :func:`retrieve_berries` function to get the list of
-        Berry names, then fetches details for multiple Berries concurrently.
-        """
-        berries = await retrieve_berries()
-        return await retrieve_berry_items([berry['name'] for berry in berries['results']])
+
+def _has_metrics_token(request: HttpRequest) -> bool:
+    """Whether the request is authorized by the bearer token ``settings.POKE_METRICS_TOKEN``."""
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    return (
+        bool(settings.POKE_METRICS_TOKEN)
+        and scheme.lower() == 'bearer'
+        and constant_time_compare(token, settings.POKE_METRICS_TOKEN)
+    )
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Returns the latency histograms of the worker serving the request, for Prometheus.
+
+    Like the cache stats, they are restricted to staff users, or to the
+    scrapes authorized by the bearer token ``settings.POKE_METRICS_TOKEN``.
+    """
+    if not REGISTRY.enabled:
+        raise Http404('Metrics are disabled.')
+    if not (_has_metrics_token(request) or (request.user.is_active and request.user.is_staff)):
+        response = HttpResponse('Authentication required.', status=401, content_type='text/plain')
+        response['WWW-Authenticate'] = 'Bearer realm="metrics"'
+        return response
+    return HttpResponse(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 
-pokedex_view = PokedexView.as_view()
+# Django 4.2 can't decorate the `dispatch` of async views, so the views themselves are decorated.
+pokedex_view = cache_page_without_q_param(60 * 5)(PokedexView.as_view())
 pokemon_view = PokemonView.as_view()
-berries_view = BerriesView.as_view()
+berries_view = cache_page(60 * 5)(BerriesView.as_view())
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.poke.berries import get_berry_items
+from apps.poke.pokedex import (
+    POKEMON_SUMMARY_TIMEOUT,
+    get_pokemon_list,
+    get_pokemon_search,
+    get_pokemon_summaries,
+)
+
+if TYPE_CHECKING:
+    from apps.poke._types import PokemonBase
+
+logger = logging.getLogger(__name__)
+
+
+def pokemon_due_for_refresh(
+    pokemon_list: Sequence[PokemonBase],
+    interval: float,
+    *,
+    now: float | None = None,
+) -> list[PokemonBase]:
+    """Returns the Pokémon whose summaries are refreshed in the current interval.
+
+    The Pokémon are split into as many batches as there are intervals in a
+    third of ``POKEMON_SUMMARY_TIMEOUT``, and the batches are refreshed in
+    turn, one per interval.  Summaries are therefore refreshed a few at a
+    time, well ahead of their expiry, rather than all expiring together.
+    """
+    batches = max(int(POKEMON_SUMMARY_TIMEOUT / 3 // interval), 1)
+    batch = int((time.time() if now is None else now) // interval) % batches
+    return [pokemon for position, pokemon in enumerate(pokemon_list) if position % batches == batch]
+
+
+def warm_caches(*, refresh: bool = False, refresh_interval: float = 0) -> None:
+    """Populates the Pokédex and berries caches, and builds the Pokédex search index.
+
+    Args:
+        refresh: Retrieve the Pokémon list and berries even if they are
+            cached, ahead of their expiry.
+        refresh_interval: Seconds between the refreshes of the caches by the
+            warmer.  Each refresh also retrieves a batch of cached Pokémon
+            summaries ahead of their expiry, see :func:`pokemon_due_for_refresh`.
+            Otherwise, summaries are only retrieved when missing.
+    """
+    pokemon_list = get_pokemon_list(refresh=refresh)
+    refreshed = []
+    if refresh_interval:
+        refreshed = get_pokemon_summaries(pokemon_due_for_refresh(pokemon_list, refresh_interval), refresh=True)
+    summaries = get_pokemon_summaries(pokemon_list)
+    berry_items = get_berry_items(refresh=refresh)
+    get_pokemon_search()
+
+    logger.info(
+        'Warmed caches with %d/%d Pokémon (%d refreshed) and %d berries.',
+        len(summaries),
+        len(pokemon_list),
+        len(refreshed),
+        len(berry_items),
+    )
+
+
+class CacheWarmer(threading.Thread):
+    """Daemon thread refreshing the caches every `interval` seconds.
+
+    When several workers run a warmer, a cache lock lets only one of them
+    refresh the caches per interval.
+    """
+
+    lock_key = 'cache_warmer:lock'
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(name='cache-warmer', daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            if cache.add(self.lock_key, True, timeout=self.interval):
+                try:
+                    warm_caches(refresh=True, refresh_interval=self.interval)
+                except Exception:  # pylint: disable=broad-exception-caught
+                    logger.exception('Failed to warm caches.')
+
+            self.stopped.wait(self.interval)
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+
+_warmer: CacheWarmer | None = None
+
+
+def start_cache_warmer() -> None:
+    """Starts the cache warmer if ``settings.POKE_CACHE_WARMER_INTERVAL`` is set."""
+    global _warmer  # pylint: disable=global-statement
+
+    if not settings.POKE_CACHE_WARMER_INTERVAL or _warmer is not None:
+        return
+
+    _warmer = CacheWarmer(settings.POKE_CACHE_WARMER_INTERVAL)
+    _warmer.start()
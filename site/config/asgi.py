@@ -0,0 +1,12 @@
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+application = get_asgi_application()
+
+# Imported once the app registry is ready.
+from apps.poke.warming import start_cache_warmer  # isort: skip pylint: disable=wrong-import-position
+
+start_cache_warmer()
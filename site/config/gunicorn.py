@@ -0,0 +1,28 @@
+"""Gunicorn configuration of the production server, see `compose/django/start`.
+
+https://docs.gunicorn.org/en/stable/settings.html
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# The views are asynchronous, so each Uvicorn worker serves many concurrent
+# requests and one worker per core is enough to use all of them.
+worker_class = 'uvicorn.workers.UvicornWorker'
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+
+# Seconds an idle keep-alive connection is held open, e.g. by a reverse proxy.
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+# Seconds before a silent worker is killed and restarted.
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+# Seconds workers get to finish their requests on restart and shutdown.  A
+# SIGHUP to the master process replaces the workers gracefully, e.g. on deploy.
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+# Workers are replaced after a jittered number of requests, which bounds any
+# memory growth without restarting all of them at once.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+accesslog = '-'
@@ -13,14 +13,22 @@ SECRET_KEY = env(
     default='django-insecure-swzgd!_gv!7_c3ly94z(#f95^++w^qs)!m_l*+$prhmab^xqu*',  # pyright: ignore
 )
 
-# SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# "local" for the development server, or "production" for the multi-worker
+# server started by `compose/django/start`.
+DJANGO_ENVIRONMENT = env('DJANGO_ENVIRONMENT', default='local')
+PRODUCTION = DJANGO_ENVIRONMENT == 'production'
 
-ALLOWED_HOSTS = [
-    'localhost',
-    '0.0.0.0',
-    '127.0.0.1',
-]
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = env.bool('DJANGO_DEBUG', default=not PRODUCTION)
+
+ALLOWED_HOSTS = env.list(
+    'DJANGO_ALLOWED_HOSTS',
+    default=[
+        'localhost',
+        '0.0.0.0',
+        '127.0.0.1',
+    ],
+)
 
 # Application definition
 
@@ -37,9 +45,14 @@ DJANGO_APPS = [
 THIRD_PARTY_APPS = [
     'django_extensions',
     'django_htmx',
-    'template_partials',
+    # The partials loader is configured in TEMPLATES, see `apps.poke.template_loaders`.
+    'template_partials.apps.SimpleAppConfig',
     'slippers',
     'tailwind',
+]
+
+# Only installed by the development server.
+DEVELOPMENT_APPS = [
     'django_browser_reload',
 ]
 
@@ -50,6 +63,8 @@ LOCAL_APPS = [
 
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
+if not PRODUCTION:
+    INSTALLED_APPS += DEVELOPMENT_APPS
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
@@ -59,9 +74,20 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'django_browser_reload.middleware.BrowserReloadMiddleware',
     'django_htmx.middleware.HtmxMiddleware',
 ]
+if PRODUCTION:
+    # Serves the collected static files, as there is no development server to do it.
+    MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
+else:
+    MIDDLEWARE.append('django_browser_reload.middleware.BrowserReloadMiddleware')
+
+# Latency histograms served at /metrics/ for Prometheus, see `apps.poke.utils.metrics`.
+POKE_METRICS_ENABLED = env.bool('POKE_METRICS_ENABLED', default=False)
+# Bearer token a Prometheus server scrapes /metrics/ with.  Only staff users may read it when empty.
+POKE_METRICS_TOKEN = env('POKE_METRICS_TOKEN', default='')
+if POKE_METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'apps.poke.middleware.MetricsMiddleware')
 
 ROOT_URLCONF = 'config.urls'
 
@@ -69,7 +95,6 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [str(BASE_DIR / 'templates')],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -81,7 +106,17 @@ TEMPLATES = [
     },
 ]
 
+# Templates are compiled once and cached, except in debug mode where they are edited live.
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if not DEBUG:
+    TEMPLATE_LOADERS = [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]
+TEMPLATES[0]['OPTIONS']['loaders'] = [('apps.poke.template_loaders.Loader', TEMPLATE_LOADERS)]
+
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
@@ -89,8 +124,41 @@ DATABASES = {'default': env.db('DATABASE_URL')}
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# CACHES
+# ------------------------------------------------------------------------------
+# https://django-environ.readthedocs.io/en/latest/types.html#environ-env-cache-url
+# e.g. "filecache:///var/tmp/poke_cache" or "rediscache://redis:6379/1".  A
+# shared backend lets all workers use one warm copy of the cached data.
+CACHES = {
+    'default': env.cache(
+        'DJANGO_CACHE_URL',
+        default='filecache:///var/tmp/poke_cache' if PRODUCTION else 'locmemcache://',
+    ),
+}
+# Entries kept by the local-memory and file-based backends, which cull a third of them at random beyond it.  The
+# default covers the summary, details and card of every Pokémon, besides the lists and pages.
+if CACHES['default']['BACKEND'] in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.filebased.FileBasedCache',
+):
+    CACHES['default'].setdefault('OPTIONS', {})
+    CACHES['default']['OPTIONS'].setdefault('MAX_ENTRIES', env.int('DJANGO_CACHE_MAX_ENTRIES', default=10000))
+# The backends of `apps.poke.cache_backends` compress large values and count hits and misses.
+COMPRESSED_CACHE_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache': 'apps.poke.cache_backends.CompressedLocMemCache',
+    'django.core.cache.backends.filebased.FileBasedCache': 'apps.poke.cache_backends.CompressedFileBasedCache',
+    'django.core.cache.backends.redis.RedisCache': 'apps.poke.cache_backends.CompressedRedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache': 'apps.poke.cache_backends.CompressedPyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache': 'apps.poke.cache_backends.CompressedPyLibMCCache',
+}
+CACHES['default']['BACKEND'] = COMPRESSED_CACHE_BACKENDS.get(
+    CACHES['default']['BACKEND'],
+    CACHES['default']['BACKEND'],
+)
+CACHES['default']['COMPRESS_MIN_SIZE'] = env.int('DJANGO_CACHE_COMPRESS_MIN_SIZE', default=1024)
+
 # Password validation
-# https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
+# https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -109,7 +177,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 
 # Internationalization
-# https://docs.djangoproject.com/en/4.1/topics/i18n/
+# https://docs.djangoproject.com/en/4.2/topics/i18n/
 
 LANGUAGE_CODE = 'en-us'
 
@@ -122,6 +190,43 @@ USE_TZ = True
 # django-tailwind
 TAILWIND_APP_NAME = "apps.theme"
 
+# Poke API
+# ------------------------------------------------------------------------------
+# Where the views read Pokémon and berries from: "api" for the Poke API, or
+# "database" for the models populated by the `import_pokeapi` command.
+POKE_DATA_SOURCE = env('POKE_DATA_SOURCE', default='api')
+# Base URL of the Poke API, e.g. of the offline stand-in served by the `fake_pokeapi` command.
+POKEAPI_BASE_URL = env('POKEAPI_BASE_URL', default='https://pokeapi.co/api/v2/')
+# SQLite database persisting Poke API responses across restarts.  Disabled when empty.
+POKEAPI_MIRROR_PATH = env('POKEAPI_MIRROR_PATH', default=str(BASE_DIR / 'pokeapi_mirror.sqlite3'))
+# Seconds a mirrored response is used before it is revalidated with a conditional request.
+POKEAPI_MIRROR_MAX_AGE = env.int('POKEAPI_MIRROR_MAX_AGE', default=60 * 60 * 24)
+# Maximum number of concurrent requests when retrieving multiple resources.
+POKEAPI_FETCH_CONCURRENCY = env.int('POKEAPI_FETCH_CONCURRENCY', default=20)
+# Maximum number of retries of throttled or failed requests.
+POKEAPI_FETCH_RETRIES = env.int('POKEAPI_FETCH_RETRIES', default=3)
+# Seconds before requests to the Poke API time out, in total and to connect.
+POKEAPI_TIMEOUT = env.float('POKEAPI_TIMEOUT', default=10)
+POKEAPI_CONNECT_TIMEOUT = env.float('POKEAPI_CONNECT_TIMEOUT', default=3)
+# Consecutive failures of an endpoint, e.g. "pokemon", after which its requests fail fast for
+# POKEAPI_CIRCUIT_RESET_TIMEOUT seconds.  Set per endpoint with e.g. "pokemon=10,berry=3".
+POKEAPI_CIRCUIT_THRESHOLD = env.int('POKEAPI_CIRCUIT_THRESHOLD', default=5)
+POKEAPI_CIRCUIT_THRESHOLDS = env.dict('POKEAPI_CIRCUIT_THRESHOLDS', cast={'value': int}, default={})
+POKEAPI_CIRCUIT_RESET_TIMEOUT = env.float('POKEAPI_CIRCUIT_RESET_TIMEOUT', default=30)
+# Sprites under this URL are served as resized WebP thumbnails stored in POKE_SPRITES_ROOT, see
+# `apps.poke.sprites`.  Sprites are linked to as they are when POKE_SPRITES_ROOT is empty.
+POKE_SPRITES_SOURCE_URL = env(
+    'POKE_SPRITES_SOURCE_URL',
+    default='https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/',
+)
+POKE_SPRITES_ROOT = env('POKE_SPRITES_ROOT', default=str(BASE_DIR / 'sprites'))
+# Stream the Pokédex pages whose Pokémon are not cached yet, sending each card as soon as it is retrieved.
+# Only takes effect under ASGI, see `apps.poke.views.PokedexView.stream`.
+POKE_STREAM_POKEDEX = env.bool('POKE_STREAM_POKEDEX', default=True)
+# Seconds between refreshes of the Pokédex and berries caches by an in-process
+# warmer thread, see `apps.poke.warming`.  Disabled when 0.
+POKE_CACHE_WARMER_INTERVAL = env.int('POKE_CACHE_WARMER_INTERVAL', default=0)
+
 # STATIC
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#static-root
@@ -130,3 +235,17 @@ STATIC_ROOT = str(BASE_DIR / 'staticfiles')
 STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/dev/ref/contrib/staticfiles/#std:setting-STATICFILES_DIRS
 STATICFILES_DIRS = [str(BASE_DIR / 'static')]
+# https://docs.djangoproject.com/en/dev/ref/settings/#storages
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    # In production, `collectstatic` names files by their content hash, so that browsers cache them forever, and
+    # compresses them with gzip and Brotli, served to the clients accepting it.
+    # https://whitenoise.readthedocs.io/en/stable/django.html#add-compression-and-caching-support
+    'staticfiles': {
+        'BACKEND': (
+            'apps.poke.storage.StaticFilesStorage'
+            if PRODUCTION
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
@@ -1,8 +1,11 @@
+from django.apps import apps
 from django.contrib import admin
 from django.urls import include, path
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('apps.poke.urls')),
-    path('__reload__/', include('django_browser_reload.urls')),
 ]
+
+if apps.is_installed('django_browser_reload'):
+    urlpatterns.append(path('__reload__/', include('django_browser_reload.urls')))
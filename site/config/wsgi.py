@@ -5,3 +5,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Imported once the app registry is ready.
+from apps.poke.warming import start_cache_warmer  # isort: skip pylint: disable=wrong-import-position
+
+start_cache_warmer()